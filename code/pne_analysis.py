@@ -0,0 +1,529 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from pne_kernels import accumulate_time, step_ids
+from pne_naming import extract_capacity
+
+logger = logging.getLogger(__name__)
+
+# 프로파일(SaveData) 열 번호
+STEP_TYPE_COLUMN = 2
+VOLTAGE_COLUMN = 8
+CURRENT_COLUMN = 9
+CHARGE_CAPACITY_COLUMN = 10
+DISCHARGE_CAPACITY_COLUMN = 11
+TIME_DAY_COLUMN = 18
+TIME_HUNDREDTH_SEC_COLUMN = 19
+CYCLE_COLUMN = 27
+
+# #9 전류(uA) -> mA
+CURRENT_TO_MA = 1e-3
+
+# #10/#11 용량(uAh) -> mAh
+CAPACITY_TO_MAH = 1e-3
+
+# 스텝 타입 (#2)
+STEP_CHARGE = 1
+STEP_DISCHARGE = 2
+STEP_REST = 3
+
+
+def segment_starts(segment_ids):
+    """구간 번호가 바뀌는 행 위치 (첫 행 포함)"""
+    segment_ids = np.asarray(segment_ids)
+    if len(segment_ids) == 0:
+        return np.array([], dtype=np.int64)
+    return np.concatenate(([0], np.flatnonzero(segment_ids[1:] != segment_ids[:-1]) + 1))
+
+
+def segmented_cumsum(increments, segment_ids):
+    """
+    구간마다 다시 시작하는 누적 합 (구간 첫 행의 증분, 즉 직전 행 -> 첫 행 간격은 새 구간에 포함)
+
+    전체 누적 합에서 구간 시작 직전 값을 빼므로 반복문 없이 계산됨.
+
+    Args:
+        increments (array): 행별 증분 (i번째 값은 i-1 -> i 사이의 증분)
+        segment_ids (array): 행별 구간 번호
+
+    Returns:
+        ndarray: 구간별 누적 합
+    """
+    increments = np.asarray(increments, dtype=np.float64)
+    starts = segment_starts(segment_ids)
+    total = np.cumsum(increments)
+    lengths = np.diff(np.append(starts, len(increments)))
+    return total - np.repeat(total[starts] - increments[starts], lengths)
+
+
+def trapezoid_increments(values, time_seconds):
+    """사다리꼴 적분 증분: (v[i] + v[i-1]) / 2 * (t[i] - t[i-1]) (첫 행은 0)"""
+    values = np.asarray(values, dtype=np.float64)
+    time_seconds = np.asarray(time_seconds, dtype=np.float64)
+    increments = np.zeros(len(values), dtype=np.float64)
+    if len(values) > 1:
+        increments[1:] = (values[1:] + values[:-1]) * 0.5 * np.diff(time_seconds)
+    return increments
+
+
+def held_increments(values, time_seconds, segment_ids):
+    """
+    trapezoid_increments와 같되 구간 첫 행의 증분은 그 행의 값을 직전 행과의 간격 동안 유지한 값
+
+    스텝이 바뀌는 간격을 이전 스텝의 값과 섞지 않고 새 스텝에 배정함
+    (1초 기록의 1000 mA x 3600 s 스텝이 999.72가 아니라 1000 mAh가 되도록).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    time_seconds = np.asarray(time_seconds, dtype=np.float64)
+    increments = trapezoid_increments(values, time_seconds)
+    starts = segment_starts(segment_ids)[1:]
+    increments[starts] = values[starts] * (time_seconds[starts] - time_seconds[starts - 1])
+    return increments
+
+
+def channel_capacity(profile, capacity_mah=None, cyclename=None):
+    """
+    SOC 정규화에 쓸 용량(mAh) 결정: 인자 -> cyclename -> 데이터의 cyclename 열 순서
+
+    Returns:
+        float: 용량 (mAh)
+
+    Raises:
+        ValueError: 용량을 알 수 없을 때
+    """
+    if capacity_mah is None and cyclename is None and 'cyclename' in profile.columns and len(profile):
+        cyclename = str(profile['cyclename'].iloc[0])
+    if capacity_mah is None and cyclename is not None:
+        capacity_mah = extract_capacity(cyclename)
+    if not capacity_mah:
+        raise ValueError(f"용량(mAh)을 알 수 없습니다: {cyclename}")
+    return float(capacity_mah)
+
+
+def add_charge_columns(profile, capacity_mah=None, cyclename=None, time_seconds=None, initial_soc=0.0,
+                       current_scale=CURRENT_TO_MA):
+    """
+    병합된 채널 프로파일 전체에 전하량 관련 파생 열을 한 번에 추가
+
+    전류를 누적 시간에 대해 사다리꼴 적분하며(스텝 경계 간격은 새 스텝의 전류로 적분),
+    모든 계산은 배열 연산으로 처리됨.
+        step_charge_mah  스텝(스텝 타입 또는 사이클이 바뀔 때)마다 0에서 다시 시작하는 충방전 용량
+        soc              initial_soc에서 시작해 채널 전체의 순 전하량 / 용량을 누적한 SOC (사이클 사이에서도 이어짐)
+        ah_throughput    채널 전체의 누적 |전류| 적산량 (Ah)
+        efc              등가 완전 사이클 수 (누적 적산량 / (2 x 용량))
+
+    Args:
+        profile (DataFrame): #2, #9, #27 열과 시간(#18/#19 또는 time_seconds)이 있는 프로파일
+        capacity_mah (float, optional): 용량, None이면 cyclename에서 추출
+        cyclename (str, optional): 용량을 추출할 이름 (예: A1_MP1_T23_4500mAh_1)
+        time_seconds (array or str, optional): 초 단위 누적 시간 또는 그 열 이름, None이면 #18/#19로 계산
+        initial_soc (float): 채널 첫 행의 SOC (방전 상태에서 충전으로 시작하면 0)
+        current_scale (float): #9 값을 mA로 바꾸는 계수 (기본 uA -> mA)
+
+    Returns:
+        DataFrame: 파생 열이 추가된 복사본
+    """
+    capacity = channel_capacity(profile, capacity_mah, cyclename)
+    result = profile.copy()
+    if result.empty:
+        for column in ('time_seconds', 'step_charge_mah', 'soc', 'ah_throughput', 'efc'):
+            result[column] = pd.Series(dtype=np.float64)
+        return result
+
+    if time_seconds is None:
+        time_seconds = accumulate_time(result[TIME_DAY_COLUMN].to_numpy(),
+                                       result[TIME_HUNDREDTH_SEC_COLUMN].to_numpy())
+    elif isinstance(time_seconds, str):
+        time_seconds = result[time_seconds].to_numpy()
+    time_seconds = np.asarray(time_seconds, dtype=np.float64)
+
+    current_ma = result[CURRENT_COLUMN].to_numpy(dtype=np.float64) * current_scale
+    cycles = result[CYCLE_COLUMN].to_numpy()
+    steps = step_ids(result[STEP_TYPE_COLUMN].to_numpy(), cycles)
+
+    # mA x s -> mAh
+    charge_increments = held_increments(current_ma, time_seconds, steps) / 3600.0
+    throughput_increments = held_increments(np.abs(current_ma), time_seconds, steps) / 3600.0
+
+    result['time_seconds'] = time_seconds
+    result['step_charge_mah'] = segmented_cumsum(charge_increments, steps)
+    result['soc'] = initial_soc + np.cumsum(charge_increments) / capacity
+    throughput_mah = np.cumsum(throughput_increments)
+    result['ah_throughput'] = throughput_mah / 1000.0
+    result['efc'] = throughput_mah / (2.0 * capacity)
+    return result
+
+
+def charge_summary(profile):
+    """
+    add_charge_columns 결과의 사이클별 요약
+
+    Returns:
+        DataFrame: cycle, charge_mah, discharge_mah, soc_min, soc_max, ah_throughput, efc (사이클 끝 기준)
+    """
+    cycles = profile[CYCLE_COLUMN].to_numpy()
+    starts = segment_starts(cycles)
+    ends = np.append(starts[1:], len(cycles)) - 1
+    step_types = profile[STEP_TYPE_COLUMN].to_numpy()
+    step_charge = profile['step_charge_mah'].to_numpy()
+    soc = profile['soc'].to_numpy()
+
+    # 스텝 끝 값이 스텝 전체 용량이므로 스텝 끝 행만 사이클별로 합산
+    steps = step_ids(step_types, cycles)
+    step_ends = np.append(segment_starts(steps)[1:], len(steps)) - 1
+    cycle_of_step_end = np.searchsorted(starts, step_ends, side='right') - 1
+    charged = np.where(step_types[step_ends] == STEP_CHARGE, step_charge[step_ends], 0.0)
+    discharged = np.where(step_types[step_ends] == STEP_DISCHARGE, -step_charge[step_ends], 0.0)
+
+    return pd.DataFrame({
+        'cycle': cycles[starts],
+        'charge_mah': np.bincount(cycle_of_step_end, charged, minlength=len(starts)),
+        'discharge_mah': np.bincount(cycle_of_step_end, discharged, minlength=len(starts)),
+        'soc_min': np.minimum.reduceat(soc, starts) if len(starts) else np.array([]),
+        'soc_max': np.maximum.reduceat(soc, starts) if len(starts) else np.array([]),
+        'ah_throughput': profile['ah_throughput'].to_numpy()[ends],
+        'efc': profile['efc'].to_numpy()[ends],
+    })
+
+
+def compare_step_capacity(profile, capacity_scale=CAPACITY_TO_MAH):
+    """
+    add_charge_columns의 스텝 용량을 충방전기가 기록한 스텝 용량(#10 충전, #11 방전)과 비교
+
+    Args:
+        profile (DataFrame): add_charge_columns 결과 (#10, #11 열 포함)
+        capacity_scale (float): #10/#11 값을 mAh로 바꾸는 계수 (기본 uAh -> mAh)
+
+    Returns:
+        DataFrame: 충방전 스텝별 cycle, step_row, step_type, integrated_mah, cycler_mah, difference_mah
+                   (스텝 끝 행 기준, 용량은 모두 양수)
+    """
+    cycles = profile[CYCLE_COLUMN].to_numpy()
+    step_types = profile[STEP_TYPE_COLUMN].to_numpy()
+    step_starts = segment_starts(step_ids(step_types, cycles))
+    step_ends = np.append(step_starts[1:], len(step_types)) - 1
+    active = np.isin(step_types[step_starts], (STEP_CHARGE, STEP_DISCHARGE))
+    step_starts, step_ends = step_starts[active], step_ends[active]
+
+    is_charge = step_types[step_ends] == STEP_CHARGE
+    cycler_mah = np.where(is_charge, profile[CHARGE_CAPACITY_COLUMN].to_numpy(dtype=np.float64)[step_ends],
+                          profile[DISCHARGE_CAPACITY_COLUMN].to_numpy(dtype=np.float64)[step_ends]) * capacity_scale
+    integrated_mah = np.abs(profile['step_charge_mah'].to_numpy()[step_ends])
+    return pd.DataFrame({
+        'cycle': cycles[step_starts],
+        'step_row': step_starts,
+        'step_type': step_types[step_starts],
+        'integrated_mah': integrated_mah,
+        'cycler_mah': cycler_mah,
+        'difference_mah': integrated_mah - cycler_mah,
+    })
+
+
+def _as_channel_dict(profiles):
+    if isinstance(profiles, pd.DataFrame):
+        return {'channel': profiles}
+    return dict(profiles)
+
+
+def extract_pulse_resistance(profiles, offsets=(1.0, 10.0), step_types=(STEP_DISCHARGE,), max_duration=30.0,
+                             min_current_step=0.0, time_column=None, voltage_scale=1e-6, current_scale=1e-6):
+    """
+    펄스 스텝의 DCIR을 모든 채널, 모든 사이클에 대해 한 번에 계산
+
+    채널들을 이어 붙인 배열에서 스텝 변화 지점으로 스텝 시작을 찾고, 스텝 시작 시각 + offset의
+    행을 시간 열에 대한 searchsorted로 찾아 R = (V(t) - V0) / (I(t) - I0)를 계산함.
+    V0, I0는 스텝 직전 행(보통 휴지)의 값이며, offset이 스텝 밖이면 NaN.
+
+    Args:
+        profiles (dict or DataFrame): 채널 이름 -> 프로파일 (#2, #8, #9, #27과 시간 열 포함)
+        offsets (tuple): 스텝 시작 후 측정 시각 (초)
+        step_types (tuple): 펄스로 볼 스텝 타입 (#2)
+        max_duration (float, optional): 이 시간(초)보다 긴 스텝은 펄스가 아닌 것으로 봄, None이면 제한 없음
+        min_current_step (float): |I - I0| (원본 단위)가 이 값 이하인 스텝은 제외
+        time_column (str, optional): 초 단위 시간 열, None이면 #18/#19로 계산
+        voltage_scale (float): #8 값을 V로 바꾸는 계수 (기본 uV)
+        current_scale (float): #9 값을 A로 바꾸는 계수 (기본 uA)
+
+    Returns:
+        DataFrame: 펄스와 offset별 channel, cycle, pulse, step_row, step_type, duration, offset,
+                   v0, i0, v, i, resistance_mohm
+    """
+    channels = _as_channel_dict(profiles)
+    names = [name for name, data in channels.items() if data is not None and not data.empty]
+    if not names:
+        return pd.DataFrame(columns=['channel', 'cycle', 'pulse', 'step_row', 'step_type', 'duration', 'offset',
+                                     'v0', 'i0', 'v', 'i', 'resistance_mohm'])
+
+    # 채널들을 이어 붙이고, 채널 사이에서 시간이 겹치지 않도록 앞 채널의 끝 시각만큼 밀어 단조 증가로 만듦
+    time_parts, channel_codes, local_rows = [], [], []
+    shift = 0.0
+    for code, name in enumerate(names):
+        data = channels[name]
+        if time_column is not None:
+            channel_time = data[time_column].to_numpy(dtype=np.float64)
+        else:
+            channel_time = accumulate_time(data[TIME_DAY_COLUMN].to_numpy(), data[TIME_HUNDREDTH_SEC_COLUMN].to_numpy())
+        channel_time = channel_time - channel_time[0]
+        time_parts.append(channel_time + shift)
+        shift += channel_time[-1] + max(offsets) + 1.0
+        channel_codes.append(np.full(len(data), code, dtype=np.int64))
+        local_rows.append(np.arange(len(data)))
+
+    time_seconds = np.concatenate(time_parts)
+    channel_code = np.concatenate(channel_codes)
+    local_row = np.concatenate(local_rows)
+    step_type = np.concatenate([channels[name][STEP_TYPE_COLUMN].to_numpy() for name in names])
+    cycle = np.concatenate([channels[name][CYCLE_COLUMN].to_numpy() for name in names])
+    voltage = np.concatenate([channels[name][VOLTAGE_COLUMN].to_numpy(dtype=np.float64) for name in names])
+    current = np.concatenate([channels[name][CURRENT_COLUMN].to_numpy(dtype=np.float64) for name in names])
+
+    # 스텝 타입, 사이클, 채널 중 하나라도 바뀌면 새 스텝
+    changed = np.zeros(len(step_type), dtype=bool)
+    changed[1:] = ((step_type[1:] != step_type[:-1]) | (cycle[1:] != cycle[:-1])
+                   | (channel_code[1:] != channel_code[:-1]))
+    starts = np.flatnonzero(changed | (np.arange(len(changed)) == 0))
+    ends = np.append(starts[1:], len(step_type))
+    durations = time_seconds[ends - 1] - time_seconds[starts]
+
+    # 펄스 후보: 지정 스텝 타입, 짧은 스텝, 같은 채널에 직전 행이 있는 스텝
+    is_pulse = np.isin(step_type[starts], step_types) & (starts > 0)
+    is_pulse &= channel_code[np.maximum(starts - 1, 0)] == channel_code[starts]
+    if max_duration is not None:
+        is_pulse &= durations <= max_duration
+    starts, ends, durations = starts[is_pulse], ends[is_pulse], durations[is_pulse]
+    before = starts - 1
+
+    offsets = np.asarray(offsets, dtype=np.float64)
+    # (펄스 수 x offset 수) 측정 행: 시작 시각 + offset 이하인 마지막 행
+    targets = time_seconds[starts][:, None] + offsets[None, :]
+    rows = np.searchsorted(time_seconds, targets, side='right') - 1
+    inside = targets <= time_seconds[ends - 1][:, None]
+    rows = np.where(inside, rows, starts[:, None])
+
+    v0 = voltage[before][:, None] * voltage_scale
+    i0 = current[before][:, None] * current_scale
+    v = voltage[rows] * voltage_scale
+    i = current[rows] * current_scale
+    delta_i = i - i0
+    valid = inside & (np.abs(delta_i) > min_current_step * current_scale)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resistance = np.where(valid, (v - v0) / delta_i * 1000.0, np.nan)
+
+    pulse_count = len(starts)
+    offset_count = len(offsets)
+    result = pd.DataFrame({
+        'channel': np.repeat(np.asarray(names, dtype=object)[channel_code[starts]], offset_count),
+        'cycle': np.repeat(cycle[starts], offset_count),
+        'step_row': np.repeat(local_row[starts], offset_count),
+        'step_type': np.repeat(step_type[starts], offset_count),
+        'duration': np.repeat(durations, offset_count),
+        'offset': np.tile(offsets, pulse_count),
+        'v0': np.repeat(v0[:, 0], offset_count),
+        'i0': np.repeat(i0[:, 0], offset_count),
+        'v': np.where(valid, v, np.nan).ravel(),
+        'i': np.where(valid, i, np.nan).ravel(),
+        'resistance_mohm': resistance.ravel(),
+    })
+    # 사이클 안에서 몇 번째 펄스인지 (0부터, 같은 채널/사이클의 펄스는 연속으로 놓여 있음)
+    new_group = np.ones(pulse_count, dtype=bool)
+    new_group[1:] = ((channel_code[starts][1:] != channel_code[starts][:-1])
+                     | (cycle[starts][1:] != cycle[starts][:-1]))
+    positions = np.arange(pulse_count)
+    pulse_number = positions - np.maximum.accumulate(np.where(new_group, positions, 0))
+    result.insert(2, 'pulse', np.repeat(pulse_number, offset_count))
+    return result
+
+
+def dcir_table(pulses, offset=None, pulse=0):
+    """
+    extract_pulse_resistance 결과를 채널 x 사이클 저항 표로 변환
+
+    Args:
+        pulses (DataFrame): extract_pulse_resistance의 결과
+        offset (float, optional): 사용할 측정 시각, None이면 첫 번째 offset
+        pulse (int): 사이클 안의 몇 번째 펄스를 쓸지 (0부터)
+
+    Returns:
+        DataFrame: 행은 채널, 열은 사이클인 저항(mOhm) 표
+    """
+    if pulses.empty:
+        return pd.DataFrame()
+    if offset is None:
+        offset = pulses['offset'].iloc[0]
+    selected = pulses[(pulses['offset'] == offset) & (pulses['pulse'] == pulse)]
+    return selected.pivot(index='channel', columns='cycle', values='resistance_mohm')
+
+
+# RelaxationStore 구간 정보 열
+RELAXATION_COLUMNS = ('channel', 'cycle', 'rest', 'step_row', 'previous_step_type', 'duration',
+                      'start_voltage', 'end_ocv', 'relaxation')
+
+# 구간이 없을 때도 구간이 있을 때와 같은 dtype을 쓰도록 (object 배열은 npz에서 pickle 없이 읽을 수 없음)
+RELAXATION_DTYPES = {'channel': str, 'cycle': np.int64, 'rest': np.int64, 'step_row': np.int64,
+                     'previous_step_type': np.int64, 'duration': np.float64, 'start_voltage': np.float64,
+                     'end_ocv': np.float64, 'relaxation': np.float64}
+
+
+def _ragged_rows(starts, lengths):
+    """구간별 (시작, 길이)를 이어 붙인 행 번호 배열 (반복문 없이 생성)"""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.array([], dtype=np.int64)
+    segment_offsets = np.cumsum(lengths) - lengths
+    return np.arange(total) - np.repeat(segment_offsets - starts, lengths)
+
+
+class RelaxationStore:
+    """
+    휴지 구간의 OCV 완화 곡선을 모은 ragged array 저장소
+
+    모든 구간의 경과 시간/전압을 각각 하나의 배열로 이어 붙이고, i번째 구간은
+    offsets[i]:offsets[i+1] 범위에 있음. 곡선 값은 float32로 저장함 (시간 ~ms, 전압 ~uV 정밀도).
+
+    Attributes:
+        segments (DataFrame): 구간별 channel, cycle, rest, step_row, previous_step_type, duration,
+                              start_voltage, end_ocv, relaxation (end_ocv - start_voltage)
+        offsets (ndarray): 구간 경계 (길이 = 구간 수 + 1)
+        time (ndarray): 휴지 시작 후 경과 시간 (초)
+        voltage (ndarray): 전압 (V)
+    """
+
+    def __init__(self, segments, offsets, time, voltage):
+        self.segments = segments.reset_index(drop=True)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.time = np.asarray(time, dtype=np.float32)
+        self.voltage = np.asarray(voltage, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.segments)
+
+    def curve(self, index):
+        """구간 하나의 (경과 시간, 전압) 배열 (복사 없음)"""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return self.time[start:end], self.voltage[start:end]
+
+    def curves(self, channel=None, cycle=None, previous_step_type=None):
+        """조건에 맞는 구간들의 (구간 정보, [(경과 시간, 전압), ...])"""
+        mask = np.ones(len(self.segments), dtype=bool)
+        if channel is not None:
+            mask &= (self.segments['channel'] == channel).to_numpy()
+        if cycle is not None:
+            mask &= (self.segments['cycle'] == cycle).to_numpy()
+        if previous_step_type is not None:
+            mask &= (self.segments['previous_step_type'] == previous_step_type).to_numpy()
+        indices = np.flatnonzero(mask)
+        return self.segments.iloc[indices], [self.curve(index) for index in indices]
+
+    def voltage_at(self, seconds):
+        """
+        모든 구간의 휴지 시작 후 seconds 시점 전압 (그 시점 이하의 마지막 값, 구간이 짧으면 NaN)
+
+        Returns:
+            ndarray: 구간별 전압
+        """
+        starts, ends = self.offsets[:-1], self.offsets[1:]
+        # 구간별 경과 시간은 0부터 증가하므로 구간 번호를 더해 전체를 단조 증가로 만든 뒤 한 번에 탐색
+        span = float(self.time.max()) + seconds + 1.0 if len(self.time) else 1.0
+        segment_of_row = np.repeat(np.arange(len(starts)), ends - starts)
+        keys = self.time.astype(np.float64) + segment_of_row * span
+        rows = np.searchsorted(keys, np.arange(len(starts)) * span + seconds, side='right') - 1
+        valid = (ends > starts) & (rows >= starts) & (seconds <= self.segments['duration'].to_numpy())
+        return np.where(valid, self.voltage[np.clip(rows, 0, max(len(self.voltage) - 1, 0))], np.nan)
+
+    def save(self, file_path):
+        """npz 파일로 저장 (pickle 없이 읽을 수 있는 배열만 사용)"""
+        columns = {f"segment_{name}": self.segments[name].to_numpy() for name in self.segments.columns
+                   if name != 'channel'}
+        np.savez_compressed(file_path, offsets=self.offsets, time=self.time, voltage=self.voltage,
+                            segment_channel=self.segments['channel'].astype(str).to_numpy().astype(str),
+                            **columns)
+
+    @classmethod
+    def load(cls, file_path):
+        with np.load(file_path) as archive:
+            segments = pd.DataFrame({name[len("segment_"):]: archive[name] for name in archive.files
+                                     if name.startswith("segment_")})
+            order = ['channel'] + [name for name in RELAXATION_COLUMNS if name != 'channel']
+            return cls(segments[order], archive['offsets'], archive['time'], archive['voltage'])
+
+
+def _channel_rest_segments(data, time_column, voltage_scale, min_duration, rest_types):
+    """채널 하나의 휴지 구간 위치와 곡선 (한 번의 배열 연산)"""
+    if time_column is not None:
+        time_seconds = data[time_column].to_numpy(dtype=np.float64)
+    else:
+        time_seconds = accumulate_time(data[TIME_DAY_COLUMN].to_numpy(), data[TIME_HUNDREDTH_SEC_COLUMN].to_numpy())
+    step_type = data[STEP_TYPE_COLUMN].to_numpy()
+    cycle = data[CYCLE_COLUMN].to_numpy()
+    voltage = data[VOLTAGE_COLUMN].to_numpy(dtype=np.float64) * voltage_scale
+
+    starts = segment_starts(step_ids(step_type, cycle))
+    ends = np.append(starts[1:], len(step_type))
+    keep = np.isin(step_type[starts], rest_types)
+    durations = time_seconds[ends - 1] - time_seconds[starts]
+    keep &= durations >= min_duration
+    starts, ends, durations = starts[keep], ends[keep], durations[keep]
+
+    lengths = ends - starts
+    rows = _ragged_rows(starts, lengths)
+    elapsed = time_seconds[rows] - np.repeat(time_seconds[starts], lengths)
+
+    rest_cycles = cycle[starts]
+    # 사이클 안에서 몇 번째 휴지인지 (0부터)
+    new_cycle = np.ones(len(starts), dtype=bool)
+    new_cycle[1:] = rest_cycles[1:] != rest_cycles[:-1]
+    positions = np.arange(len(starts))
+    rest_number = positions - np.maximum.accumulate(np.where(new_cycle, positions, 0)) if len(starts) else positions
+
+    previous_type = np.where(starts > 0, step_type[np.maximum(starts - 1, 0)], 0)
+    segments = pd.DataFrame({
+        'cycle': rest_cycles,
+        'rest': rest_number,
+        'step_row': starts,
+        'previous_step_type': previous_type,
+        'duration': durations,
+        'start_voltage': voltage[starts],
+        'end_ocv': voltage[ends - 1],
+    })
+    segments['relaxation'] = segments['end_ocv'] - segments['start_voltage']
+    return segments, lengths, elapsed, voltage[rows]
+
+
+def build_relaxation_store(profiles, time_column=None, voltage_scale=1e-6, min_duration=0.0,
+                           rest_types=(STEP_REST,)):
+    """
+    모든 채널의 모든 휴지 구간을 RelaxationStore로 추출 (채널마다 배열 연산 한 번)
+
+    Args:
+        profiles (dict or DataFrame): 채널 이름 -> 프로파일 (#2, #8, #27과 시간 열 포함)
+        time_column (str, optional): 초 단위 시간 열, None이면 #18/#19로 계산
+        voltage_scale (float): #8 값을 V로 바꾸는 계수 (기본 uV)
+        min_duration (float): 이보다 짧은(초) 휴지 구간은 제외
+        rest_types (tuple): 휴지로 볼 스텝 타입 (#2)
+
+    Returns:
+        RelaxationStore: 휴지 구간 정보와 완화 곡선
+    """
+    segment_frames, lengths, times, voltages = [], [], [], []
+    for name, data in _as_channel_dict(profiles).items():
+        if data is None or data.empty:
+            continue
+        segments, channel_lengths, elapsed, voltage = _channel_rest_segments(
+            data, time_column, voltage_scale, min_duration, rest_types)
+        segments.insert(0, 'channel', name)
+        segment_frames.append(segments)
+        lengths.append(channel_lengths)
+        times.append(elapsed)
+        voltages.append(voltage)
+        logger.debug(f"{name}: 휴지 구간 {len(segments)}개")
+
+    if not segment_frames:
+        empty = pd.DataFrame({name: pd.Series(dtype=RELAXATION_DTYPES[name]) for name in RELAXATION_COLUMNS})
+        return RelaxationStore(empty, [0], [], [])
+
+    lengths = np.concatenate(lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    return RelaxationStore(pd.concat(segment_frames, ignore_index=True), offsets,
+                           np.concatenate(times), np.concatenate(voltages))
@@ -0,0 +1,256 @@
+import io
+import os
+import gzip
+import zipfile
+import logging
+
+try:
+    import zstandard
+except ImportError:  # zstandard가 없으면 .zst 파일만 읽을 수 없음
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# 파일 단위 압축 확장자 (예: ch01_SaveData0001.csv.gz)
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+# 폴더 단위 압축 확장자 (예: M01Ch045[045].zip, Restore.zip, 시험 폴더 전체 .zip)
+ARCHIVE_SUFFIX = ".zip"
+
+# 압축 파일 목록 캐시: 압축 파일 경로 -> ((크기, 수정 시각), 디렉토리 -> {파일 이름: 멤버 이름})
+_archive_cache = {}
+
+
+def strip_compression(name):
+    """압축 확장자를 뗀 원래 파일 이름 (예: a.csv.gz -> a.csv)"""
+    for suffix in COMPRESSED_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+class _ClosingGzipFile(gzip.GzipFile):
+    """닫을 때 원본 스트림도 함께 닫는 GzipFile (fileobj로 받은 스트림은 기본적으로 닫지 않음)"""
+
+    def __init__(self, stream):
+        super().__init__(fileobj=stream, mode="rb")
+        self._source = stream
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._source.close()
+
+
+def _decompress(stream, name):
+    """파일 이름의 압축 확장자에 맞게 스트림을 풀면서 읽는 객체 반환"""
+    if name.endswith(".gz"):
+        return _ClosingGzipFile(stream)
+    if name.endswith(".zst"):
+        if zstandard is None:
+            stream.close()
+            raise ImportError(f"{name}을 읽으려면 zstandard가 필요합니다 (pip install zstandard).")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream, closefd=True))
+    return stream
+
+
+def _is_archive(path):
+    return path.lower().endswith(ARCHIVE_SUFFIX) and os.path.isfile(path)
+
+
+def _archive_members(archive_path):
+    """압축 파일의 디렉토리별 파일 목록 (멤버 경로의 '/' 기준)"""
+    stat = os.stat(archive_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    cached = _archive_cache.get(archive_path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    directories = {}
+    with zipfile.ZipFile(archive_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            directory, _, name = info.filename.rstrip("/").rpartition("/")
+            directories.setdefault(directory, {})[strip_compression(name)] = info.filename
+
+    _archive_cache[archive_path] = (signature, directories)
+    return directories
+
+
+def find_archive(restore_dir):
+    """
+    디렉토리로 존재하지 않는 Restore 경로를 담고 있는 압축 파일과 그 안의 디렉토리 찾기
+
+    Restore 경로 자신 또는 상위 폴더 중 하나가 .zip 파일이거나 같은 이름의 .zip 파일이 있으면
+    그 압축 파일 안에서 남은 경로로 끝나는 디렉토리를 찾음.
+    (예: .../M01Ch045[045]/Restore -> .../M01Ch045[045].zip 안의 'M01Ch045[045]/Restore')
+
+    Returns:
+        tuple: (압축 파일 경로, {파일 이름: 멤버 이름}) - 없으면 (None, None)
+    """
+    current = os.path.normpath(restore_dir)
+    inner = []
+    while True:
+        for candidate in (current, current + ARCHIVE_SUFFIX):
+            if _is_archive(candidate):
+                members = _find_directory(_archive_members(candidate), "/".join(reversed(inner)))
+                if members:
+                    return candidate, members
+        parent, name = os.path.split(current)
+        if not name or parent == current:
+            return None, None
+        inner.append(name)
+        current = parent
+
+
+def _find_directory(directories, inner):
+    """압축 파일 안에서 inner로 끝나는 디렉토리의 파일 목록 (inner가 비면 Restore.zip 자체)"""
+    if not inner:
+        for directory in ("", "Restore"):
+            if directory in directories:
+                return directories[directory]
+        inner = "Restore"
+    matches = [d for d in directories if d == inner or d.endswith("/" + inner)]
+    if not matches:
+        return None
+    return directories[min(matches, key=len)]
+
+
+def restore_exists(restore_dir):
+    """Restore 디렉토리가 폴더, 압축 파일 어느 형태로든 있는지 확인"""
+    return os.path.isdir(restore_dir) or find_archive(restore_dir)[0] is not None
+
+
+def list_restore_files(restore_dir):
+    """
+    Restore의 CSV 파일 이름 목록 (압축 확장자를 뗀 이름, 정렬됨)
+
+    SaveData 파일 순서가 savingFileIndex_start.csv의 순서와 맞아야 하므로 이름순으로 정렬함.
+
+    Returns:
+        list: 파일 이름 목록 (Restore가 없으면 빈 목록)
+    """
+    if os.path.isdir(restore_dir):
+        names = {strip_compression(name) for name in os.listdir(restore_dir)}
+    else:
+        _, members = find_archive(restore_dir)
+        names = set(members or ())
+    return sorted(name for name in names if name.endswith(".csv"))
+
+
+def open_restore_file(file_path):
+    """
+    Restore CSV 파일을 바이너리 스트림으로 열기
+
+    file_path가 없으면 같은 이름의 .gz/.zst 파일, 그다음 압축 파일 안의 멤버를 차례로 찾고,
+    압축은 읽는 동안 스트림으로 풀림 (임시 파일로 풀지 않음).
+
+    Args:
+        file_path (str): 원래 CSV 경로 (예: .../Restore/ch01_SaveData0001.csv)
+
+    Returns:
+        file object: 닫아야 하는 바이너리 스트림
+    """
+    if os.path.isfile(file_path):
+        return open(file_path, "rb")
+
+    for suffix in COMPRESSED_SUFFIXES:
+        if os.path.isfile(file_path + suffix):
+            return _decompress(open(file_path + suffix, "rb"), suffix)
+
+    restore_dir, name = os.path.split(file_path)
+    archive_path, members = find_archive(restore_dir)
+    if archive_path is None or name not in members:
+        raise FileNotFoundError(file_path)
+
+    member = members[name]
+    zf = zipfile.ZipFile(archive_path)
+    try:
+        stream = zf.open(member)
+    finally:
+        # 열린 멤버 스트림이 닫힐 때까지 압축 파일 핸들은 유지됨
+        zf.close()
+    return _decompress(stream, member)
+
+
+def read_restore_bytes(file_path):
+    """Restore CSV 파일 전체를 (압축을 푼) 바이트로 읽기"""
+    with open_restore_file(file_path) as f:
+        return f.read()
+
+
+def restore_file_stats(restore_dir):
+    """
+    Restore 파일별 (이름, 크기, 수정 시각 ns)
+
+    압축 파일 안의 파일은 압축을 푼 크기와 압축 파일의 수정 시각을 사용함.
+
+    Returns:
+        list: (압축 확장자를 뗀 파일 이름, 크기, 수정 시각 ns) 목록
+    """
+    if os.path.isdir(restore_dir):
+        stats = []
+        for entry in os.scandir(restore_dir):
+            if entry.is_file():
+                stat = entry.stat()
+                stats.append((strip_compression(entry.name), stat.st_size, stat.st_mtime_ns))
+        return stats
+
+    archive_path, members = find_archive(restore_dir)
+    if archive_path is None:
+        return []
+    mtime_ns = os.stat(archive_path).st_mtime_ns
+    with zipfile.ZipFile(archive_path) as zf:
+        return [(name, zf.getinfo(member).file_size, mtime_ns) for name, member in members.items()]
+
+
+def list_channel_folders(path):
+    """
+    시험 경로 아래의 채널 폴더 경로 목록 (파일 시스템 순서, 'Pattern' 폴더 제외)
+
+    압축된 채널(M01Ch045[045].zip)은 .zip을 뗀 경로로 반환하며, 시험 경로 자체가
+    압축 파일(path 또는 path.zip)이면 그 안의 채널 폴더를 같은 방식으로 반환함.
+    반환된 경로의 Restore는 restore_exists/list_restore_files/open_restore_file로 읽을 수 있음.
+
+    Args:
+        path (str): cyclepath
+
+    Returns:
+        list: 채널 폴더 경로 목록
+    """
+    if os.path.isdir(path):
+        entries = list(os.scandir(path))
+        directories = {entry.path for entry in entries if entry.is_dir()}
+        folders = []
+        for entry in entries:
+            if "Pattern" in entry.path:
+                continue
+            if entry.is_dir():
+                folders.append(entry.path)
+            elif _is_archive(entry.path):
+                # 같은 채널이 이미 풀려 있으면 폴더를 사용
+                channel_path = entry.path[:-len(ARCHIVE_SUFFIX)]
+                if channel_path not in directories:
+                    folders.append(channel_path)
+        return folders
+
+    archive_path = path if _is_archive(path) else path + ARCHIVE_SUFFIX
+    if not _is_archive(archive_path):
+        return []
+
+    base = path[:-len(ARCHIVE_SUFFIX)] if path.lower().endswith(ARCHIVE_SUFFIX) else path
+    folders = []
+    for directory in _archive_members(archive_path):
+        parts = directory.split("/")
+        if len(parts) >= 2 and parts[-1] == "Restore" and "Pattern" not in parts[-2]:
+            channel_path = os.path.join(base, parts[-2])
+            if channel_path not in folders:
+                folders.append(channel_path)
+    return folders
+
+
+def channel_path_exists(path):
+    """시험 경로가 폴더 또는 압축 파일로 있는지 확인"""
+    return os.path.exists(path) or _is_archive(path + ARCHIVE_SUFFIX)
@@ -0,0 +1,141 @@
+import os
+import logging
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # pyarrow가 없으면 NumPy 열 뷰 기능만 사용 가능
+    pa = None
+
+from pre250508_edit import pne_search_cycle
+from pne_archive import restore_exists, list_restore_files, open_restore_file
+
+logger = logging.getLogger(__name__)
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Arrow 로더를 사용하려면 pyarrow가 필요합니다 (pip install pyarrow).")
+
+
+def read_restore_table(file_path, columns=None):
+    """
+    Restore CSV 파일을 Arrow 테이블로 읽기 (헤더 없음, 잘못된 줄은 건너뜀)
+
+    Args:
+        file_path (str): CSV 파일 경로
+        columns (list, optional): 읽을 원본 열 번호, None이면 전체
+
+    Returns:
+        Table: 열 이름이 '0', '1', ... 인 Arrow 테이블
+    """
+    _require_pyarrow()
+
+    # 열 개수를 알아야 이름을 지정할 수 있으므로 첫 줄만 확인
+    with open_restore_file(file_path) as f:
+        first_line = f.readline()
+    if not first_line.strip():
+        return pa.table({})
+    names = [str(i) for i in range(first_line.count(b",") + 1)]
+
+    read_options = pacsv.ReadOptions(column_names=names, encoding="cp949")
+    parse_options = pacsv.ParseOptions(invalid_row_handler=lambda row: "skip")
+    convert_options = pacsv.ConvertOptions(
+        include_columns=[str(c) for c in columns] if columns is not None else None)
+    # .gz/.zst 또는 압축 파일 안의 파일도 스트림으로 풀면서 읽음
+    with open_restore_file(file_path) as f:
+        return pacsv.read_csv(f, read_options=read_options, parse_options=parse_options,
+                              convert_options=convert_options)
+
+
+def load_pne_arrow(path, inicycle=None, endcycle=None, columns=None, cycle_columns=None):
+    """
+    load_pne_data와 같은 파일을 Arrow 테이블로 로드 (파일별 청크를 복사 없이 연결)
+
+    Args:
+        path (str): Restore 디렉토리를 포함하는 경로
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        columns (list, optional): 프로파일(SaveData)에서 읽을 열 번호
+        cycle_columns (list, optional): 사이클(SaveEndData)에서 읽을 열 번호
+
+    Returns:
+        tuple: (profile_table, cycle_table) - 없으면 None
+    """
+    _require_pyarrow()
+
+    restore_dir = os.path.join(path, "Restore")
+    if not restore_exists(restore_dir):
+        logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+        return None, None
+
+    file_start, file_end, inicycle, endcycle = pne_search_cycle(restore_dir, inicycle, endcycle)
+    subfiles = list_restore_files(restore_dir)
+
+    profile_table = None
+    if file_start != -1:
+        tables = [read_restore_table(os.path.join(restore_dir, f), columns)
+                  for f in subfiles[file_start:file_end + 1] if "SaveData" in f]
+        tables = [t for t in tables if t.num_columns]
+        if tables:
+            # 같은 스키마로 맞춘 뒤 청크만 이어 붙임 (데이터 복사 없음)
+            profile_table = pa.concat_tables(tables, promote_options="permissive")
+
+    cycle_table = None
+    save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
+    if save_end_data_file:
+        cycle_table = read_restore_table(os.path.join(restore_dir, save_end_data_file), cycle_columns)
+
+    return profile_table, cycle_table
+
+
+def readonly(array):
+    """원본을 공유하는 읽기 전용 뷰 반환 (쓰기가 필요하면 호출자가 copy())"""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def table_arrays(table, columns=None):
+    """
+    Arrow 테이블 열을 NumPy 배열로 반환
+
+    청크가 하나이고 결측값이 없는 수치 열은 Arrow 버퍼를 그대로 공유(복사 없음)하며,
+    여러 파일에서 온 청크는 열마다 한 번만 연결함. 반환 배열은 읽기 전용임.
+
+    Args:
+        table (Table): Arrow 테이블
+        columns (list, optional): 원본 열 번호 목록, None이면 전체
+
+    Returns:
+        dict: 원본 열 번호 -> 읽기 전용 ndarray
+    """
+    _require_pyarrow()
+
+    names = [str(c) for c in columns] if columns is not None else table.column_names
+    arrays = {}
+    for name in names:
+        chunked = table.column(name)
+        if chunked.num_chunks == 1 and chunked.null_count == 0:
+            array = chunked.chunk(0).to_numpy(zero_copy_only=False)
+        else:
+            array = chunked.to_numpy()
+        arrays[int(name)] = readonly(array)
+    return arrays
+
+
+def frame_arrays(data, columns=None):
+    """
+    DataFrame 열을 원본 버퍼를 공유하는 읽기 전용 NumPy 뷰로 반환
+
+    Args:
+        data (DataFrame): load_pne_data 등이 반환한 데이터
+        columns (list, optional): 열 목록, None이면 전체
+
+    Returns:
+        dict: 열 -> 읽기 전용 ndarray
+    """
+    columns = list(data.columns) if columns is None else columns
+    return {col: readonly(np.asarray(data[col].to_numpy())) for col in columns}
@@ -0,0 +1,258 @@
+import io
+import os
+import sys
+import time
+import argparse
+import asyncio
+import logging
+
+import pandas as pd
+
+from pre250508_edit import extract_channel_info, find_file_range, parse_file_index, load_pne_data
+from pne_archive import list_channel_folders, list_restore_files, read_restore_bytes, restore_exists
+
+logger = logging.getLogger(__name__)
+
+# 네트워크 공유 폴더에 동시에 보낼 최대 요청 수
+DEFAULT_CONCURRENCY = 16
+
+
+class DirectoryAccess:
+    """
+    디렉토리 조회와 파일 읽기를 감싸는 클래스
+
+    latency를 지정하면 호출마다 지연을 넣어 고지연 네트워크 공유 폴더를
+    로컬에서 재현할 수 있음 (calls에 호출 수 기록)
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def _wait(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def scandir(self, path):
+        """(이름, 경로, 디렉토리 여부) 목록 반환 (압축된 채널은 디렉토리로 취급)"""
+        self._wait()
+        if not os.path.exists(path) and not list_channel_folders(path):
+            raise FileNotFoundError(path)
+        return [(os.path.basename(folder), folder, True) for folder in list_channel_folders(path)]
+
+    def listdir(self, path):
+        """Restore CSV 파일 이름 목록 (압축 파일 안의 파일 포함)"""
+        self._wait()
+        if not restore_exists(path):
+            raise FileNotFoundError(path)
+        return list_restore_files(path)
+
+    def read_bytes(self, path):
+        """파일 내용 (.gz/.zst 또는 압축 파일 안의 파일은 푼 내용)"""
+        self._wait()
+        return read_restore_bytes(path)
+
+
+def parse_csv_bytes(raw, sep=","):
+    """
+    원본 CSV 바이트를 load_pne_data와 같은 옵션으로 파싱 (CPU 측 처리)
+
+    Args:
+        raw (bytes): 파일 내용
+        sep (str): 구분자
+
+    Returns:
+        DataFrame: 파싱된 데이터 (빈 파일이면 빈 DataFrame)
+    """
+    if not raw.strip():
+        return pd.DataFrame()
+    return pd.read_csv(io.BytesIO(raw), sep=sep, skiprows=0, engine="c" if sep == "," else "python",
+                       header=None, encoding="cp949", on_bad_lines='skip')
+
+
+class AsyncPNELoader:
+    """
+    asyncio 기반 채널 탐색 및 Restore 파일 읽기 파이프라인
+
+    디렉토리 조회와 파일 읽기는 스레드에서 동시에(최대 concurrency개) 실행하고,
+    읽은 바이트는 parser_executor(기본: 기본 스레드 풀)에서 파싱
+    """
+
+    def __init__(self, fs=None, concurrency=DEFAULT_CONCURRENCY, parser_executor=None):
+        self.fs = fs or DirectoryAccess()
+        self.concurrency = concurrency
+        self.parser_executor = parser_executor
+        self._semaphore = None
+        self._semaphore_loop = None
+
+    def _io_semaphore(self):
+        # 처음 사용할 때 실행 중인 이벤트 루프에서 생성 (discover/load_channel을 직접 호출하거나
+        # 같은 로더를 다른 asyncio.run()에서 다시 사용해도 동작하도록)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _io(self, func, *args):
+        async with self._io_semaphore():
+            return await asyncio.to_thread(func, *args)
+
+    async def _parse(self, raw, sep=","):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.parser_executor, parse_csv_bytes, raw, sep)
+
+    async def discover(self, cycle_df):
+        """
+        모든 cyclepath의 채널 폴더를 동시에 조회
+
+        Args:
+            cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+
+        Returns:
+            list: {'cyclename', 'cyclepath', 'subfolder', 'channel', 'channel_id'} 목록 (입력 순서)
+        """
+        rows = [(row['cyclename'], row['cyclepath']) for _, row in cycle_df.iterrows()]
+
+        async def scan(cycname, path):
+            try:
+                entries = await self._io(self.fs.scandir, path)
+            except FileNotFoundError:
+                logger.warning(f"경로가 존재하지 않습니다: {path}")
+                return []
+
+            channels = []
+            for _, entry_path, is_dir in entries:
+                if not is_dir or "Pattern" in entry_path:
+                    continue
+                channel_info = extract_channel_info(entry_path)
+                if channel_info:
+                    channels.append({'cyclename': cycname, 'cyclepath': path,
+                                     'subfolder': entry_path, **channel_info})
+            return channels
+
+        results = await asyncio.gather(*(scan(cycname, path) for cycname, path in rows))
+        return [channel for channels in results for channel in channels]
+
+    async def load_channel(self, subfolder, inicycle=None, endcycle=None):
+        """
+        채널 하나의 프로파일/사이클 데이터를 비동기로 로드 (load_pne_data와 같은 결과)
+
+        Returns:
+            tuple: (profile_data, cycle_data)
+        """
+        restore_dir = os.path.join(subfolder, "Restore")
+        try:
+            names = sorted(f for f in await self._io(self.fs.listdir, restore_dir) if f.endswith(".csv"))
+        except FileNotFoundError:
+            logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+            return pd.DataFrame(), pd.DataFrame()
+
+        save_end_data_file = next((f for f in names if "SaveEndData" in f), None)
+        if not save_end_data_file:
+            logger.warning(f"{restore_dir}에서 SaveEndData 파일을 찾을 수 없습니다.")
+            return pd.DataFrame(), pd.DataFrame()
+
+        # SaveEndData와 인덱스 파일을 동시에 읽기
+        reads = [self._io(self.fs.read_bytes, os.path.join(restore_dir, save_end_data_file))]
+        if "savingFileIndex_start.csv" in names:
+            reads.append(self._io(self.fs.read_bytes, os.path.join(restore_dir, "savingFileIndex_start.csv")))
+        raws = await asyncio.gather(*reads)
+
+        cycle_data = await self._parse(raws[0])
+        if cycle_data.empty or len(raws) < 2:
+            return pd.DataFrame(), cycle_data
+
+        index_df = await self._parse(raws[1], sep="\\s+")
+        file_start, file_end, inicycle, endcycle = find_file_range(
+            cycle_data, parse_file_index(index_df), inicycle, endcycle)
+        if file_start == -1:
+            return pd.DataFrame(), cycle_data
+
+        # 범위 안의 SaveData 파일을 동시에 읽고 바로 파싱
+        targets = [f for f in names[file_start:file_end + 1] if "SaveData" in f]
+
+        async def read_and_parse(name):
+            raw = await self._io(self.fs.read_bytes, os.path.join(restore_dir, name))
+            return await self._parse(raw)
+
+        frames = [f for f in await asyncio.gather(*(read_and_parse(name) for name in targets)) if not f.empty]
+        profile_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return profile_data, cycle_data
+
+    async def load_all(self, cycle_df, inicycle=None, endcycle=None):
+        """
+        채널 탐색부터 모든 채널 로드까지 겹쳐서 실행
+
+        Returns:
+            list: (채널 정보 dict, profile_data, cycle_data) 목록 (탐색 순서)
+        """
+        channels = await self.discover(cycle_df)
+        logger.info(f"{len(channels)}개 채널 발견, 최대 {self.concurrency}개 요청을 동시에 실행합니다.")
+
+        results = await asyncio.gather(*(self.load_channel(ch['subfolder'], inicycle, endcycle)
+                                         for ch in channels))
+        return [(channel, profile, cycle) for channel, (profile, cycle) in zip(channels, results)]
+
+
+def load_channels_async(cycle_df, inicycle=None, endcycle=None, concurrency=DEFAULT_CONCURRENCY,
+                        fs=None, parser_executor=None):
+    """
+    AsyncPNELoader를 실행하는 동기 함수 (스크립트/노트북용)
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        concurrency (int): 동시 I/O 요청 수
+        fs (DirectoryAccess, optional): 파일 시스템 접근 객체 (지연 주입 테스트용)
+        parser_executor (Executor, optional): 파싱 실행기
+
+    Returns:
+        list: (채널 정보 dict, profile_data, cycle_data) 목록
+    """
+    loader = AsyncPNELoader(fs=fs, concurrency=concurrency, parser_executor=parser_executor)
+    return asyncio.run(loader.load_all(cycle_df, inicycle, endcycle))
+
+
+def compare_with_sync(cycle_df, latency=0.05, concurrency=DEFAULT_CONCURRENCY, inicycle=None, endcycle=None):
+    """
+    지연을 넣은 DirectoryAccess로 비동기 로드를 실행하고 load_pne_data 결과와 비교
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+        latency (float): 디렉토리 조회/파일 읽기마다 넣을 지연 (초)
+        concurrency (int): 동시 I/O 요청 수
+
+    Returns:
+        dict: channels, calls, elapsed (초), serial_latency (순차 실행 시 지연 합계, 초), mismatched (채널 경로 목록)
+    """
+    fs = DirectoryAccess(latency)
+    started = time.perf_counter()
+    results = load_channels_async(cycle_df, inicycle, endcycle, concurrency=concurrency, fs=fs)
+    elapsed = time.perf_counter() - started
+
+    mismatched = []
+    for channel, profile, cycle in results:
+        expected_profile, expected_cycle = load_pne_data(channel['subfolder'], inicycle, endcycle)
+        if not (profile.equals(expected_profile) and cycle.equals(expected_cycle)):
+            mismatched.append(channel['subfolder'])
+    return {'channels': len(results), 'calls': fs.calls, 'elapsed': elapsed,
+            'serial_latency': fs.calls * latency, 'mismatched': mismatched}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="고지연 공유 폴더를 흉내 내어 비동기 로드 확인")
+    parser.add_argument("datapath", help="cyclename, cyclepath 열이 있는 탭 구분 파일")
+    parser.add_argument("--latency", type=float, default=0.05, help="호출마다 넣을 지연 (초)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    args = parser.parse_args(sys.argv[1:])
+
+    cycle_df = pd.read_csv(args.datapath, sep="\t", engine="c", encoding="UTF-8", on_bad_lines='skip')
+    report = compare_with_sync(cycle_df, args.latency, args.concurrency)
+    print(f"{report['channels']}개 채널, {report['calls']}회 호출: {report['elapsed']:.2f}초 "
+          f"(순차 실행 시 지연만 {report['serial_latency']:.2f}초)")
+    if report['mismatched']:
+        print(f"load_pne_data와 다른 채널: {report['mismatched']}")
+        sys.exit(1)
@@ -0,0 +1,306 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+
+import pandas as pd
+
+from pne_archive import find_archive
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 메모리 예산 초과분을 pickle로 저장
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# 기본 캐시 용량 (바이트)
+DEFAULT_CACHE_MAX_BYTES = 20 * 1024 ** 3
+
+# 기본 메모리 예산 (바이트)
+DEFAULT_MEMORY_BUDGET_BYTES = 8 * 1024 ** 3
+
+
+def restore_fingerprint(subfolder):
+    """
+    채널의 Restore 파일 목록으로 변경 감지용 지문 생성
+
+    Args:
+        subfolder (str): Restore 디렉토리를 포함하는 채널 경로
+
+    Returns:
+        list: (파일 이름, 크기, 수정 시각 ns) 목록, Restore가 없으면 빈 목록
+    """
+    restore_dir = os.path.join(subfolder, "Restore")
+    if not os.path.isdir(restore_dir):
+        # 압축된 채널은 압축 파일 자체로 변경 감지
+        archive_path, _ = find_archive(restore_dir)
+        if archive_path is None:
+            return []
+        stat = os.stat(archive_path)
+        return [(os.path.basename(archive_path), stat.st_size, stat.st_mtime_ns)]
+
+    fingerprint = []
+    for entry in os.scandir(restore_dir):
+        if entry.is_file():
+            stat = entry.stat()
+            fingerprint.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    return sorted(fingerprint)
+
+
+def _digest(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ChannelResultCache:
+    """
+    채널별 처리 결과를 디스크에 저장하는 LRU 캐시
+
+    키는 (채널 경로, Restore 파일 지문, inicycle, endcycle, 처리 버전, 메타데이터)이며,
+    원본 파일이 바뀌면 지문이 달라져 이전 결과는 자동으로 무효화됨.
+    파일 이름은 '<채널 경로 해시>_<키 해시>.pkl' 형식이라 같은 채널의 이전 결과를
+    새 결과 저장 시 함께 삭제할 수 있음.
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_CACHE_MAX_BYTES, version=1):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, subfolder, inicycle, endcycle, metadata):
+        channel_hash = _digest(os.path.normcase(os.path.abspath(subfolder)))[:16]
+        key = _digest([channel_hash, restore_fingerprint(subfolder), inicycle, endcycle,
+                       self.version, metadata or {}])
+        return channel_hash, os.path.join(self.cache_dir, f"{channel_hash}_{key}.pkl")
+
+    def get(self, subfolder, inicycle=None, endcycle=None, metadata=None):
+        """
+        저장된 처리 결과 반환
+
+        Returns:
+            DataFrame or None: 캐시에 없으면 None
+        """
+        _, file_path = self._paths(subfolder, inicycle, endcycle, metadata)
+        if not os.path.exists(file_path):
+            self.misses += 1
+            return None
+
+        try:
+            data = pd.read_pickle(file_path)
+        except Exception as e:
+            logger.warning(f"캐시 파일을 읽을 수 없어 삭제합니다: {file_path} ({str(e)})")
+            self._remove(file_path)
+            self.misses += 1
+            return None
+
+        # 최근 사용 시각 갱신 (LRU 순서는 파일 수정 시각으로 관리)
+        os.utime(file_path)
+        self.hits += 1
+        return data
+
+    def put(self, subfolder, data, inicycle=None, endcycle=None, metadata=None):
+        """
+        처리 결과 저장 후 같은 채널의 이전 결과 정리 및 용량 초과분 제거
+        """
+        channel_hash, file_path = self._paths(subfolder, inicycle, endcycle, metadata)
+        temp_path = file_path + ".tmp"
+        data.to_pickle(temp_path)
+        os.replace(temp_path, file_path)
+
+        # 원본 파일이 바뀌어 더 이상 맞지 않는 같은 채널의 결과 삭제
+        # (같은 채널의 다른 사이클 범위 결과는 유지)
+        current_fingerprint = restore_fingerprint(subfolder)
+        for name in os.listdir(self.cache_dir):
+            stale_path = os.path.join(self.cache_dir, name)
+            if name.startswith(channel_hash + "_") and name.endswith(".pkl") and stale_path != file_path:
+                if self._fingerprint_of(stale_path) != current_fingerprint:
+                    self._remove(stale_path)
+
+        self._record_fingerprint(file_path, current_fingerprint)
+        self.evict()
+
+    def get_or_compute(self, subfolder, compute, inicycle=None, endcycle=None, metadata=None):
+        """
+        캐시에 결과가 있으면 반환하고, 없으면 compute()로 계산 후 저장
+
+        Args:
+            subfolder (str): 채널 경로
+            compute (callable): 인자 없이 DataFrame을 반환하는 함수
+            inicycle, endcycle: 사이클 범위
+            metadata (dict, optional): 결과에 포함되는 메타데이터
+
+        Returns:
+            DataFrame: 처리 결과
+        """
+        data = self.get(subfolder, inicycle, endcycle, metadata)
+        if data is not None:
+            logger.info(f"    캐시된 결과 사용: {subfolder}")
+            return data
+
+        data = compute()
+        if data is not None and not data.empty:
+            self.put(subfolder, data, inicycle, endcycle, metadata)
+        return data
+
+    def _fingerprint_path(self, file_path):
+        return file_path[:-len(".pkl")] + ".json"
+
+    def _record_fingerprint(self, file_path, fingerprint):
+        with open(self._fingerprint_path(file_path), "w", encoding="utf-8") as f:
+            json.dump(fingerprint, f)
+
+    def _fingerprint_of(self, file_path):
+        try:
+            with open(self._fingerprint_path(file_path), encoding="utf-8") as f:
+                return [tuple(item) for item in json.load(f)]
+        except (OSError, ValueError):
+            return None
+
+    def _remove(self, file_path):
+        for path in (file_path, self._fingerprint_path(file_path)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def entries(self):
+        """(수정 시각, 크기, 경로) 목록을 오래된 순으로 반환"""
+        items = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".pkl"):
+                stat = entry.stat()
+                items.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return sorted(items)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """용량을 넘으면 가장 오래 사용하지 않은 결과부터 삭제"""
+        items = self.entries()
+        total = sum(size for _, size, _ in items)
+        for _, size, file_path in items:
+            if total <= self.max_bytes:
+                break
+            self._remove(file_path)
+            total -= size
+            logger.debug(f"캐시 용량 초과로 삭제: {file_path}")
+
+
+def frame_nbytes(data):
+    """DataFrame이 차지하는 메모리 바이트 수 (문자열 포함)"""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryBudget:
+    """
+    메모리에 올라와 있는 DataFrame 크기를 추적하고 예산을 넘으면 디스크로 내리는 저장소
+
+    예산(max_bytes)을 넘으면 가장 오래 사용하지 않은 항목부터 임시 열 기반 파일
+    (pyarrow가 있으면 Parquet, 없으면 pickle)로 내리고, get() 시 다시 읽어 들임.
+    """
+
+    def __init__(self, max_bytes, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.resident = OrderedDict()   # 키 -> (DataFrame, 바이트 수), 오래된 순
+        self.spilled = {}               # 키 -> (파일 경로, 원래 열 이름)
+        self.resident_bytes = 0
+        self.spill_count = 0
+
+    def __contains__(self, key):
+        return key in self.resident or key in self.spilled
+
+    def __len__(self):
+        return len(self.resident) + len(self.spilled)
+
+    def put(self, key, data):
+        """항목 등록 (같은 키가 있으면 교체) 후 예산 초과분을 디스크로 내림"""
+        self.discard(key)
+        nbytes = frame_nbytes(data)
+        self.resident[key] = (data, nbytes)
+        self.resident_bytes += nbytes
+        self._enforce(keep=key)
+
+    def get(self, key):
+        """항목 반환 (디스크에 있으면 다시 읽어 메모리에 올림)"""
+        if key in self.resident:
+            self.resident.move_to_end(key)
+            return self.resident[key][0]
+
+        if key not in self.spilled:
+            raise KeyError(key)
+
+        file_path, columns = self.spilled.pop(key)
+        data = self._read_spill(file_path, columns)
+        os.remove(file_path)
+        nbytes = frame_nbytes(data)
+        self.resident[key] = (data, nbytes)
+        self.resident_bytes += nbytes
+        self._enforce(keep=key)
+        return data
+
+    def pop(self, key):
+        """항목을 반환하고 저장소에서 제거"""
+        data = self.get(key)
+        self.discard(key)
+        return data
+
+    def discard(self, key):
+        if key in self.resident:
+            _, nbytes = self.resident.pop(key)
+            self.resident_bytes -= nbytes
+        elif key in self.spilled:
+            file_path, _ = self.spilled.pop(key)
+            try:
+                os.remove(file_path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        for key in list(self.resident) + list(self.spilled):
+            self.discard(key)
+        if self.spill_dir and os.path.isdir(self.spill_dir) and not os.listdir(self.spill_dir):
+            os.rmdir(self.spill_dir)
+
+    def _enforce(self, keep=None):
+        for key in list(self.resident):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._spill(key)
+
+    def _spill(self, key):
+        data, nbytes = self.resident.pop(key)
+        self.resident_bytes -= nbytes
+
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(prefix="pne_spill_")
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+        self.spill_count += 1
+        file_path = os.path.join(self.spill_dir, f"spill_{os.getpid()}_{self.spill_count}")
+        columns = list(data.columns)
+        if pa is not None:
+            file_path += ".parquet"
+            data.rename(columns=str).to_parquet(file_path, index=True)
+        else:
+            file_path += ".pkl"
+            data.to_pickle(file_path)
+
+        self.spilled[key] = (file_path, columns)
+        logger.debug(f"메모리 예산 초과로 {nbytes / 1e6:.1f} MB를 디스크로 내림: {key}")
+
+    @staticmethod
+    def _read_spill(file_path, columns):
+        if file_path.endswith(".parquet"):
+            data = pd.read_parquet(file_path)
+            data.columns = columns
+            return data
+        return pd.read_pickle(file_path)
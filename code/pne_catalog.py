@@ -0,0 +1,280 @@
+import os
+import re
+import time
+import sqlite3
+import logging
+
+import pandas as pd
+
+from pre250508_edit import identify_channel_groups, build_channel_tasks
+from pne_archive import restore_exists, restore_file_stats, open_restore_file
+from pne_naming import extract_capacity, extract_module
+
+logger = logging.getLogger(__name__)
+
+# 기본 카탈로그 파일
+DEFAULT_CATALOG_PATH = "pne_catalog.sqlite"
+
+# 줄 수를 셀 때 한 번에 읽는 바이트 수
+READ_CHUNK_BYTES = 8 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    id INTEGER PRIMARY KEY,
+    subfolder TEXT UNIQUE NOT NULL,
+    cyclename TEXT NOT NULL,
+    cycle_info TEXT NOT NULL,
+    seq_num INTEGER NOT NULL,
+    group_name TEXT,
+    module TEXT,
+    channel TEXT,
+    channel_id TEXT,
+    capacity_mah INTEGER,
+    first_cycle INTEGER,
+    last_cycle INTEGER,
+    scanned_at REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    channel INTEGER NOT NULL REFERENCES channels(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    row_count INTEGER,
+    first_cycle INTEGER,
+    last_cycle INTEGER,
+    PRIMARY KEY (channel, name)
+);
+CREATE INDEX IF NOT EXISTS channels_cycle_info ON channels (cycle_info, seq_num);
+CREATE INDEX IF NOT EXISTS channels_last_cycle ON channels (last_cycle);
+"""
+
+
+def file_kind(name):
+    if "SaveEndData" in name:
+        return "SaveEndData"
+    if "SaveData" in name:
+        return "SaveData"
+    if name.startswith("savingFileIndex"):
+        return "index"
+    return "other"
+
+
+def _cycle_of(line):
+    """CSV 한 줄에서 #27 사이클 값 추출 (없으면 None)"""
+    fields = line.split(b",")
+    if len(fields) <= 27:
+        return None
+    try:
+        return int(float(fields[27]))
+    except ValueError:
+        return None
+
+
+def summarize_restore_file(file_path):
+    """
+    CSV를 파싱하지 않고 줄 수와 사이클 범위 계산
+
+    Restore CSV는 사이클 순으로 기록되므로 첫 줄과 마지막 줄의 #27만 확인함.
+
+    Returns:
+        tuple: (줄 수, 첫 사이클, 마지막 사이클) - 사이클을 알 수 없으면 None
+    """
+    row_count = 0
+    first_line = b""
+    tail = b""
+    with open_restore_file(file_path) as f:
+        while True:
+            chunk = f.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if not first_line:
+                first_line = (tail + chunk).split(b"\n", 1)[0]
+            row_count += chunk.count(b"\n")
+            tail = (tail + chunk)[-4096:]
+
+    lines = [line for line in tail.split(b"\n") if line.strip()]
+    if tail and not tail.endswith(b"\n"):
+        row_count += 1
+    last_line = lines[-1] if lines else b""
+    return row_count, _cycle_of(first_line), _cycle_of(last_line)
+
+
+class PNECatalog:
+    """
+    채널 폴더와 Restore 파일 정보를 저장하는 SQLite 카탈로그
+
+    scan()으로 채우며, 크기와 수정 시각이 그대로인 파일은 다시 읽지 않음.
+    이후 조회는 CSV를 열지 않고 카탈로그만 사용함.
+    """
+
+    def __init__(self, db_path=DEFAULT_CATALOG_PATH):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan(self, cycle_df):
+        """
+        datapath 목록의 모든 채널과 Restore 파일을 카탈로그에 반영
+
+        Args:
+            cycle_df (DataFrame): cyclename, cyclepath 열이 있는 데이터
+
+        Returns:
+            dict: {'channels', 'files_read', 'files_skipped', 'files_removed'}
+        """
+        channel_to_group, cycle_info_mapping = identify_channel_groups(cycle_df)
+        tasks = build_channel_tasks(cycle_df, channel_to_group, cycle_info_mapping)
+
+        stats = {'channels': 0, 'files_read': 0, 'files_skipped': 0, 'files_removed': 0}
+        with self.conn:
+            for task in tasks:
+                self._scan_channel(task, stats)
+                stats['channels'] += 1
+
+        logger.info(f"카탈로그 갱신: 채널 {stats['channels']}개, 파일 {stats['files_read']}개 읽음, "
+                    f"{stats['files_skipped']}개 변경 없음, {stats['files_removed']}개 삭제")
+        return stats
+
+    def _scan_channel(self, task, stats):
+        subfolder = task['subfolder']
+        channel_name = os.path.basename(os.path.normpath(subfolder))
+        channel_match = re.search(r'M\d+Ch(\d+)', channel_name)
+
+        self.conn.execute(
+            """INSERT INTO channels (subfolder, cyclename, cycle_info, seq_num, group_name, module, channel,
+                                     channel_id, capacity_mah)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT (subfolder) DO UPDATE SET
+                   cyclename = excluded.cyclename, cycle_info = excluded.cycle_info,
+                   seq_num = excluded.seq_num, group_name = excluded.group_name, module = excluded.module,
+                   channel = excluded.channel, channel_id = excluded.channel_id,
+                   capacity_mah = excluded.capacity_mah""",
+            (subfolder, task['cyclename'], task['cycle_info'], task['seq_num'], task['group_name'],
+             extract_module(subfolder), channel_match.group(1) if channel_match else None,
+             task['channel_id'], extract_capacity(task['cyclename'])))
+        channel_rowid = self.conn.execute("SELECT id FROM channels WHERE subfolder = ?",
+                                          (subfolder,)).fetchone()[0]
+
+        known = {name: (size, mtime_ns) for name, size, mtime_ns in self.conn.execute(
+            "SELECT name, size, mtime_ns FROM files WHERE channel = ?", (channel_rowid,))}
+
+        restore_dir = os.path.join(subfolder, "Restore")
+        present = set()
+        if restore_exists(restore_dir):
+            # 압축된 채널은 압축을 푼 크기와 압축 파일의 수정 시각 사용
+            for name, size, mtime_ns in restore_file_stats(restore_dir):
+                if not name.endswith(".csv"):
+                    continue
+                present.add(name)
+                if known.get(name) == (size, mtime_ns):
+                    stats['files_skipped'] += 1
+                    continue
+
+                kind = file_kind(name)
+                row_count, first_cycle, last_cycle = (None, None, None)
+                if kind in ("SaveData", "SaveEndData"):
+                    row_count, first_cycle, last_cycle = summarize_restore_file(os.path.join(restore_dir, name))
+                self.conn.execute(
+                    """INSERT OR REPLACE INTO files (channel, name, kind, size, mtime_ns, row_count,
+                                                     first_cycle, last_cycle)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (channel_rowid, name, kind, size, mtime_ns, row_count, first_cycle, last_cycle))
+                stats['files_read'] += 1
+        else:
+            logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+
+        for name in set(known) - present:
+            self.conn.execute("DELETE FROM files WHERE channel = ? AND name = ?", (channel_rowid, name))
+            stats['files_removed'] += 1
+
+        # 채널 사이클 범위는 SaveEndData 기준 (없으면 SaveData)
+        ranges = dict((kind, (first, last)) for kind, first, last in self.conn.execute(
+            """SELECT kind, MIN(first_cycle), MAX(last_cycle) FROM files
+               WHERE channel = ? AND kind IN ('SaveData', 'SaveEndData') GROUP BY kind""", (channel_rowid,)))
+        first_cycle, last_cycle = ranges.get('SaveEndData', ranges.get('SaveData', (None, None)))
+        self.conn.execute("UPDATE channels SET first_cycle = ?, last_cycle = ?, scanned_at = ? WHERE id = ?",
+                          (first_cycle, last_cycle, time.time(), channel_rowid))
+
+    def query(self, sql, params=()):
+        """임의 SQL 조회 결과를 DataFrame으로 반환"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def inventory(self, cycle_info=None):
+        """
+        채널 목록 (사이클 정보, 시퀀스 번호, 그룹 순)
+
+        Returns:
+            DataFrame: 채널 정보와 파일 수, 전체 크기, 프로파일 행 수
+        """
+        sql = """SELECT c.cycle_info, c.seq_num, c.cyclename, c.group_name, c.module, c.channel, c.channel_id,
+                        c.capacity_mah, c.first_cycle, c.last_cycle, c.subfolder,
+                        COUNT(f.name) AS file_count, COALESCE(SUM(f.size), 0) AS total_bytes,
+                        COALESCE(SUM(CASE WHEN f.kind = 'SaveData' THEN f.row_count END), 0) AS profile_rows
+                 FROM channels c LEFT JOIN files f ON f.channel = c.id"""
+        params = ()
+        if cycle_info is not None:
+            sql += " WHERE c.cycle_info = ?"
+            params = (cycle_info,)
+        sql += " GROUP BY c.id ORDER BY c.cycle_info, c.seq_num, c.group_name"
+        return self.query(sql, params)
+
+    def channels_reaching(self, cycle, cycle_info=None):
+        """
+        지정 사이클 이상까지 진행된 채널
+
+        시퀀스로 이어진 시험은 (사이클 정보, 그룹)별 최대 사이클로 판단함.
+
+        Returns:
+            DataFrame: cycle_info, group_name, channel_ids, last_cycle
+        """
+        sql = """SELECT cycle_info, group_name, GROUP_CONCAT(DISTINCT channel_id) AS channel_ids,
+                        MAX(last_cycle) AS last_cycle
+                 FROM channels"""
+        params = [cycle]
+        if cycle_info is not None:
+            sql += " WHERE cycle_info = ?"
+            params.insert(0, cycle_info)
+        sql += " GROUP BY cycle_info, group_name HAVING MAX(last_cycle) >= ? ORDER BY cycle_info, group_name"
+        return self.query(sql, tuple(params))
+
+    def lineage(self, cycle_info):
+        """사이클 정보에 속한 cyclename 순서와 각 사이클 범위"""
+        return self.query(
+            """SELECT seq_num, cyclename, MIN(first_cycle) AS first_cycle, MAX(last_cycle) AS last_cycle,
+                      COUNT(*) AS channels
+               FROM channels WHERE cycle_info = ? GROUP BY seq_num, cyclename ORDER BY seq_num, cyclename""",
+            (cycle_info,))
+
+    def files(self, subfolder):
+        """채널의 Restore 파일 정보"""
+        return self.query(
+            """SELECT f.name, f.kind, f.size, f.mtime_ns, f.row_count, f.first_cycle, f.last_cycle
+               FROM files f JOIN channels c ON f.channel = c.id WHERE c.subfolder = ? ORDER BY f.name""",
+            (subfolder,))
+
+
+def build_catalog(cycle_df, db_path=DEFAULT_CATALOG_PATH):
+    """
+    카탈로그 생성 또는 갱신
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열이 있는 데이터
+        db_path (str): SQLite 파일 경로
+
+    Returns:
+        PNECatalog: 갱신된 카탈로그
+    """
+    catalog = PNECatalog(db_path)
+    catalog.scan(cycle_df)
+    return catalog
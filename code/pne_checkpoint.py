@@ -0,0 +1,134 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def run_key(cycle_df, inicycle, endcycle, version):
+    """
+    실행 조건(경로 목록, 사이클 범위, 처리 버전)으로 체크포인트 식별자 생성
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+        inicycle (int): 시작 사이클 번호
+        endcycle (int): 종료 사이클 번호
+        version (int): 처리 버전
+
+    Returns:
+        str: 16자리 해시
+    """
+    rows = list(zip(cycle_df['cyclename'].astype(str), cycle_df['cyclepath'].astype(str)))
+    payload = json.dumps([rows, inicycle, endcycle, version], default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class RunCheckpoint:
+    """
+    채널별 처리 결과를 완료 즉시 기록하는 체크포인트 저널
+
+    <checkpoint_dir>/<run_key>/journal.jsonl 에 (cycle_info, group, channel) 완료 기록을
+    한 줄씩 추가하고 결과는 results/ 아래 pickle로 저장. 같은 조건으로 다시 실행하면
+    기록된 채널은 저장된 결과를 재사용함. 기록할 때 채널의 Restore 지문을 함께 저장하므로,
+    진행 중인 시험처럼 원본 파일이 그 사이 바뀐 채널은 다시 처리함.
+    """
+
+    JOURNAL_NAME = "journal.jsonl"
+
+    def __init__(self, checkpoint_dir, key):
+        self.run_dir = os.path.join(checkpoint_dir, key)
+        self.result_dir = os.path.join(self.run_dir, "results")
+        self.journal_path = os.path.join(self.run_dir, self.JOURNAL_NAME)
+        os.makedirs(self.result_dir, exist_ok=True)
+        self.completed = self._read_journal()
+        if self.completed:
+            logger.info(f"체크포인트에서 완료된 채널 {len(self.completed)}개를 찾았습니다: {self.run_dir}")
+
+    @staticmethod
+    def _entry_key(cycle_info, group_name, channel):
+        return (str(cycle_info), str(group_name), str(channel))
+
+    @staticmethod
+    def _normalize_fingerprint(fingerprint):
+        # 저널(JSON)에서 읽은 값과 비교할 수 있도록 튜플을 리스트로 맞춤
+        return None if fingerprint is None else json.loads(json.dumps(fingerprint))
+
+    def _read_journal(self):
+        completed = {}
+        if not os.path.exists(self.journal_path):
+            return completed
+
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # 기록 도중 중단되어 잘린 마지막 줄은 무시
+                    continue
+                key = self._entry_key(entry['cycle_info'], entry['group'], entry['channel'])
+                completed[key] = {'result': entry.get('result'), 'fingerprint': entry.get('fingerprint')}
+        return completed
+
+    def is_done(self, cycle_info, group_name, channel, fingerprint=None):
+        """
+        완료 기록 여부 (fingerprint를 주면 기록 당시의 Restore 지문과 같을 때만 완료로 봄)
+        """
+        entry = self.completed.get(self._entry_key(cycle_info, group_name, channel))
+        if entry is None:
+            return False
+        return fingerprint is None or entry['fingerprint'] == self._normalize_fingerprint(fingerprint)
+
+    def load(self, cycle_info, group_name, channel):
+        """
+        기록된 결과 반환 (결과가 비어 있던 채널은 빈 DataFrame)
+        """
+        entry = self.completed.get(self._entry_key(cycle_info, group_name, channel))
+        result = entry['result'] if entry is not None else None
+        if not result:
+            return pd.DataFrame()
+        return pd.read_pickle(os.path.join(self.result_dir, result))
+
+    def record(self, cycle_info, group_name, channel, data, fingerprint=None):
+        """
+        결과를 먼저 저장한 뒤 저널에 완료 기록 추가 (저장 중 중단되면 미완료로 간주)
+
+        fingerprint는 처리를 시작하기 전에 구한 채널의 restore_fingerprint() 결과.
+        """
+        key = self._entry_key(cycle_info, group_name, channel)
+        result = None
+        if data is not None and not data.empty:
+            result = hashlib.sha1(json.dumps(key).encode("utf-8")).hexdigest() + ".pkl"
+            temp_path = os.path.join(self.result_dir, result + ".tmp")
+            data.to_pickle(temp_path)
+            os.replace(temp_path, os.path.join(self.result_dir, result))
+
+        fingerprint = self._normalize_fingerprint(fingerprint)
+        entry = {'cycle_info': key[0], 'group': key[1], 'channel': key[2], 'result': result,
+                 'fingerprint': fingerprint}
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.completed[key] = {'result': result, 'fingerprint': fingerprint}
+
+    def get_or_compute(self, cycle_info, group_name, channel, compute, fingerprint=None):
+        """
+        완료 기록이 있고 Restore 지문이 같으면 저장된 결과를, 아니면 compute() 결과를 기록 후 반환
+        """
+        if self.is_done(cycle_info, group_name, channel, fingerprint):
+            logger.info(f"    체크포인트 결과 재사용: {channel}")
+            return self.load(cycle_info, group_name, channel)
+        if self.is_done(cycle_info, group_name, channel):
+            logger.info(f"    원본 파일이 바뀌어 다시 처리: {channel}")
+
+        data = compute()
+        self.record(cycle_info, group_name, channel, data, fingerprint)
+        return data
+
+    def clear(self):
+        """실행이 끝난 뒤 체크포인트 삭제"""
+        shutil.rmtree(self.run_dir, ignore_errors=True)
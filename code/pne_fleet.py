@@ -0,0 +1,216 @@
+import os
+import re
+import glob
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 지표 이름 -> (원본 열, 대상 스텝 타입)
+# 스텝 타입 1: 충전, 2: 방전
+FLEET_METRICS = {
+    'dchg_capacity': ('dchg_capacity', (2,)),
+    'chg_capacity': ('chg_capacity', (1,)),
+    'voltage': ('voltage', (2,)),
+}
+
+# main()이 내보내는 병합 CSV 파일 이름 패턴
+MERGED_FILE_PATTERN = re.compile(r'^(?P<cycle_info>.+)_(?P<group>Data#\d+)_ch(?P<channels>.+)_merged_cycles\.csv$')
+
+
+@dataclass
+class FleetArrays:
+    """
+    (채널, 사이클)로 정렬된 밀집 배열 모음
+
+    Attributes:
+        labels (list): 행 순서의 (사이클 정보, 그룹 이름) 목록
+        channel_ids (list): 행 순서의 채널 ID 문자열 (예: '045-045')
+        cycles (ndarray): 열 순서의 사이클 번호
+        metrics (dict): 지표 이름 -> (채널 수, 사이클 수) float 배열, 빈 칸은 NaN
+    """
+    labels: list
+    channel_ids: list
+    cycles: np.ndarray
+    metrics: dict = field(default_factory=dict)
+
+    def row(self, cycle_info, group_name):
+        """(사이클 정보, 그룹 이름)에 해당하는 행 번호 반환"""
+        return self.labels.index((cycle_info, group_name))
+
+    def column(self, cycle):
+        """사이클 번호에 해당하는 열 번호 반환 (없으면 -1)"""
+        pos = np.searchsorted(self.cycles, cycle)
+        if pos < len(self.cycles) and self.cycles[pos] == cycle:
+            return int(pos)
+        return -1
+
+    def band(self, metric):
+        """
+        사이클별 채널 평균/표준편차 밴드
+
+        Args:
+            metric (str): 지표 이름
+
+        Returns:
+            tuple: (mean, std) - 사이클 길이의 배열
+        """
+        values = self.metrics[metric]
+        valid = np.isfinite(values)
+        count = valid.sum(axis=0)
+        filled = np.where(valid, values, 0.0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = filled.sum(axis=0) / count
+            sq = np.where(valid, (values - mean) ** 2, 0.0)
+            std = np.sqrt(sq.sum(axis=0) / count)
+        return mean, std
+
+    def retention(self, metric='dchg_capacity', reference_cycle=None):
+        """
+        기준 사이클 대비 유지율 곡선
+
+        Args:
+            metric (str): 지표 이름
+            reference_cycle (int, optional): 기준 사이클, None이면 채널별 첫 유효 사이클
+
+        Returns:
+            ndarray: (채널 수, 사이클 수) 유지율 배열
+        """
+        values = self.metrics[metric]
+        if reference_cycle is None:
+            valid = np.isfinite(values)
+            first = valid.argmax(axis=1)
+            reference = values[np.arange(values.shape[0]), first]
+            reference[~valid.any(axis=1)] = np.nan
+        else:
+            col = self.column(reference_cycle)
+            if col == -1:
+                raise ValueError(f"기준 사이클 {reference_cycle}이 배열에 없습니다.")
+            reference = values[:, col]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return values / reference[:, None]
+
+    def last_valid(self, metric):
+        """채널별 마지막 유효 값과 그 사이클 번호 반환"""
+        values = self.metrics[metric]
+        valid = np.isfinite(values)
+        last = values.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+        result = values[np.arange(values.shape[0]), last]
+        cycles = self.cycles[last].astype(float)
+        result[~valid.any(axis=1)] = np.nan
+        cycles[~valid.any(axis=1)] = np.nan
+        return result, cycles
+
+    def rank(self, metric='dchg_capacity', cycle=None, descending=True):
+        """
+        지정 사이클(없으면 채널별 마지막 유효 사이클) 값으로 채널 순위 계산
+
+        Returns:
+            ndarray: 순위 순서의 행 번호 (NaN은 마지막)
+        """
+        if cycle is None:
+            values, _ = self.last_valid(metric)
+        else:
+            col = self.column(cycle)
+            if col == -1:
+                raise ValueError(f"사이클 {cycle}이 배열에 없습니다.")
+            values = self.metrics[metric][:, col]
+
+        key = -values if descending else values
+        return np.argsort(np.where(np.isnan(key), np.inf, key), kind='stable')
+
+
+def build_fleet_arrays(group_frames, metrics=None):
+    """
+    그룹별 병합 사이클 데이터를 (채널, 사이클) 밀집 배열로 정렬
+
+    Args:
+        group_frames (dict): (사이클 정보, 그룹 이름) -> DataFrame, {'data', ...} 또는 main()의 결과 {'path', ...}
+        metrics (dict, optional): 지표 정의, 기본값은 FLEET_METRICS
+
+    Returns:
+        FleetArrays: 지표별 NaN 패딩 배열
+    """
+    metrics = metrics or FLEET_METRICS
+
+    columns = ['cycle', 'step_type'] + sorted({col for col, _ in metrics.values()})
+
+    labels = []
+    channel_ids = []
+    frames = []
+    for key in sorted(group_frames):
+        item = group_frames[key]
+        if isinstance(item, dict):
+            # main()은 병합 데이터를 메모리에 두지 않고 출력 파일 경로만 반환
+            data = item['data'] if 'data' in item else pd.read_csv(item['path'], usecols=columns)
+            ids = '-'.join(item.get('channel_ids', []))
+        else:
+            data = item
+            ids = '-'.join(pd.unique(data['channel_id'].astype(str))) if 'channel_id' in data else ''
+
+        if data.empty or 'cycle' not in data.columns:
+            logger.warning(f"{key}에 사이클 열이 없어 제외합니다.")
+            continue
+
+        labels.append(key)
+        channel_ids.append(ids)
+        frames.append(data[columns])
+
+    if not frames:
+        return FleetArrays(labels=[], channel_ids=[], cycles=np.array([], dtype=np.int64))
+
+    # 모든 행을 한 번에 (행 번호, 사이클 위치)로 변환
+    lengths = np.array([len(f) for f in frames])
+    rows = np.repeat(np.arange(len(frames)), lengths)
+    stacked = pd.concat(frames, ignore_index=True)
+    cycle_values = stacked['cycle'].to_numpy(dtype=np.int64)
+    step_values = stacked['step_type'].to_numpy()
+
+    cycles = np.unique(cycle_values)
+    cols = np.searchsorted(cycles, cycle_values)
+    shape = (len(frames), len(cycles))
+
+    arrays = {}
+    for name, (source, step_types) in metrics.items():
+        mask = np.isin(step_values, step_types)
+        values = np.full(shape, np.nan)
+        # 같은 (채널, 사이클)에 여러 행이 있으면 마지막 행을 사용
+        flat = rows[mask] * shape[1] + cols[mask]
+        _, last = np.unique(flat[::-1], return_index=True)
+        last = len(flat) - 1 - last
+        values.flat[flat[last]] = stacked[source].to_numpy(dtype=float)[mask][last]
+        arrays[name] = values
+
+    logger.info(f"{shape[0]}개 채널 x {shape[1]}개 사이클 배열 생성 ({', '.join(arrays)})")
+    return FleetArrays(labels=labels, channel_ids=channel_ids, cycles=cycles, metrics=arrays)
+
+
+def load_merged_group_csvs(directory='.'):
+    """
+    main()이 내보낸 *_merged_cycles.csv 파일을 그룹별로 로드
+
+    Args:
+        directory (str): CSV 파일이 있는 디렉토리
+
+    Returns:
+        dict: (사이클 정보, 그룹 이름) -> {'data', 'channel_ids'} 딕셔너리
+    """
+    group_frames = {}
+    for file_path in sorted(glob.glob(os.path.join(directory, '*_merged_cycles.csv'))):
+        match = MERGED_FILE_PATTERN.match(os.path.basename(file_path))
+        if not match:
+            continue
+
+        data = pd.read_csv(file_path)
+        group_frames[(match.group('cycle_info'), match.group('group'))] = {
+            'data': data,
+            'channel_ids': match.group('channels').split('-')
+        }
+
+    logger.info(f"{directory}에서 {len(group_frames)}개의 병합 그룹 파일을 로드했습니다.")
+    return group_frames
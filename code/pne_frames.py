@@ -0,0 +1,118 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def add_metadata_columns(data, metadata):
+    """
+    메타데이터 값을 범주형 열로 추가 (값 1개 + 행마다 1바이트 코드)
+
+    Args:
+        data (DataFrame): 메타데이터를 추가할 데이터
+        metadata (dict): 열 이름 -> 값
+    """
+    codes = np.zeros(len(data), dtype=np.int8)
+    for key, value in metadata.items():
+        data[key] = pd.Categorical.from_codes(codes, categories=[value])
+
+
+
+def concat_categorical(data_frames):
+    """
+    범주형 열을 유지하면서 DataFrame 연결
+
+    범주가 서로 다른 범주형 열을 그대로 연결하면 object 열로 바뀌므로,
+    먼저 범주 집합을 합친 뒤 연결
+
+    Args:
+        data_frames (list): 연결할 DataFrame 목록
+
+    Returns:
+        DataFrame: 연결된 데이터
+    """
+    frames = [frame for frame in data_frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    category_columns = [col for col in frames[0].columns 
+                        if isinstance(frames[0][col].dtype, pd.CategoricalDtype)]
+    for col in category_columns:
+        categories = list(dict.fromkeys(
+            value for frame in frames for value in frame[col].cat.categories))
+        aligned = []
+        for frame in frames:
+            frame = frame.copy(deep=False)
+            frame[col] = frame[col].cat.set_categories(categories)
+            aligned.append(frame)
+        frames = aligned
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def drop_overlap_rows(previous, current, key_column, compare_columns):
+    """
+    이어서 시작된 시험(_1, _2, ...)의 앞부분에서 이전 구간 꼬리와 중복된 행 제거
+
+    이전 구간의 키 열이 정렬되어 있다고 보고 현재 구간 첫 키의 위치를 이진 탐색한 뒤,
+    그 위치부터 겹치는 행을 배열 단위로 비교하여 앞에서부터 연속으로 같은 행만 제거
+
+    Args:
+        previous (DataFrame): 이전 구간 데이터
+        current (DataFrame): 현재 구간 데이터
+        key_column (str): 정렬 기준 열 (인덱스 #0)
+        compare_columns (list): 중복 판정에 사용할 수치 열
+
+    Returns:
+        DataFrame: 중복 행이 제거된 현재 구간 데이터
+    """
+    if previous.empty or current.empty:
+        return current
+
+    prev_keys = previous[key_column].to_numpy()
+    if np.any(np.diff(prev_keys) < 0):
+        logger.debug("이전 구간의 키가 정렬되어 있지 않아 중복 제거를 건너뜁니다.")
+        return current
+
+    start = np.searchsorted(prev_keys, current[key_column].iloc[0], side='left')
+    overlap = min(len(previous) - start, len(current))
+    if overlap <= 0:
+        return current
+
+    prev_values = previous[compare_columns].to_numpy()[start:start + overlap]
+    curr_values = current[compare_columns].to_numpy()[:overlap]
+    equal = np.all((prev_values == curr_values) | (pd.isna(prev_values) & pd.isna(curr_values)), axis=1)
+
+    # 앞에서부터 연속으로 일치하는 행 수
+    duplicated = overlap if equal.all() else int(np.argmin(equal))
+    if duplicated:
+        logger.info(f"    이전 구간과 중복된 {duplicated}개 행 제거")
+    return current.iloc[duplicated:]
+
+
+
+def stitch_segments(data_frames, key_column='time', compare_columns=None):
+    """
+    seq_num 순으로 정렬된 구간을 이어 붙이면서 구간 사이의 중복 행 제거
+
+    Args:
+        data_frames (list): seq_num 순서의 DataFrame 목록
+        key_column (str): 정렬 기준 열
+        compare_columns (list, optional): 중복 판정 열, None이면 수치 열 전체
+
+    Returns:
+        list: 중복이 제거된 DataFrame 목록
+    """
+    stitched = []
+    previous = None
+    for data in data_frames:
+        if previous is not None:
+            columns = compare_columns or [c for c in data.columns
+                                          if c in previous.columns and pd.api.types.is_numeric_dtype(data[c])]
+            data = drop_overlap_rows(previous, data, key_column, columns)
+        stitched.append(data)
+        if not data.empty:
+            previous = data
+    return stitched
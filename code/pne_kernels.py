@@ -0,0 +1,218 @@
+import logging
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # numba가 없으면 NumPy 구현 사용
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# 일(day) -> 1/100초 변환 계수 (24*60*60*100)
+DAY_TO_HUNDREDTH_SEC = 8640000
+
+
+def _njit(func):
+    """numba가 있으면 네이티브 코드로 컴파일, 없으면 원래 함수 그대로 반환"""
+    if numba is None:
+        return func
+    return numba.njit(cache=True, nogil=True)(func)
+
+
+def _backend(use_numba):
+    """
+    사용할 구현 결정
+
+    Args:
+        use_numba (bool or None): None이면 numba가 있을 때만 사용, True면 numba 필수
+
+    Returns:
+        bool: numba 커널 사용 여부
+    """
+    if use_numba and numba is None:
+        raise ImportError("JIT 커널을 사용하려면 numba가 필요합니다 (pip install numba).")
+    return numba is not None if use_numba is None else bool(use_numba)
+
+
+# ---------------------------------------------------------------------------
+# 행 순서대로 도는 커널 (numba가 있으면 컴파일됨)
+# ---------------------------------------------------------------------------
+
+def _accumulate_time_loop(raw, is_candidate):
+    n = raw.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    offset = 0.0
+    for i in range(n):
+        # 후보 위치에서 시간이 이전 행보다 작아지면 이전 행의 시간을 누적
+        if i > 0 and is_candidate[i] and raw[i] < raw[i - 1]:
+            offset += raw[i - 1]
+        out[i] = (offset + raw[i]) / 100.0
+    return out
+
+
+def _step_ids_loop(step_type, cycle):
+    n = step_type.shape[0]
+    out = np.empty(n, dtype=np.int64)
+    step_id = 0
+    for i in range(n):
+        if i > 0 and (step_type[i] != step_type[i - 1] or cycle[i] != cycle[i - 1]):
+            step_id += 1
+        out[i] = step_id
+    return out
+
+
+def _step_elapsed_loop(step_ids, time_seconds):
+    n = step_ids.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    start_time = 0.0
+    for i in range(n):
+        if i == 0 or step_ids[i] != step_ids[i - 1]:
+            start_time = time_seconds[i]
+        out[i] = time_seconds[i] - start_time
+    return out
+
+
+def _coulomb_count_loop(current, time_seconds, step_ids):
+    n = current.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    charge = 0.0
+    for i in range(n):
+        if i == 0 or step_ids[i] != step_ids[i - 1]:
+            charge = 0.0
+        else:
+            charge += current[i] * (time_seconds[i] - time_seconds[i - 1]) / 3600.0
+        out[i] = charge
+    return out
+
+
+_accumulate_time_jit = _njit(_accumulate_time_loop)
+_step_ids_jit = _njit(_step_ids_loop)
+_step_elapsed_jit = _njit(_step_elapsed_loop)
+_coulomb_count_jit = _njit(_coulomb_count_loop)
+
+
+def _segment_starts(step_ids):
+    """step_ids가 바뀌는 행 위치 (첫 행 포함)"""
+    if len(step_ids) == 0:
+        return np.array([], dtype=np.int64)
+    return np.concatenate(([0], np.flatnonzero(step_ids[1:] != step_ids[:-1]) + 1))
+
+
+# ---------------------------------------------------------------------------
+# 공개 함수
+# ---------------------------------------------------------------------------
+
+def accumulate_time(days, hundredth_seconds, segment_starts=None, use_numba=None):
+    """
+    #18(일)과 #19(1/100초)를 시간이 초기화될 때마다 누적한 연속 시간(초)으로 변환
+
+    segment_starts가 주어지면 그 위치(예: 이어 붙인 프로파일의 시작 행)에서만 초기화를 확인하고,
+    없으면 모든 행에서 확인함. 초기화되면 직전 행의 시간을 이후 모든 행에 더함.
+
+    Args:
+        days (array): 일 단위 시간 (#18)
+        hundredth_seconds (array): 1/100초 단위 시간 (#19)
+        segment_starts (array, optional): 초기화를 확인할 행 위치
+        use_numba (bool, optional): None이면 numba가 있을 때만 사용
+
+    Returns:
+        ndarray: 초 단위 누적 시간
+    """
+    raw = (np.asarray(days, dtype=np.float64) * DAY_TO_HUNDREDTH_SEC
+           + np.asarray(hundredth_seconds, dtype=np.float64))
+    n = len(raw)
+
+    is_candidate = np.ones(n, dtype=np.bool_)
+    if segment_starts is not None:
+        is_candidate[:] = False
+        starts = np.asarray(segment_starts, dtype=np.int64)
+        is_candidate[starts[(starts > 0) & (starts < n)]] = True
+
+    if _backend(use_numba):
+        return _accumulate_time_jit(raw, is_candidate)
+
+    candidates = np.flatnonzero(is_candidate[1:]) + 1
+    reset = candidates[raw[candidates] < raw[candidates - 1]]
+    increments = np.zeros(n, dtype=np.float64)
+    increments[reset] = raw[reset - 1]
+    # 누적 값은 모두 정수(1/100초)라 합산 순서와 관계없이 결과가 같음
+    return (np.cumsum(increments) + raw) / 100.0
+
+
+def step_ids(step_type, cycle, use_numba=None):
+    """
+    스텝 타입(#2) 또는 사이클(#27)이 바뀔 때마다 증가하는 스텝 번호
+
+    Args:
+        step_type (array): 스텝 타입
+        cycle (array): 사이클 번호
+        use_numba (bool, optional): None이면 numba가 있을 때만 사용
+
+    Returns:
+        ndarray: 0부터 시작하는 행별 스텝 번호
+    """
+    step_type = np.ascontiguousarray(step_type)
+    cycle = np.ascontiguousarray(cycle)
+    if _backend(use_numba):
+        return _step_ids_jit(step_type, cycle)
+
+    changed = np.zeros(len(step_type), dtype=np.int64)
+    changed[1:] = (step_type[1:] != step_type[:-1]) | (cycle[1:] != cycle[:-1])
+    return np.cumsum(changed)
+
+
+def step_elapsed(step_ids, time_seconds, use_numba=None):
+    """
+    스텝 시작 후 경과 시간(초)
+
+    Args:
+        step_ids (array): step_ids()의 결과
+        time_seconds (array): 초 단위 누적 시간
+        use_numba (bool, optional): None이면 numba가 있을 때만 사용
+
+    Returns:
+        ndarray: 행별 스텝 내 경과 시간
+    """
+    step_ids = np.ascontiguousarray(step_ids)
+    time_seconds = np.ascontiguousarray(time_seconds, dtype=np.float64)
+    if _backend(use_numba):
+        return _step_elapsed_jit(step_ids, time_seconds)
+
+    starts = _segment_starts(step_ids)
+    lengths = np.diff(np.append(starts, len(step_ids)))
+    return time_seconds - np.repeat(time_seconds[starts], lengths)
+
+
+def coulomb_count(current, time_seconds, step_ids, use_numba=None):
+    """
+    스텝마다 0에서 다시 시작하는 전류 적산 용량
+
+    q[i] = q[i-1] + I[i] * (t[i] - t[i-1]) / 3600 (스텝 첫 행은 0)
+    단위는 전류 단위 x 시간(h) (예: mA -> mAh)
+
+    Args:
+        current (array): 전류 (#9)
+        time_seconds (array): 초 단위 누적 시간
+        step_ids (array): step_ids()의 결과
+        use_numba (bool, optional): None이면 numba가 있을 때만 사용
+
+    Returns:
+        ndarray: 행별 적산 용량
+    """
+    current = np.ascontiguousarray(current, dtype=np.float64)
+    time_seconds = np.ascontiguousarray(time_seconds, dtype=np.float64)
+    step_ids = np.ascontiguousarray(step_ids)
+    if _backend(use_numba):
+        return _coulomb_count_jit(current, time_seconds, step_ids)
+
+    increments = np.zeros(len(current), dtype=np.float64)
+    increments[1:] = current[1:] * (time_seconds[1:] - time_seconds[:-1]) / 3600.0
+
+    # 전체 누적 합에서 스텝 시작 값을 빼서 반복문 없이 스텝별로 다시 시작
+    # (루프 커널과는 덧셈 순서가 달라 부동소수점 반올림 수준의 차이가 있을 수 있음)
+    starts = _segment_starts(step_ids)
+    increments[starts] = 0.0
+    total = np.cumsum(increments)
+    lengths = np.diff(np.append(starts, len(current)))
+    return total - np.repeat(total[starts], lengths)
@@ -0,0 +1,235 @@
+import os
+import time
+import logging
+
+import numpy as np
+import pandas as pd
+
+from pne_async import parse_csv_bytes
+
+logger = logging.getLogger(__name__)
+
+# 폴링 간격 (초)
+DEFAULT_POLL_INTERVAL = 0.5
+
+# skip_to_end가 파일 끝에서부터 한 번에 읽는 크기 (바이트)
+SKIP_CHUNK_SIZE = 64 * 1024
+
+
+class TailReader:
+    """
+    파일별로 마지막으로 읽은 바이트 위치를 기억하고 새로 추가된 완전한 줄만 읽는 클래스
+
+    아직 쓰는 중인 마지막 줄(줄바꿈 없음)은 위치를 옮기지 않고 다음 읽기로 미룸.
+    파일이 이전 위치보다 작아지면(새로 쓰기) 처음부터 다시 읽고, take_rewritten()으로
+    알려 줌 (이전에 읽은 행을 버리도록).
+    """
+
+    def __init__(self):
+        self.offsets = {}
+        self.rewritten = set()
+
+    def read_new_bytes(self, file_path):
+        """
+        새로 추가된 완전한 줄의 바이트 반환
+
+        Returns:
+            bytes: 새 줄 (없으면 b"")
+        """
+        offset = self.offsets.get(file_path, 0)
+        try:
+            size = os.path.getsize(file_path)
+        except FileNotFoundError:
+            return b""
+
+        if size < offset:
+            logger.info(f"파일이 다시 작성되어 처음부터 읽습니다: {file_path}")
+            offset = 0
+            self.offsets[file_path] = 0
+            self.rewritten.add(file_path)
+        if size == offset:
+            return b""
+
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            raw = f.read(size - offset)
+
+        end = raw.rfind(b"\n")
+        if end == -1:
+            return b""
+
+        self.offsets[file_path] = offset + end + 1
+        return raw[:end + 1]
+
+    def read_new(self, file_path):
+        """새로 추가된 완전한 줄을 DataFrame으로 반환"""
+        return parse_csv_bytes(self.read_new_bytes(file_path))
+
+    def take_rewritten(self, file_path):
+        """
+        마지막 확인 이후 파일이 다시 작성되었는지 여부 (확인하면 표시를 지움)
+
+        Returns:
+            bool: True면 이전에 이 파일에서 읽은 내용은 더 이상 유효하지 않음
+        """
+        if file_path in self.rewritten:
+            self.rewritten.discard(file_path)
+            return True
+        return False
+
+    def skip_to_end(self, file_path):
+        """
+        현재까지의 내용은 건너뛰고 이후 추가분만 읽도록 위치 설정
+
+        파일 끝에서부터 고정 크기 블록 단위로 거슬러 올라가며 마지막 줄바꿈만 찾으므로
+        큰 파일도 전체를 읽지 않음.
+        """
+        with open(file_path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            while position > 0:
+                start = max(0, position - SKIP_CHUNK_SIZE)
+                f.seek(start)
+                end = f.read(position - start).rfind(b"\n")
+                if end != -1:
+                    self.offsets[file_path] = start + end + 1
+                    return
+                position = start
+        self.offsets[file_path] = 0
+
+
+class LiveCycleView:
+    """
+    진행 중인 시험 채널의 최근 사이클 데이터를 유지하는 뷰
+
+    poll()을 호출할 때마다 Restore의 가장 최근 SaveData 파일과 SaveEndData 파일에서
+    새로 추가된 줄만 읽어 최근 keep_cycles개 사이클(#27)의 데이터만 유지함.
+    행마다 읽어 온 파일을 기억해 두어, 파일이 다시 작성되면 그 파일의 행을 버린 뒤 다시 채움.
+    """
+
+    def __init__(self, subfolder, keep_cycles=10):
+        self.subfolder = subfolder
+        self.restore_dir = os.path.join(subfolder, "Restore")
+        self.keep_cycles = keep_cycles
+        self.reader = TailReader()
+        self.current_file = None
+        self.profile = pd.DataFrame()
+        self.cycles = pd.DataFrame()
+        # profile/cycles 행별 원본 파일 경로
+        self._profile_sources = np.array([], dtype=object)
+        self._cycle_sources = np.array([], dtype=object)
+        self.last_update = None
+
+    def _restore_files(self):
+        names = sorted(f for f in os.listdir(self.restore_dir) if f.endswith(".csv"))
+        save_data = [f for f in names if "SaveData" in f]
+        save_end = next((f for f in names if "SaveEndData" in f), None)
+        return save_data, save_end
+
+    def _trim(self, data, sources):
+        if data.empty:
+            return data, sources
+        keep = (data[27] > data[27].max() - self.keep_cycles).to_numpy()
+        return data[keep].reset_index(drop=True), sources[keep]
+
+    def _append(self, current, sources, new, file_path):
+        """
+        파일에서 새로 읽은 행 추가 (파일이 다시 작성되었으면 그 파일에서 읽었던 행을 먼저 제거)
+
+        Returns:
+            tuple: (데이터, 행별 원본 파일)
+        """
+        if self.reader.take_rewritten(file_path) and len(sources):
+            keep = sources != file_path
+            current, sources = current[keep].reset_index(drop=True), sources[keep]
+        if new.empty:
+            return current, sources
+        new_sources = np.full(len(new), file_path, dtype=object)
+        if current.empty:
+            return self._trim(new, new_sources)
+        return self._trim(pd.concat([current, new], ignore_index=True), np.concatenate([sources, new_sources]))
+
+    def start(self, from_end=False):
+        """
+        읽기 시작 위치 설정
+
+        Args:
+            from_end (bool): True면 현재 내용은 건너뛰고 이후 추가분만 반영
+        """
+        save_data, save_end = self._restore_files()
+        if save_data:
+            self.current_file = os.path.join(self.restore_dir, save_data[-1])
+        if from_end:
+            for name in save_data[-1:] + ([save_end] if save_end else []):
+                self.reader.skip_to_end(os.path.join(self.restore_dir, name))
+
+    def poll(self):
+        """
+        새로 추가된 데이터 반영
+
+        Returns:
+            int: 새로 반영된 프로파일 행 수
+        """
+        if not os.path.isdir(self.restore_dir):
+            return 0
+
+        save_data, save_end = self._restore_files()
+        new_rows = 0
+
+        if save_data:
+            newest = os.path.join(self.restore_dir, save_data[-1])
+            files = [newest]
+            if self.current_file and self.current_file != newest:
+                # 새 파일로 넘어가기 전에 이전 파일의 남은 줄을 먼저 읽음
+                files = [self.current_file, newest]
+            self.current_file = newest
+
+            for file_path in files:
+                new = self.reader.read_new(file_path)
+                new_rows += len(new)
+                self.profile, self._profile_sources = self._append(self.profile, self._profile_sources,
+                                                                   new, file_path)
+
+        if save_end:
+            save_end_path = os.path.join(self.restore_dir, save_end)
+            self.cycles, self._cycle_sources = self._append(self.cycles, self._cycle_sources,
+                                                            self.reader.read_new(save_end_path), save_end_path)
+
+        if new_rows:
+            self.last_update = time.time()
+        return new_rows
+
+
+def follow(subfolders, callback=None, interval=DEFAULT_POLL_INTERVAL, keep_cycles=10,
+           from_end=False, stop=None):
+    """
+    여러 채널을 주기적으로 폴링하며 최근 사이클 뷰를 갱신
+
+    Args:
+        subfolders (list): 감시할 채널 경로 목록
+        callback (callable, optional): 갱신된 채널마다 callback(view) 호출
+        interval (float): 폴링 간격 (초)
+        keep_cycles (int): 유지할 최근 사이클 수
+        from_end (bool): 시작 시점 이후 추가분만 반영할지 여부
+        stop (callable, optional): True를 반환하면 폴링 종료
+
+    Returns:
+        dict: 채널 경로 -> LiveCycleView
+    """
+    views = {subfolder: LiveCycleView(subfolder, keep_cycles) for subfolder in subfolders}
+    for view in views.values():
+        view.start(from_end)
+
+    try:
+        while stop is None or not stop():
+            started = time.time()
+            for view in views.values():
+                try:
+                    if view.poll() and callback is not None:
+                        callback(view)
+                except Exception as e:
+                    logger.error(f"실시간 데이터 읽기 중 오류 발생 ({view.subfolder}): {str(e)}")
+            time.sleep(max(0.0, interval - (time.time() - started)))
+    except KeyboardInterrupt:
+        logger.info("실시간 감시를 종료합니다.")
+
+    return views
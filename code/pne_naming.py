@@ -0,0 +1,14 @@
+import os
+import re
+
+
+def extract_capacity(cyclename):
+    """cyclename에서 용량(mAh) 추출 (예: A1_MP1_T23_4500mAh_1 -> 4500, 없으면 None)"""
+    match = re.search(r'(\d+)mAh', cyclename)
+    return int(match.group(1)) if match else None
+
+
+def extract_module(path):
+    """채널 폴더 이름에서 모듈 번호 추출 (예: M01Ch045[045] -> '01')"""
+    match = re.search(r'M(\d+)Ch\d+', os.path.basename(os.path.normpath(path)))
+    return match.group(1) if match else None
@@ -0,0 +1,96 @@
+import os
+import json
+import hashlib
+import logging
+
+from pne_cache import restore_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 출력 폴더마다 두는 출력 기록 파일
+MANIFEST_NAME = ".pne_outputs.json"
+
+
+def output_digest(*parts):
+    """
+    출력 내용을 결정하는 입력(채널 경로와 Restore 지문, 사이클 범위, 처리 버전 등)의 해시
+
+    Returns:
+        str: sha1 16진 문자열
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def channel_inputs(subfolders, fingerprints=None):
+    """
+    채널 경로별 Restore 지문 목록 (원본 파일이 바뀌면 해시가 달라짐)
+
+    fingerprints (dict, optional): 이미 구한 채널 경로 -> restore_fingerprint() 결과
+    """
+    fingerprints = fingerprints or {}
+    return [(os.path.normcase(os.path.abspath(subfolder)),
+             fingerprints[subfolder] if subfolder in fingerprints else restore_fingerprint(subfolder))
+            for subfolder in subfolders]
+
+
+class OutputManifest:
+    """
+    출력 파일별 입력 해시 기록
+
+    <output_dir>/.pne_outputs.json 에 출력 키 -> {해시, 파일 이름, 크기, 수정 시각}을 저장함.
+    해시가 같고 파일이 기록된 그대로 남아 있으면 같은 출력을 다시 만들 필요가 없음.
+    파일을 다시 쓰지 않으므로 수정 시각이 유지되어 동기화 도구도 변경으로 보지 않음.
+    """
+
+    def __init__(self, output_dir="."):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        self.changed = False
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"출력 기록을 읽을 수 없어 새로 만듭니다: {self.path} ({str(e)})")
+
+    def lookup(self, key, digest):
+        """
+        해시가 같고 파일이 그대로 있는 출력의 기록 반환
+
+        Returns:
+            dict: 기록 ('file', 'info' 등), 다시 만들어야 하면 None
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry['digest'] != digest:
+            return None
+        try:
+            stat = os.stat(os.path.join(self.output_dir, entry['file']))
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (entry['size'], entry['mtime_ns']):
+            return None
+        return entry
+
+    def record(self, key, digest, file_path, info=None):
+        """새로 쓴 출력 파일의 해시 기록 (save() 호출 시 저장)"""
+        stat = os.stat(file_path)
+        self.entries[key] = {'digest': digest, 'file': os.path.relpath(file_path, self.output_dir),
+                             'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'info': info}
+        self.changed = True
+
+    def forget(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.changed = True
+
+    def save(self):
+        """바뀐 기록이 있을 때만 저장 (기록 파일도 불필요하게 다시 쓰지 않음)"""
+        if not self.changed:
+            return
+        os.makedirs(self.output_dir or ".", exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, self.path)
+        self.changed = False
@@ -0,0 +1,266 @@
+import os
+import logging
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from pre250508_edit import (parse_file_index, identify_channel_groups, build_channel_tasks, add_metadata_columns,
+                            stitch_segments, concat_categorical, read_restore_csv, CycleSelection,
+                            selection_file_indices)
+from pne_archive import restore_exists, list_restore_files
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanSpec:
+    """
+    채널 하나를 읽을 때 적용할 조건 (최적화 후 필터와 열 선택이 모두 여기로 모임)
+
+    Attributes:
+        kind (str): 'profile' (SaveData) 또는 'cycle' (SaveEndData)
+        cycle_ranges (list): (시작, 종료) 사이클 범위 목록, 비어 있으면 전체
+        step_types (list): 스텝 타입 #2 목록, None이면 전체
+        columns (list): 결과에 남길 열, None이면 전체
+    """
+    kind: str = 'cycle'
+    cycle_ranges: list = field(default_factory=list)
+    step_types: list = None
+    columns: list = None
+
+    def read_columns(self):
+        """필터에 필요한 열까지 포함해 실제로 읽을 열 목록 (None이면 전체)"""
+        if self.columns is None:
+            return None
+        needed = list(self.columns)
+        if self.cycle_ranges and 27 not in needed:
+            needed.append(27)
+        if self.step_types is not None and 2 not in needed:
+            needed.append(2)
+        return sorted(needed)
+
+
+def _apply(data, spec):
+    """읽은 파일 하나에 필터와 열 선택을 바로 적용 (채널 단위로 합쳐진 연산)"""
+    if data.empty:
+        return data
+
+    mask = np.ones(len(data), dtype=bool)
+    if spec.cycle_ranges:
+        cycles = data[27].to_numpy()
+        in_range = np.zeros(len(data), dtype=bool)
+        for start, end in spec.cycle_ranges:
+            in_range |= (cycles >= start) & (cycles <= end)
+        mask &= in_range
+    if spec.step_types is not None:
+        mask &= np.isin(data[2].to_numpy(), spec.step_types)
+
+    rows = np.flatnonzero(mask)
+    columns = spec.columns if spec.columns is not None else list(data.columns)
+    return pd.DataFrame({col: data[col].to_numpy()[rows] for col in columns})
+
+
+def _profile_file_indices(restore_dir, subfiles, spec):
+    """
+    조건의 사이클 범위 중 채널에 실제로 있는 사이클의 행이 들어 있는 SaveData 파일 번호
+    (범위 사이의 파일은 읽지 않음)
+    """
+    save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
+    if not save_end_data_file or "savingFileIndex_start.csv" not in subfiles:
+        logger.warning(f"{restore_dir}에서 SaveEndData 또는 인덱스 파일을 찾을 수 없습니다.")
+        return []
+
+    cycle_data = read_restore_csv(os.path.join(restore_dir, save_end_data_file), usecols=[0, 27])
+    if cycle_data.empty:
+        return []
+
+    selection = CycleSelection([('range', start, end, 1) for start, end in spec.cycle_ranges])
+    cycles = selection.resolve(cycle_data[27].to_numpy())
+
+    index_df = read_restore_csv(os.path.join(restore_dir, "savingFileIndex_start.csv"), sep="\\s+")
+    return selection_file_indices(cycle_data, parse_file_index(index_df), cycles)
+
+
+def scan_channel(subfolder, spec):
+    """
+    채널 하나를 조건에 맞게 읽기 - 필요한 파일과 열만 읽고 파일마다 즉시 필터링
+
+    Args:
+        subfolder (str): Restore 디렉토리를 포함하는 채널 경로
+        spec (ScanSpec): 읽기 조건
+
+    Returns:
+        DataFrame: 조건에 맞는 행과 열
+    """
+    restore_dir = os.path.join(subfolder, "Restore")
+    if not restore_exists(restore_dir):
+        logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+        return pd.DataFrame()
+
+    subfiles = list_restore_files(restore_dir)
+    usecols = spec.read_columns()
+
+    if spec.kind == 'cycle':
+        save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
+        if not save_end_data_file:
+            return pd.DataFrame()
+        return _apply(read_restore_csv(os.path.join(restore_dir, save_end_data_file), usecols=usecols), spec)
+
+    profile_files = [name for name in subfiles if "SaveData" in name]
+    frames = []
+    for file_index in _profile_file_indices(restore_dir, subfiles, spec):
+        if file_index >= len(profile_files):
+            break
+        frame = _apply(read_restore_csv(os.path.join(restore_dir, profile_files[file_index]), usecols=usecols), spec)
+        if not frame.empty:
+            frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+class RunPlan:
+    """
+    탐색, 로드, 필터, 열 선택, 병합을 기록해 두었다가 한 번에 실행하는 지연 실행 계획
+
+    execute() 전에 optimize()가 모든 필터와 열 선택을 스캔 단계로 내려
+    필요한 SaveData 파일과 열만 읽고, 채널마다 읽기-필터-선택을 파일 단위로 합쳐 실행함.
+
+    예:
+        plan = (RunPlan(cycle_df).load('cycle').filter(cycles=[(1, 5), (500, 505)], step_types=[2])
+                .select([0, 8, 9, 27]).merge())
+        print(plan.explain())
+        result = plan.execute()
+    """
+
+    def __init__(self, cycle_df):
+        self.cycle_df = cycle_df
+        self.operations = [('discover', {})]
+
+    def _add(self, name, **params):
+        plan = RunPlan(self.cycle_df)
+        plan.operations = self.operations + [(name, params)]
+        return plan
+
+    def load(self, kind='cycle'):
+        if kind not in ('cycle', 'profile'):
+            raise ValueError(f"알 수 없는 데이터 종류: {kind}")
+        return self._add('load', kind=kind)
+
+    def filter(self, cycles=None, step_types=None):
+        """
+        Args:
+            cycles (tuple or list, optional): (시작, 종료) 범위 또는 그 목록 (양 끝 포함)
+            step_types (list, optional): 스텝 타입 #2 목록
+        """
+        if cycles is not None and len(cycles) == 2 and not isinstance(cycles[0], (tuple, list)):
+            cycles = [cycles]
+        return self._add('filter', cycles=cycles, step_types=step_types)
+
+    def select(self, columns):
+        return self._add('select', columns=list(columns))
+
+    def merge(self):
+        return self._add('merge')
+
+    def optimize(self):
+        """
+        기록된 연산을 (ScanSpec, merge 여부)로 정리
+
+        여러 filter는 교집합으로, 여러 select는 마지막 선택으로 합쳐 스캔에 전달
+
+        Returns:
+            tuple: (ScanSpec, bool)
+        """
+        spec = ScanSpec()
+        merge = False
+        loaded = False
+        for name, params in self.operations:
+            if name == 'load':
+                spec.kind = params['kind']
+                loaded = True
+            elif name == 'filter':
+                if params['cycles'] is not None:
+                    spec.cycle_ranges = _intersect_ranges(spec.cycle_ranges, params['cycles'])
+                if params['step_types'] is not None:
+                    step_types = list(params['step_types'])
+                    spec.step_types = step_types if spec.step_types is None else \
+                        [s for s in spec.step_types if s in step_types]
+            elif name == 'select':
+                if spec.columns is not None and not set(params['columns']) <= set(spec.columns):
+                    raise ValueError("이전에 선택하지 않은 열은 다시 선택할 수 없습니다.")
+                spec.columns = params['columns']
+            elif name == 'merge':
+                merge = True
+
+        if not loaded:
+            raise ValueError("load()가 없는 실행 계획입니다.")
+        return spec, merge
+
+    def explain(self):
+        """최적화된 실행 계획 설명 문자열"""
+        spec, merge = self.optimize()
+        lines = [
+            f"Discover: {len(self.cycle_df)}개 cyclepath",
+            f"  Scan[{spec.kind}] (채널별 파일 단위로 읽기+필터+선택)",
+            f"    cycles={spec.cycle_ranges or '전체'} step_types={spec.step_types or '전체'}",
+            f"    columns={spec.columns or '전체'} read_columns={spec.read_columns() or '전체'}",
+        ]
+        if spec.kind == 'profile':
+            lines.append("    SaveData 파일: 범위에 속한 사이클의 행이 있는 파일만 (범위 사이 파일 제외)")
+        if merge:
+            lines.append("  Merge: 그룹별 seq_num 순 연결 (중복 구간 제거)")
+        return "\n".join(lines)
+
+    def execute(self):
+        """
+        실행 계획 실행
+
+        Returns:
+            dict: merge가 있으면 (사이클 정보, 그룹 이름) -> DataFrame,
+                  없으면 (사이클 정보, 그룹 이름, cyclename, 채널 ID) -> DataFrame
+        """
+        spec, merge = self.optimize()
+        logger.info("실행 계획:\n" + self.explain())
+
+        channel_to_group, cycle_info_mapping = identify_channel_groups(self.cycle_df)
+        tasks = build_channel_tasks(self.cycle_df, channel_to_group, cycle_info_mapping)
+
+        results = {}
+        for task in tasks:
+            data = scan_channel(task['subfolder'], spec)
+            if data.empty:
+                continue
+            if merge:
+                add_metadata_columns(data, {'cyclename': task['cyclename'], 'channel_id': task['channel_id']})
+            results[(task['cycle_info'], task['group_name'], task['cyclename'], task['channel_id'])] = \
+                (task['seq_num'], data)
+
+        if not merge:
+            return {key: data for key, (_, data) in results.items()}
+
+        groups = {}
+        for (cycle_info, group_name, _, _), (seq_num, data) in results.items():
+            groups.setdefault((cycle_info, group_name), []).append((seq_num, data))
+
+        merged = {}
+        for key, items in groups.items():
+            items.sort(key=lambda x: x[0])
+            frames = [data for _, data in items]
+            if 0 in frames[0].columns:
+                frames = stitch_segments(frames, key_column=0)
+            merged[key] = concat_categorical(frames)
+        return merged
+
+
+def _intersect_ranges(current, new):
+    """두 범위 목록의 교집합 (현재 목록이 비어 있으면 새 목록)"""
+    if not current:
+        return [tuple(r) for r in new]
+    result = []
+    for a_start, a_end in current:
+        for b_start, b_end in new:
+            start, end = max(a_start, b_start), min(a_end, b_end)
+            if start <= end:
+                result.append((start, end))
+    # 겹치는 범위가 없으면 아무 사이클도 선택하지 않는 빈 범위
+    return result or [(0, -1)]
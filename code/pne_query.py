@@ -0,0 +1,234 @@
+import os
+import json
+import logging
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow가 없는 환경에서는 질의 기능만 비활성화
+    pa = None
+
+from pre250508_edit import load_pne_data, extract_channel_info, extract_cycle_info_from_name
+from pne_archive import list_channel_folders, channel_path_exists
+from pne_cache import restore_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# 캐시 저장소 구성: <store_dir>/<kind>/cycle_info=.../cyclename=.../channel_id=.../data.parquet
+STORE_KINDS = ('profile', 'cycle')
+PARTITION_KEYS = ('cycle_info', 'cyclename', 'channel_id')
+
+# 캐시를 만들 때의 Restore 지문 (이름이 '_'로 시작하므로 데이터셋 탐색에서 제외됨)
+FINGERPRINT_NAME = "_restore_fingerprint.json"
+
+# 행 그룹 크기 - 행 그룹마다 사이클 #27 min/max 통계가 기록되어 범위 밖 그룹은 읽지 않음
+ROW_GROUP_SIZE = 50000
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("질의 API를 사용하려면 pyarrow가 필요합니다 (pip install pyarrow).")
+
+
+def _partitioning():
+    # 채널 ID '045'가 정수 45로 추론되지 않도록 문자열 스키마를 명시
+    return ds.partitioning(pa.schema([(key, pa.string()) for key in PARTITION_KEYS]), flavor='hive')
+
+
+def _channel_store_dir(store_dir, kind, cycle_info, cyclename, channel_id):
+    return os.path.join(store_dir, kind, f"cycle_info={cycle_info}",
+                        f"cyclename={cyclename}", f"channel_id={channel_id}")
+
+
+def _write_parquet(data, target_dir):
+    os.makedirs(target_dir, exist_ok=True)
+    table = pa.Table.from_pandas(data.rename(columns=str), preserve_index=False)
+    pq.write_table(table, os.path.join(target_dir, "data.parquet"), row_group_size=ROW_GROUP_SIZE)
+
+
+def _read_fingerprint(target_dir):
+    try:
+        with open(os.path.join(target_dir, FINGERPRINT_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_fingerprint(target_dir, fingerprint):
+    os.makedirs(target_dir, exist_ok=True)
+    with open(os.path.join(target_dir, FINGERPRINT_NAME), "w", encoding="utf-8") as f:
+        json.dump(fingerprint, f)
+
+
+def build_channel_store(subfolder, cyclename, store_dir, overwrite=False):
+    """
+    채널 폴더의 원본 CSV를 열 기반 Parquet 캐시로 변환
+
+    Args:
+        subfolder (str): Restore 디렉토리를 포함하는 채널 경로
+        cyclename (str): 채널이 속한 사이클 이름 (예: A1_MP1_T23_1)
+        store_dir (str): 캐시 저장소 루트
+        overwrite (bool): 기존 캐시가 있어도 다시 생성할지 여부
+            (기존 캐시도 만들 때와 Restore 지문이 다르면 다시 생성)
+
+    Returns:
+        bool: 캐시가 생성되었거나 이미 존재하면 True
+    """
+    _require_pyarrow()
+
+    channel_info = extract_channel_info(subfolder)
+    if not channel_info:
+        logger.warning(f"채널 정보를 찾을 수 없습니다: {subfolder}")
+        return False
+
+    cycle_info = extract_cycle_info_from_name(cyclename)
+    channel_id = channel_info['channel_id']
+    targets = {kind: _channel_store_dir(store_dir, kind, cycle_info, cyclename, channel_id) for kind in STORE_KINDS}
+
+    # JSON으로 저장한 값과 비교할 수 있도록 튜플을 리스트로 맞춤 (읽기 전에 구해야 도중에 늘어난 파일도 감지)
+    fingerprint = json.loads(json.dumps(restore_fingerprint(subfolder)))
+    if not overwrite and all(os.path.exists(os.path.join(t, "data.parquet"))
+                             and _read_fingerprint(t) == fingerprint for t in targets.values()):
+        logger.debug(f"캐시가 이미 존재합니다: {subfolder}")
+        return True
+
+    profile_data, cycle_data = load_pne_data(subfolder)
+    if profile_data.empty and cycle_data.empty:
+        return False
+
+    for kind, data in (('profile', profile_data), ('cycle', cycle_data)):
+        if not data.empty:
+            # 사이클 순으로 정렬되어 있어야 행 그룹 통계로 범위를 건너뛸 수 있음
+            _write_parquet(data.sort_values(27, kind='stable'), targets[kind])
+        elif os.path.exists(os.path.join(targets[kind], "data.parquet")):
+            # 이전 캐시가 남아 새 원본과 섞이지 않도록 삭제
+            os.remove(os.path.join(targets[kind], "data.parquet"))
+        # 데이터를 모두 쓴 뒤 지문 기록 (도중에 중단되면 다음 실행에서 다시 생성)
+        _write_fingerprint(targets[kind], fingerprint)
+
+    logger.info(f"열 기반 캐시 생성: {cycle_info}/{cyclename}/{channel_id}")
+    return True
+
+
+def build_store(cycle_df, store_dir, overwrite=False):
+    """
+    cyclename/cyclepath 목록의 모든 채널을 캐시 저장소로 변환
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+        store_dir (str): 캐시 저장소 루트
+        overwrite (bool): 기존 캐시 재생성 여부
+
+    Returns:
+        int: 캐시된 채널 수
+    """
+    count = 0
+    for _, row in cycle_df.iterrows():
+        path = row['cyclepath']
+        if not channel_path_exists(path):
+            logger.warning(f"경로가 존재하지 않습니다: {path}")
+            continue
+
+        subfolders = list_channel_folders(path)
+        for subfolder in subfolders:
+            if build_channel_store(subfolder, row['cyclename'], store_dir, overwrite):
+                count += 1
+
+    logger.info(f"{count}개 채널의 캐시를 {store_dir}에 준비했습니다.")
+    return count
+
+
+def _as_list(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        return [value]
+    return list(value)
+
+
+def build_filter(channels=None, cycle_info=None, cycles=None, step_types=None):
+    """
+    질의 조건을 pyarrow 필터 식으로 변환
+
+    Args:
+        channels (str or list, optional): 채널 ID 목록 (예: '045')
+        cycle_info (str or list, optional): 기본 사이클 정보 목록
+        cycles (tuple or list, optional): (시작, 종료) 사이클 범위 또는 그 목록 (양 끝 포함)
+        step_types (int or list, optional): 스텝 타입 #2 목록 (1: 충전, 2: 방전)
+
+    Returns:
+        Expression: 필터 식 (조건이 없으면 None)
+    """
+    _require_pyarrow()
+
+    expressions = []
+    channels = _as_list(channels)
+    if channels:
+        expressions.append(ds.field('channel_id').isin([str(c) for c in channels]))
+
+    cycle_info = _as_list(cycle_info)
+    if cycle_info:
+        expressions.append(ds.field('cycle_info').isin(cycle_info))
+
+    if cycles is not None:
+        if len(cycles) == 2 and not isinstance(cycles[0], (tuple, list)):
+            cycles = [cycles]
+        cycle_field = ds.field('27')
+        ranges = [(cycle_field >= start) & (cycle_field <= end) for start, end in cycles]
+        combined = ranges[0]
+        for expression in ranges[1:]:
+            combined = combined | expression
+        expressions.append(combined)
+
+    step_types = _as_list(step_types)
+    if step_types:
+        expressions.append(ds.field('2').isin(step_types))
+
+    if not expressions:
+        return None
+
+    result = expressions[0]
+    for expression in expressions[1:]:
+        result = result & expression
+    return result
+
+
+def query_pne_data(store_dir, kind='profile', channels=None, cycle_info=None, cycles=None,
+                   step_types=None, columns=None):
+    """
+    캐시 저장소에서 조건에 맞는 행만 읽기 (필터와 열 선택을 스캔 단계에 전달)
+
+    Args:
+        store_dir (str): 캐시 저장소 루트
+        kind (str): 'profile' (SaveData) 또는 'cycle' (SaveEndData)
+        channels, cycle_info, cycles, step_types: build_filter 참조
+        columns (list, optional): 원본 열 번호 목록, None이면 전체 열
+
+    Returns:
+        DataFrame: 원본과 같은 정수 열 이름 + cycle_info, cyclename, channel_id 열
+    """
+    _require_pyarrow()
+
+    if kind not in STORE_KINDS:
+        raise ValueError(f"알 수 없는 데이터 종류: {kind}")
+
+    kind_dir = os.path.join(store_dir, kind)
+    if not os.path.isdir(kind_dir):
+        logger.warning(f"캐시 저장소가 존재하지 않습니다: {kind_dir}")
+        return pd.DataFrame()
+
+    dataset = ds.dataset(kind_dir, format='parquet', partitioning=_partitioning())
+    scan_columns = None
+    if columns is not None:
+        scan_columns = [str(c) for c in columns] + list(PARTITION_KEYS)
+
+    table = dataset.to_table(columns=scan_columns,
+                             filter=build_filter(channels, cycle_info, cycles, step_types))
+    data = table.to_pandas()
+    data.columns = [int(c) if c.isdigit() else c for c in data.columns]
+
+    logger.debug(f"질의 결과 {len(data)}행 ({table.nbytes / 1e6:.1f} MB)")
+    return data
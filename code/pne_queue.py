@@ -0,0 +1,486 @@
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import logging
+import argparse
+import threading
+import multiprocessing
+from collections import defaultdict
+
+import pandas as pd
+
+from pre250508_edit import (identify_channel_groups, build_channel_tasks, process_channel, task_metadata,
+                            GroupWriter, PROCESSING_VERSION, MEMORY_BUDGET_BYTES)
+from pne_cache import ChannelResultCache, MemoryBudget, DEFAULT_CACHE_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 작업을 가져간 뒤 이 시간(초) 동안 완료 기록이 없으면 다른 워커가 다시 가져갈 수 있음
+DEFAULT_LEASE_SECONDS = 30 * 60
+
+# 대기열 확인 간격 (초)
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+class WorkQueue:
+    """
+    공유 폴더 위의 파일 기반 채널 작업 대기열
+
+    <queue_dir>/job.json      실행 조건 (사이클 범위, 처리 버전)과 전체 작업 목록
+    <queue_dir>/tasks/        대기 중인 작업 (<번호>.json)
+    <queue_dir>/claimed/      처리 중인 작업 (<번호>.json: 작업과 워커 이름, 수정 시각 = 마지막 리스 갱신 시각)
+    <queue_dir>/done/         완료 기록 (<번호>.json) 과 결과 (<번호>.pkl)
+    <queue_dir>/failed/       실패 기록 (<번호>.json)
+
+    작업 가져가기는 tasks/에서 claimed/로의 이름 바꾸기 한 번이라, 여러 장비의 워커가
+    같은 작업을 동시에 가져가도 한 워커만 성공함 (SQLite 잠금보다 네트워크 공유 폴더에 안전).
+    처리 중인 워커는 ClaimHeartbeat로 가져간 기록의 수정 시각을 갱신하므로, 오래 걸리는 채널도
+    리스가 만료되지 않음. 채널 경로는 모든 장비에서 같은 경로로 보여야 함.
+    """
+
+    def __init__(self, queue_dir):
+        self.queue_dir = queue_dir
+        self.task_dir = os.path.join(queue_dir, "tasks")
+        self.claimed_dir = os.path.join(queue_dir, "claimed")
+        self.done_dir = os.path.join(queue_dir, "done")
+        self.failed_dir = os.path.join(queue_dir, "failed")
+        self.job_path = os.path.join(queue_dir, "job.json")
+
+    def _makedirs(self):
+        for directory in (self.task_dir, self.claimed_dir, self.done_dir, self.failed_dir):
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _write_json(path, value):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_json(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _ids(directory):
+        try:
+            return sorted(name[:-len(".json")] for name in os.listdir(directory) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+
+    def publish(self, tasks, inicycle, endcycle, version=PROCESSING_VERSION):
+        """
+        작업 목록 게시 (같은 폴더의 이전 대기열은 삭제)
+
+        Args:
+            tasks (list): build_channel_tasks()의 결과
+            inicycle, endcycle: 사이클 범위
+            version (int): 처리 버전
+        """
+        if os.path.isdir(self.queue_dir):
+            shutil.rmtree(self.queue_dir)
+        self._makedirs()
+
+        for number, task in enumerate(tasks):
+            self._write_json(os.path.join(self.task_dir, f"{number:06d}.json"), task)
+        # job.json을 마지막에 써서 작업이 모두 준비된 뒤에 워커가 시작하도록 함
+        self._write_json(self.job_path, {'inicycle': inicycle, 'endcycle': endcycle, 'version': version,
+                                         'tasks': tasks})
+        logger.info(f"{len(tasks)}개 채널 작업을 {self.queue_dir}에 게시했습니다.")
+
+    def job(self):
+        """실행 조건 반환 (아직 게시되지 않았으면 None)"""
+        try:
+            return self._read_json(self.job_path)
+        except FileNotFoundError:
+            return None
+
+    def claim(self, worker_id):
+        """
+        대기 중인 작업 하나 가져가기
+
+        Returns:
+            tuple: (작업 번호, 작업 dict) - 남은 작업이 없으면 (None, None)
+        """
+        for task_id in self._ids(self.task_dir):
+            claimed_path = os.path.join(self.claimed_dir, f"{task_id}.json")
+            try:
+                os.replace(os.path.join(self.task_dir, f"{task_id}.json"), claimed_path)
+            except FileNotFoundError:
+                # 다른 워커가 먼저 가져감
+                continue
+            # 이름 바꾸기는 수정 시각을 유지하므로 바로 갱신 (이전 리스 시각으로 다시 되돌려지지 않도록)
+            os.utime(claimed_path)
+            record = self._read_json(claimed_path)
+            # 리스 만료로 되돌아온 작업은 이전 워커의 기록이므로 작업만 꺼냄
+            task = record['task'] if 'claimed_at' in record else record
+            # 가져간 워커와 시각 기록 (수정 시각은 리스 만료 판단용)
+            self._write_json(claimed_path, {'task': task, 'worker': worker_id, 'claimed_at': time.time()})
+            logger.debug(f"{worker_id}: 작업 {task_id} 가져감 ({task['subfolder']})")
+            return task_id, task
+        return None, None
+
+    def complete(self, task_id, task, data, worker_id):
+        """결과를 먼저 저장한 뒤 완료 기록 (결과 저장 중 중단되면 리스 만료 후 다시 처리됨)"""
+        result = None
+        if data is not None and not data.empty:
+            result = f"{task_id}.pkl"
+            temp_path = os.path.join(self.done_dir, f"{result}.{os.getpid()}.tmp")
+            data.to_pickle(temp_path)
+            os.replace(temp_path, os.path.join(self.done_dir, result))
+
+        self._write_json(os.path.join(self.done_dir, f"{task_id}.json"),
+                         {'task': task, 'result': result, 'worker': worker_id, 'finished_at': time.time()})
+        self._release(task_id, worker_id)
+
+    def fail(self, task_id, task, error, worker_id):
+        self._write_json(os.path.join(self.failed_dir, f"{task_id}.json"),
+                         {'task': task, 'error': error, 'worker': worker_id, 'finished_at': time.time()})
+        self._release(task_id, worker_id)
+
+    def owner(self, task_id):
+        """처리 중인 작업을 가져간 워커 이름 (처리 중이 아니면 None)"""
+        try:
+            return self._read_json(os.path.join(self.claimed_dir, f"{task_id}.json")).get('worker')
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def renew(self, task_id, worker_id):
+        """
+        가져간 작업의 리스 갱신
+
+        Returns:
+            bool: 갱신했으면 True, 리스가 만료되어 다른 워커에게 넘어갔으면 False
+        """
+        if self.owner(task_id) != worker_id:
+            return False
+        try:
+            os.utime(os.path.join(self.claimed_dir, f"{task_id}.json"))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _release(self, task_id, worker_id):
+        # 리스가 만료되어 다른 워커가 다시 가져간 작업이면 그 워커의 기록을 지우지 않음
+        if self.owner(task_id) != worker_id:
+            return
+        try:
+            os.remove(os.path.join(self.claimed_dir, f"{task_id}.json"))
+        except FileNotFoundError:
+            pass
+
+    def requeue_stale(self, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """
+        리스가 만료된 작업(워커가 중단된 것으로 간주)을 대기열로 되돌림
+
+        Returns:
+            int: 되돌린 작업 수
+        """
+        count = 0
+        now = time.time()
+        for task_id in self._ids(self.claimed_dir):
+            claimed_path = os.path.join(self.claimed_dir, f"{task_id}.json")
+            try:
+                if now - os.path.getmtime(claimed_path) < lease_seconds or self.is_finished(task_id):
+                    continue
+                os.replace(claimed_path, os.path.join(self.task_dir, f"{task_id}.json"))
+                count += 1
+            except FileNotFoundError:
+                continue
+        if count:
+            logger.warning(f"리스가 만료된 작업 {count}개를 대기열로 되돌렸습니다.")
+        return count
+
+    def retry_failed(self):
+        """실패한 작업을 대기열로 되돌림"""
+        task_ids = self._ids(self.failed_dir)
+        for task_id in task_ids:
+            failed_path = os.path.join(self.failed_dir, f"{task_id}.json")
+            self._write_json(os.path.join(self.task_dir, f"{task_id}.json"), self._read_json(failed_path)['task'])
+            os.remove(failed_path)
+        return len(task_ids)
+
+    def is_finished(self, task_id):
+        return (os.path.exists(os.path.join(self.done_dir, f"{task_id}.json"))
+                or os.path.exists(os.path.join(self.failed_dir, f"{task_id}.json")))
+
+    def done_ids(self):
+        return self._ids(self.done_dir)
+
+    def failed_ids(self):
+        return self._ids(self.failed_dir)
+
+    def failed(self):
+        """실패 기록 목록"""
+        return [self._read_json(os.path.join(self.failed_dir, f"{task_id}.json")) for task_id in self.failed_ids()]
+
+    def load_result(self, task_id):
+        """
+        완료된 작업의 (작업 dict, 결과 DataFrame) 반환 (결과가 비어 있던 작업은 빈 DataFrame)
+        """
+        record = self._read_json(os.path.join(self.done_dir, f"{task_id}.json"))
+        if not record['result']:
+            return record['task'], pd.DataFrame()
+        return record['task'], pd.read_pickle(os.path.join(self.done_dir, record['result']))
+
+    def status(self):
+        """상태별 작업 수"""
+        return {'pending': len(self._ids(self.task_dir)), 'claimed': len(self._ids(self.claimed_dir)),
+                'done': len(self._ids(self.done_dir)), 'failed': len(self._ids(self.failed_dir))}
+
+
+class ClaimHeartbeat:
+    """
+    처리 중인 작업의 리스를 주기적으로 갱신하는 스레드 (with 문으로 사용)
+
+    리스가 이미 다른 워커에게 넘어갔으면 경고 후 갱신을 멈춤 (처리 결과는 그대로 기록됨).
+    """
+
+    def __init__(self, queue, task_id, worker_id, interval):
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not self.queue.renew(self.task_id, self.worker_id):
+                logger.warning(f"{self.worker_id}: 작업 {self.task_id}의 리스를 다른 워커가 가져갔습니다.")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+def publish_run(cycle_df, inicycle, endcycle, queue_dir):
+    """
+    datapath 목록의 채널 작업을 대기열에 게시
+
+    Args:
+        cycle_df (DataFrame): cyclename, cyclepath 열을 포함하는 DataFrame
+        inicycle, endcycle: 사이클 범위
+        queue_dir (str): 모든 워커가 접근할 수 있는 공유 폴더
+
+    Returns:
+        WorkQueue: 게시된 대기열
+    """
+    channel_to_group, cycle_info_mapping = identify_channel_groups(cycle_df)
+    tasks = build_channel_tasks(cycle_df, channel_to_group, cycle_info_mapping)
+    queue = WorkQueue(queue_dir)
+    queue.publish(tasks, inicycle, endcycle)
+    return queue
+
+
+def run_worker(queue_dir, worker_id=None, cache_dir=None, cache_max_bytes=DEFAULT_CACHE_MAX_BYTES,
+               wait_for_job=False, poll_interval=DEFAULT_POLL_INTERVAL, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    대기열이 빌 때까지 채널을 가져가 처리하는 워커
+
+    Args:
+        queue_dir (str): 대기열 폴더
+        worker_id (str, optional): 워커 이름, 기본값은 '<호스트>-<pid>'
+        cache_dir (str, optional): 채널 처리 결과 캐시 (장비별 로컬 폴더 권장)
+        cache_max_bytes (int): 캐시 최대 용량
+        wait_for_job (bool): 대기열이 아직 게시되지 않았으면 게시될 때까지 대기
+        poll_interval (float): 대기 간격 (초)
+        lease_seconds (float): 이 시간 동안 갱신되지 않은 다른 워커의 작업은 다시 가져감
+            (처리 중인 작업은 lease_seconds / 3 간격으로 갱신)
+
+    Returns:
+        int: 처리한 작업 수
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    queue = WorkQueue(queue_dir)
+
+    job = queue.job()
+    while job is None and wait_for_job:
+        time.sleep(poll_interval)
+        job = queue.job()
+    if job is None:
+        logger.warning(f"게시된 작업이 없습니다: {queue_dir}")
+        return 0
+
+    if job['version'] != PROCESSING_VERSION:
+        raise ValueError(f"대기열의 처리 버전({job['version']})이 워커 버전({PROCESSING_VERSION})과 다릅니다.")
+
+    inicycle, endcycle = job['inicycle'], job['endcycle']
+    cache = ChannelResultCache(cache_dir, cache_max_bytes, PROCESSING_VERSION) if cache_dir else None
+
+    processed = 0
+    while True:
+        task_id, task = queue.claim(worker_id)
+        if task_id is None:
+            # 중단된 워커의 작업이 있으면 이어서 처리
+            if queue.requeue_stale(lease_seconds):
+                continue
+            break
+
+        subfolder = task['subfolder']
+        metadata = task_metadata(task)
+        try:
+            with ClaimHeartbeat(queue, task_id, worker_id, lease_seconds / 3):
+                if cache is not None:
+                    data = cache.get_or_compute(subfolder,
+                                                lambda: process_channel(subfolder, inicycle, endcycle, metadata),
+                                                inicycle, endcycle, metadata)
+                else:
+                    data = process_channel(subfolder, inicycle, endcycle, metadata)
+        except Exception as e:
+            logger.error(f"{worker_id}: 채널 처리 중 오류 발생 ({subfolder}): {str(e)}")
+            queue.fail(task_id, task, str(e), worker_id)
+            continue
+
+        queue.complete(task_id, task, data, worker_id)
+        processed += 1
+        logger.info(f"{worker_id}: {task['cyclename']} 채널 {task['channel_id']} 처리 완료 ({len(data)}행)")
+
+    logger.info(f"{worker_id}: 남은 작업이 없어 종료합니다 ({processed}개 처리).")
+    return processed
+
+
+def merge_results(queue_dir, output_dir=".", memory_budget=MEMORY_BUDGET_BYTES, poll_interval=DEFAULT_POLL_INTERVAL,
+                  timeout=None, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    완료된 채널 결과를 도착하는 대로 그룹별 seq_num 순서로 병합 (코디네이터)
+
+    모든 작업이 완료 또는 실패로 기록될 때까지 대기하며, 리스가 만료된 작업은 대기열로 되돌림.
+
+    Args:
+        queue_dir (str): 대기열 폴더
+        output_dir (str): 병합 CSV 출력 디렉토리
+        memory_budget (int): 병합 중 메모리에 유지할 데이터의 최대 바이트 수
+        poll_interval (float): 완료 확인 간격 (초)
+        timeout (float, optional): 최대 대기 시간 (초), 초과하면 도착한 결과만 병합
+        lease_seconds (float): 리스 만료 시간 (초)
+
+    Returns:
+        dict: (사이클 정보, 그룹 이름) -> {'path', 'rows', 'channel_ids', 'cyclenames'}
+    """
+    queue = WorkQueue(queue_dir)
+    job = queue.job()
+    if job is None:
+        raise FileNotFoundError(f"게시된 작업이 없습니다: {queue_dir}")
+
+    tasks = {f"{number:06d}": task for number, task in enumerate(job['tasks'])}
+
+    writer = GroupWriter(output_dir, MemoryBudget(memory_budget, os.path.join(output_dir, ".pne_spill")))
+    group_seq_nums = defaultdict(list)
+    for task in tasks.values():
+        group_seq_nums[(task['cycle_info'], task['group_name'])].append(task['seq_num'])
+    for key, seq_nums in group_seq_nums.items():
+        writer.expect(key, seq_nums)
+
+    merged = set()
+    started = time.time()
+    while True:
+        for task_id in queue.done_ids():
+            if task_id in merged:
+                continue
+            task, data = queue.load_result(task_id)
+            writer.add((task['cycle_info'], task['group_name']), task['seq_num'], task['cyclename'],
+                       task['channel_id'], data)
+            merged.add(task_id)
+
+        failed = set(queue.failed_ids())
+        if len(merged | failed) >= len(tasks):
+            break
+        if timeout is not None and time.time() - started > timeout:
+            logger.warning(f"대기 시간을 넘어 완료된 {len(merged)}/{len(tasks)}개 작업만 병합합니다.")
+            break
+        queue.requeue_stale(lease_seconds)
+        time.sleep(poll_interval)
+
+    for record in queue.failed():
+        logger.error(f"처리 실패: {record['task']['subfolder']} ({record['worker']}): {record['error']}")
+
+    merged_groups = writer.close()
+    logger.info(f"{len(merged)}개 채널 결과를 {len(merged_groups)}개 그룹으로 병합했습니다.")
+    return merged_groups
+
+
+def run_local(cycle_df, inicycle, endcycle, queue_dir, workers=4, output_dir=".", cache_dir=None,
+              memory_budget=MEMORY_BUDGET_BYTES, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    로컬 워커 프로세스 여러 개로 분산 실행 (게시 -> 워커 실행 -> 병합)
+
+    Returns:
+        dict: merge_results()의 결과
+    """
+    publish_run(cycle_df, inicycle, endcycle, queue_dir)
+
+    processes = [multiprocessing.Process(target=run_worker, args=(queue_dir, f"local-{number}", cache_dir),
+                                         kwargs={'lease_seconds': lease_seconds})
+                 for number in range(workers)]
+    for process in processes:
+        process.start()
+
+    try:
+        return merge_results(queue_dir, output_dir, memory_budget, lease_seconds=lease_seconds)
+    finally:
+        for process in processes:
+            process.join()
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="PNE 채널 분산 처리")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    publish = sub.add_parser("publish", help="datapath 파일의 채널 작업 게시")
+    publish.add_argument("queue_dir")
+    publish.add_argument("datapath")
+    publish.add_argument("--inicycle", type=int)
+    publish.add_argument("--endcycle", type=int)
+
+    worker = sub.add_parser("worker", help="대기열의 채널 처리")
+    worker.add_argument("queue_dir")
+    worker.add_argument("--cache-dir")
+    worker.add_argument("--wait", action="store_true", help="작업이 게시될 때까지 대기")
+
+    merge = sub.add_parser("merge", help="완료된 결과를 seq_num 순서로 병합")
+    merge.add_argument("queue_dir")
+    merge.add_argument("--output-dir", default=".")
+
+    status = sub.add_parser("status", help="대기열 상태 출력")
+    status.add_argument("queue_dir")
+
+    local = sub.add_parser("local", help="로컬 워커 프로세스 여러 개로 게시부터 병합까지 실행")
+    local.add_argument("queue_dir")
+    local.add_argument("datapath")
+    local.add_argument("--inicycle", type=int)
+    local.add_argument("--endcycle", type=int)
+    local.add_argument("--workers", type=int, default=4)
+    local.add_argument("--output-dir", default=".")
+    local.add_argument("--cache-dir")
+    local.add_argument("--lease-seconds", type=float, default=DEFAULT_LEASE_SECONDS,
+                       help="짧게 주면 처리 중 리스 갱신과 중복 처리 여부를 확인할 수 있음")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
+    if args.command == "publish":
+        cycle_df = pd.read_csv(args.datapath, sep="\t", engine="c", encoding="UTF-8", on_bad_lines='skip')
+        publish_run(cycle_df, args.inicycle, args.endcycle, args.queue_dir)
+    elif args.command == "worker":
+        run_worker(args.queue_dir, cache_dir=args.cache_dir, wait_for_job=args.wait)
+    elif args.command == "merge":
+        merge_results(args.queue_dir, args.output_dir)
+    elif args.command == "local":
+        cycle_df = pd.read_csv(args.datapath, sep="\t", engine="c", encoding="UTF-8", on_bad_lines='skip')
+        run_local(cycle_df, args.inicycle, args.endcycle, args.queue_dir, args.workers, args.output_dir,
+                  args.cache_dir, lease_seconds=args.lease_seconds)
+        print(WorkQueue(args.queue_dir).status())
+    else:
+        print(WorkQueue(args.queue_dir).status())
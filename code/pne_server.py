@@ -0,0 +1,342 @@
+import io
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pandas as pd
+
+from pre250508_edit import load_pne_channel
+from pne_cache import restore_fingerprint, frame_nbytes
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow가 없으면 CSV로 응답
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# 기본 접속 주소 (다른 장비에서 접근하지 못하도록 로컬만 허용)
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 메모리에 유지할 채널 데이터의 최대 크기 (바이트)
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+
+# 이 시간(초)이 지난 채널만 Restore 파일 변경 여부를 다시 확인
+DEFAULT_CHECK_INTERVAL = 5.0
+
+DATA_KINDS = ('profile', 'cycle')
+
+
+class ChannelStore:
+    """
+    채널 전체 데이터(ChannelData)를 메모리에 유지하는 LRU 저장소
+
+    채널은 처음 요청될 때 한 번 전체를 읽고, 이후 사이클 범위 요청은 구간 인덱스로
+    행 범위만 잘라 반환함. 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은
+    채널부터 제거하며, Restore 파일이 바뀐 채널(진행 중인 시험)은 다시 읽음.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self.channels = OrderedDict()   # 채널 경로 -> {'data', 'nbytes', 'fingerprint', 'checked_at'}
+        self.resident_bytes = 0
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._load_locks = {}   # 채널 경로 -> {'lock', 'users'} (읽는 중인 채널만 유지)
+
+    def _hit(self, subfolder, entry):
+        self.channels.move_to_end(subfolder)
+        self.hits += 1
+        return entry['data']
+
+    def _lookup(self, subfolder):
+        """
+        메모리에 있는 최신 채널 데이터 반환 (없거나 원본이 바뀌었으면 None)
+
+        Restore 파일 확인(NAS의 파일마다 stat)은 전역 잠금 밖에서 하고 비교만 잠금 안에서 함.
+        """
+        with self._lock:
+            entry = self.channels.get(subfolder)
+            if entry is None:
+                return None
+            if time.monotonic() - entry['checked_at'] < self.check_interval:
+                return self._hit(subfolder, entry)
+
+        fingerprint = restore_fingerprint(subfolder)
+        with self._lock:
+            # 확인하는 동안 제거되었거나 다시 읽혔을 수 있으므로 현재 항목과 비교
+            entry = self.channels.get(subfolder)
+            if entry is None or entry['fingerprint'] != fingerprint:
+                return None
+            entry['checked_at'] = time.monotonic()
+            return self._hit(subfolder, entry)
+
+    def get(self, subfolder):
+        """
+        채널 데이터 반환 (메모리에 없거나 원본이 바뀌었으면 읽어서 등록)
+
+        Args:
+            subfolder (str): Restore 디렉토리를 포함하는 채널 경로
+
+        Returns:
+            ChannelData: 채널 전체 데이터와 구간 인덱스
+        """
+        data = self._lookup(subfolder)
+        if data is not None:
+            return data
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(subfolder, {'lock': threading.Lock(), 'users': 0})
+            load_lock['users'] += 1
+
+        # 같은 채널을 동시에 요청하면 한 번만 읽음
+        try:
+            with load_lock['lock']:
+                data = self._lookup(subfolder)
+                if data is not None:
+                    return data
+                return self._load(subfolder)
+        finally:
+            # 기다리는 요청이 없으면 채널별 잠금 제거 (요청된 채널 수만큼 계속 늘어나지 않도록)
+            with self._lock:
+                load_lock['users'] -= 1
+                if load_lock['users'] == 0:
+                    del self._load_locks[subfolder]
+
+    def _load(self, subfolder):
+        """채널 전체를 읽어 등록 (채널별 잠금을 잡은 상태에서 호출)"""
+        fingerprint = restore_fingerprint(subfolder)
+        started = time.perf_counter()
+        data = load_pne_channel(subfolder)
+        nbytes = frame_nbytes(data.profile) + frame_nbytes(data.cycle)
+        logger.info(f"채널 로드: {subfolder} ({nbytes / 1e6:.1f} MB, {time.perf_counter() - started:.2f}초)")
+
+        with self._lock:
+            self._discard(subfolder)
+            self.channels[subfolder] = {'data': data, 'nbytes': nbytes, 'fingerprint': fingerprint,
+                                        'checked_at': time.monotonic()}
+            self.resident_bytes += nbytes
+            self.loads += 1
+            self._enforce(keep=subfolder)
+        return data
+
+    def _discard(self, subfolder):
+        entry = self.channels.pop(subfolder, None)
+        if entry is not None:
+            self.resident_bytes -= entry['nbytes']
+
+    def _enforce(self, keep=None):
+        for subfolder in list(self.channels):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            if subfolder == keep:
+                continue
+            self._discard(subfolder)
+            self.evictions += 1
+            logger.debug(f"메모리 한도 초과로 채널 제거: {subfolder}")
+
+    def evict(self, subfolder=None):
+        """채널 하나 또는 전체를 메모리에서 제거"""
+        with self._lock:
+            if subfolder is None:
+                self.channels.clear()
+                self.resident_bytes = 0
+            else:
+                self._discard(subfolder)
+
+    def stats(self):
+        with self._lock:
+            return {'channels': len(self.channels), 'resident_bytes': self.resident_bytes,
+                    'max_bytes': self.max_bytes, 'hits': self.hits, 'loads': self.loads,
+                    'evictions': self.evictions,
+                    'resident': [{'subfolder': subfolder, 'bytes': entry['nbytes']}
+                                 for subfolder, entry in self.channels.items()]}
+
+
+def select_rows(channel, kind='profile', inicycle=None, endcycle=None, columns=None):
+    """
+    채널 데이터에서 사이클 범위와 열 선택 (구간 인덱스로 행 범위만 잘라냄)
+
+    Args:
+        channel (ChannelData): 채널 데이터
+        kind (str): 'profile'(SaveData) 또는 'cycle'(SaveEndData)
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        columns (list, optional): 열 번호 목록
+
+    Returns:
+        DataFrame: 선택된 데이터
+    """
+    if kind not in DATA_KINDS:
+        raise ValueError(f"kind는 {DATA_KINDS} 중 하나여야 합니다: {kind}")
+    data = channel.profile if kind == 'profile' else channel.cycle
+    index = channel.profile_index if kind == 'profile' else channel.cycle_index
+    if inicycle is not None or endcycle is not None:
+        data = data.iloc[index.range_slice(inicycle, endcycle)]
+    if columns is not None:
+        data = data.loc[:, [column for column in columns if column in data.columns]]
+    return data
+
+
+def _parse_columns(value):
+    if not value:
+        return None
+    return [int(column) if column.strip().lstrip('-').isdigit() else column.strip() for column in value.split(",")]
+
+
+def _parse_int(value):
+    return int(value) if value not in (None, "") else None
+
+
+def _serialize(data, fmt):
+    """DataFrame을 응답 바이트로 변환 (열 이름은 문자열로 바뀌므로 클라이언트에서 복원)"""
+    if fmt == "parquet":
+        buffer = io.BytesIO()
+        data.rename(columns=str).to_parquet(buffer, index=False)
+        return buffer.getvalue(), "application/vnd.apache.parquet"
+    if fmt == "json":
+        return data.to_json(orient="split", index=False).encode("utf-8"), "application/json"
+    return data.to_csv(index=False).encode("utf-8"), "text/csv"
+
+
+class _QueryHandler(BaseHTTPRequestHandler):
+    store = None
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, value):
+        self._send(status, json.dumps(value, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(url.query).items()}
+        try:
+            if url.path == "/stats":
+                self._send_json(200, self.store.stats())
+            elif url.path == "/evict":
+                self.store.evict(params.get("path"))
+                self._send_json(200, self.store.stats())
+            elif url.path == "/channel":
+                if "path" not in params:
+                    self._send_json(400, {'error': "path가 필요합니다"})
+                    return
+                channel = self.store.get(params["path"])
+                data = select_rows(channel, params.get("kind", "profile"), _parse_int(params.get("inicycle")),
+                                   _parse_int(params.get("endcycle")), _parse_columns(params.get("columns")))
+                fmt = params.get("format", "parquet" if pa is not None else "csv")
+                if fmt == "parquet" and pa is None:
+                    fmt = "csv"
+                self._send(200, *_serialize(data, fmt))
+            else:
+                self._send_json(404, {'error': f"알 수 없는 경로: {url.path}"})
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+        except Exception as e:
+            logger.error(f"요청 처리 중 오류 발생: {self.path} ({str(e)})")
+            self._send_json(500, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, max_bytes=DEFAULT_MAX_BYTES, check_interval=DEFAULT_CHECK_INTERVAL):
+    """
+    채널 조회 서버 실행 (Ctrl+C로 종료)
+
+    GET /channel?path=<채널 경로>&kind=profile|cycle&inicycle=&endcycle=&columns=8,9,27&format=parquet|csv|json
+    GET /stats                       메모리 사용량과 적중 통계
+    GET /evict[?path=<채널 경로>]    채널 하나 또는 전체 제거
+
+    Args:
+        host (str): 접속 주소
+        port (int): 포트
+        max_bytes (int): 메모리에 유지할 채널 데이터의 최대 바이트 수
+        check_interval (float): Restore 파일 변경 확인 간격 (초)
+    """
+    server = make_server(host, port, max_bytes, check_interval)
+    logger.info(f"채널 조회 서버 시작: http://{host}:{server.server_address[1]} "
+                f"(메모리 한도 {max_bytes / 1024 ** 3:.1f} GB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, max_bytes=DEFAULT_MAX_BYTES,
+                check_interval=DEFAULT_CHECK_INTERVAL):
+    """요청마다 스레드를 쓰는 서버 생성 (serve_forever는 호출자가 실행, port=0이면 빈 포트 사용)"""
+    handler = type("QueryHandler", (_QueryHandler,), {'store': ChannelStore(max_bytes, check_interval)})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def query_channel(path, kind='profile', inicycle=None, endcycle=None, columns=None,
+                  server=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=600):
+    """
+    조회 서버에서 채널 데이터 받기 (노트북에서 load_pne_data 대신 사용)
+
+    Args:
+        path (str): Restore 디렉토리를 포함하는 채널 경로
+        kind (str): 'profile' 또는 'cycle'
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        columns (list, optional): 열 번호 목록
+        server (str): 서버 주소
+        timeout (float): 응답 대기 시간 (초, 첫 로드는 오래 걸릴 수 있음)
+
+    Returns:
+        DataFrame: 열 번호가 load_pne_data와 같은 데이터
+    """
+    params = {'path': path, 'kind': kind, 'format': "parquet" if pa is not None else "csv"}
+    if inicycle is not None:
+        params['inicycle'] = inicycle
+    if endcycle is not None:
+        params['endcycle'] = endcycle
+    if columns is not None:
+        params['columns'] = ",".join(str(column) for column in columns)
+
+    url = f"{server.rstrip('/')}/channel?{urllib.parse.urlencode(params)}"
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        body = response.read()
+        content_type = response.headers.get("Content-Type", "")
+
+    if content_type.startswith("application/vnd.apache.parquet"):
+        data = pd.read_parquet(io.BytesIO(body))
+    else:
+        data = pd.read_csv(io.BytesIO(body))
+    # 숫자 열 이름을 원래 열 번호로 복원
+    data.columns = [int(column) if str(column).lstrip('-').isdigit() else column for column in data.columns]
+    return data
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="PNE 채널 조회 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-gb", type=float, default=DEFAULT_MAX_BYTES / 1024 ** 3,
+                        help="메모리에 유지할 채널 데이터의 최대 크기 (GB)")
+    parser.add_argument("--check-interval", type=float, default=DEFAULT_CHECK_INTERVAL,
+                        help="Restore 파일 변경 확인 간격 (초)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = _parse_args(sys.argv[1:])
+    serve(args.host, args.port, int(args.max_gb * 1024 ** 3), args.check_interval)
@@ -0,0 +1,246 @@
+import os
+import pickle
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# POSIX 공유 메모리가 파일로 보이는 위치 (Linux)
+SHM_DIR = "/dev/shm"
+
+# 전달 방식: 'shm'은 multiprocessing.shared_memory, 'mmap'은 메모리 매핑 임시 파일
+# Windows의 공유 메모리는 만든 프로세스가 핸들을 닫으면 사라지므로 mmap 사용
+DEFAULT_BACKEND = "shm" if os.path.isdir(SHM_DIR) else "mmap"
+
+# 열 시작 위치 정렬 단위 (바이트)
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def _create_shm(size):
+    """워커가 끝나도 사라지지 않는 공유 메모리 블록 생성 (해제는 받는 쪽에서 담당)"""
+    try:
+        return shared_memory.SharedMemory(create=True, size=size, track=False)
+    except TypeError:
+        # Python 3.13 미만: 워커 종료 시 resource_tracker가 블록을 지우지 않도록 등록 해제
+        from multiprocessing import resource_tracker
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _block_path(descriptor):
+    if descriptor['backend'] == "shm":
+        return os.path.join(SHM_DIR, descriptor['block'].lstrip("/"))
+    return descriptor['block']
+
+
+def share_frame(data, backend=None, directory=None):
+    """
+    DataFrame의 열을 공유 메모리 블록 하나에 복사하고 기술자(descriptor) 반환
+
+    수치 열은 그대로, category 열은 코드만 블록에 넣고 범주 목록은 기술자에 포함함.
+    그 밖의 객체 열은 기술자에 pickle로 포함함 (처리 결과에는 보통 없음).
+
+    Args:
+        data (DataFrame): 전달할 데이터
+        backend (str, optional): 'shm' 또는 'mmap', 기본값은 DEFAULT_BACKEND
+        directory (str, optional): mmap 임시 파일 폴더
+
+    Returns:
+        dict: attach_frame()에 전달할 작은 기술자
+    """
+    backend = backend or DEFAULT_BACKEND
+
+    columns = []
+    arrays = []
+    offset = 0
+    for name in data.columns:
+        series = data[name]
+        column = {'name': name}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            values = series.cat.codes.to_numpy()
+            column['kind'] = 'categorical'
+            column['categories'] = series.cat.categories.to_numpy()
+            column['ordered'] = series.cat.ordered
+        elif series.dtype.kind in "biufcmM":
+            values = series.to_numpy()
+            column['kind'] = 'array'
+        else:
+            column['kind'] = 'pickled'
+            column['payload'] = pickle.dumps(series.to_numpy(), protocol=pickle.HIGHEST_PROTOCOL)
+            columns.append(column)
+            continue
+
+        values = np.ascontiguousarray(values)
+        offset = _align(offset)
+        column.update({'dtype': values.dtype.str, 'length': len(values), 'offset': offset})
+        columns.append(column)
+        arrays.append((offset, values))
+        offset += values.nbytes
+
+    index = data.index
+    if isinstance(index, pd.RangeIndex):
+        index_info = ('range', index.start, index.stop, index.step)
+    else:
+        index_info = ('pickled', pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL))
+
+    descriptor = {'backend': backend, 'columns': columns, 'index': index_info, 'size': offset, 'block': None}
+    if offset == 0:
+        return descriptor
+
+    if backend == "shm":
+        shm = _create_shm(offset)
+        buffer = shm.buf
+        descriptor['block'] = shm.name
+    else:
+        fd, file_path = tempfile.mkstemp(prefix="pne_shared_", suffix=".bin", dir=directory)
+        os.close(fd)
+        buffer = np.memmap(file_path, dtype=np.uint8, mode="w+", shape=(offset,))
+        descriptor['block'] = file_path
+
+    target = np.frombuffer(buffer, dtype=np.uint8, count=offset)
+    for start, values in arrays:
+        target[start:start + values.nbytes] = values.view(np.uint8).reshape(-1)
+    del target
+
+    if backend == "shm":
+        del buffer
+        shm.close()
+    else:
+        buffer.flush()
+        del buffer
+    return descriptor
+
+
+class SharedFrame:
+    """
+    공유 블록에 연결된 DataFrame과 블록 해제 핸들
+
+    data의 열은 블록을 복사 없이 가리키는 읽기 전용 배열이며, 매핑은 마지막 배열이
+    사라질 때 해제됨. release()는 블록 이름만 지우므로 이미 받은 배열은 계속 유효함
+    (Windows는 배열이 남아 있으면 파일 삭제가 보류됨).
+    """
+
+    def __init__(self, data, block_path):
+        self.data = data
+        self.block_path = block_path
+
+    def release(self):
+        """공유 블록 삭제"""
+        self.data = None
+        if self.block_path is None:
+            return
+        try:
+            os.remove(self.block_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"공유 파일을 아직 삭제할 수 없습니다: {self.block_path} ({str(e)})")
+        self.block_path = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def attach_frame(descriptor):
+    """
+    기술자가 가리키는 블록에 연결해 DataFrame 복원 (수치 열은 복사 없음)
+
+    Returns:
+        SharedFrame: data 속성이 복원된 DataFrame
+    """
+    block_path = None
+    buffer = None
+    if descriptor['block'] is not None:
+        # 공유 메모리도 파일로 매핑해 배열 수명과 매핑 수명을 일치시킴
+        block_path = _block_path(descriptor)
+        buffer = np.memmap(block_path, dtype=np.uint8, mode="r", shape=(descriptor['size'],))
+
+    columns = {}
+    for column in descriptor['columns']:
+        if column['kind'] == 'pickled':
+            columns[column['name']] = pickle.loads(column['payload'])
+            continue
+
+        values = np.frombuffer(buffer, dtype=np.dtype(column['dtype']), count=column['length'],
+                               offset=column['offset'])
+        values.flags.writeable = False
+        if column['kind'] == 'categorical':
+            dtype = pd.CategoricalDtype(column['categories'], ordered=column['ordered'])
+            columns[column['name']] = pd.Categorical.from_codes(values, dtype=dtype)
+        else:
+            columns[column['name']] = values
+
+    index_info = descriptor['index']
+    if index_info[0] == 'range':
+        index = pd.RangeIndex(*index_info[1:])
+    else:
+        index = pickle.loads(index_info[1])
+
+    # copy=False면 열마다 따로 블록을 두어 공유 버퍼를 그대로 사용
+    data = pd.DataFrame(columns, index=index, copy=False)
+    return SharedFrame(data, block_path)
+
+
+def discard_descriptor(descriptor):
+    """연결하지 않고 블록만 삭제 (결과를 쓰지 않을 때)"""
+    attach_frame(descriptor).release()
+
+
+def _run_and_share(func, args, backend, directory):
+    return share_frame(func(*args), backend, directory)
+
+
+def map_shared(func, args_list, workers=None, backend=None, directory=None, return_exceptions=False):
+    """
+    func(*args)를 워커 프로세스에서 실행하고 결과 DataFrame을 공유 블록으로 받음
+
+    파이프로는 작은 기술자만 오가므로 큰 결과도 부모 프로세스에서 직렬화/복사가 없음.
+    호출자는 받은 SharedFrame을 다 쓴 뒤 release()해야 함.
+
+    Args:
+        func (callable): DataFrame을 반환하는 모듈 수준 함수
+        args_list (list): 인자 튜플 목록
+        workers (int, optional): 워커 프로세스 수
+        backend (str, optional): 'shm' 또는 'mmap'
+        directory (str, optional): mmap 임시 파일 폴더
+        return_exceptions (bool): True면 실패한 호출의 예외를 SharedFrame 대신 반환하고 나머지를 계속 처리
+            (False면 첫 예외를 다시 발생시키고 남은 작업을 취소)
+
+    Yields:
+        tuple: (args_list의 위치, SharedFrame 또는 예외) - 완료된 순서
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_run_and_share, func, args, backend, directory): position
+                   for position, args in enumerate(args_list)}
+        yielded = set()
+        try:
+            for future in as_completed(futures):
+                yielded.add(future)
+                error = future.exception()
+                if error is not None:
+                    if not return_exceptions:
+                        raise error
+                    yield futures[future], error
+                    continue
+                yield futures[future], attach_frame(future.result())
+        finally:
+            # 중간에 멈추면 남은 작업을 취소하고 받지 않은 결과 블록 삭제
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future in futures:
+                if future not in yielded and not future.cancelled() and future.exception() is None:
+                    discard_descriptor(future.result())
@@ -3,16 +3,44 @@ import numpy as np
 import matplotlib.pyplot as plt
 import os
 import re
+import shutil
 import bisect
 import logging
 from collections import defaultdict
+from dataclasses import dataclass, field
 import tkinter as tk
 from tkinter import filedialog
+from pne_cache import (ChannelResultCache, MemoryBudget, restore_fingerprint, DEFAULT_CACHE_MAX_BYTES,
+                       DEFAULT_MEMORY_BUDGET_BYTES)
+from pne_checkpoint import RunCheckpoint, run_key
+from pne_archive import (restore_exists, list_restore_files, open_restore_file, list_channel_folders,
+                         channel_path_exists)
+from pne_shm import map_shared
+from pne_outputs import OutputManifest, output_digest, channel_inputs
+from pne_frames import add_metadata_columns, concat_categorical, drop_overlap_rows, stitch_segments
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 채널 처리 결과 캐시 (None이면 캐시 사용 안 함)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".pne_cache")
+CACHE_MAX_BYTES = DEFAULT_CACHE_MAX_BYTES
+
+# 병합 중 채널 사이에 메모리에 유지하는 데이터(순서보다 먼저 도착한 구간, 중복 제거용 직전 구간)의
+# 최대 크기 (초과분은 임시 파일로 내림). 채널 하나를 처리하는 동안 읽는 데이터는 포함하지 않음
+MEMORY_BUDGET_BYTES = DEFAULT_MEMORY_BUDGET_BYTES
+
+# process_cycle_data가 선택하는 SaveEndData 열 -> 출력 열 이름
+PROCESSED_COLUMNS = {0: 'time', 8: 'voltage', 9: 'current', 10: 'chg_capacity', 11: 'dchg_capacity',
+                     2: 'step_type', 27: 'cycle'}
+
+# 중단된 실행을 이어서 진행하기 위한 체크포인트 디렉토리 (상대 경로는 output_dir 기준, None이면 사용 안 함)
+CHECKPOINT_DIR = "pne_checkpoints"
+
+# 처리 방식(process_cycle_data 등)이 바뀌면 올려서 이전 캐시 결과를 무효화
+PROCESSING_VERSION = 1
+
 def set_pne_paths():
     """
     파일에서 PNE 데이터 처리를 위한 경로 설정
@@ -81,12 +109,12 @@ def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
     Returns:
         tuple: 사이클 범위에 대한 (file_start, file_end, inicycle, endcycle) 인덱스
     """
-    if not os.path.isdir(rawdir):
+    if not restore_exists(rawdir):
         logger.warning(f"디렉토리가 존재하지 않습니다: {rawdir}")
         return -1, -1, inicycle, endcycle
     
-    # 디렉토리의 모든 CSV 파일 가져오기
-    subfiles = [f for f in os.listdir(rawdir) if f.endswith(".csv")]
+    # 디렉토리(또는 압축 파일)의 모든 CSV 파일 가져오기
+    subfiles = list_restore_files(rawdir)
     
     # SaveEndData 파일 직접 찾기
     save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
@@ -96,44 +124,212 @@ def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
         return -1, -1, inicycle, endcycle
     
     try:
-        df = pd.read_csv(os.path.join(rawdir, save_end_data_file), sep=",", skiprows=0, 
-                         engine="c", header=None, encoding="cp949", on_bad_lines='skip')
-   
-        # inicycle 또는 endcycle이 None인 경우 설정
-        if inicycle is None or endcycle is None:
-            if inicycle is None:
-                inicycle = int(df.loc[:,27].min())
-            if endcycle is None:
-                endcycle = int(df.loc[:,27].max())
+        save_end_path = os.path.join(rawdir, save_end_data_file)
         
-        # 시작 사이클의 인덱스
-        index_min = df.loc[(df.loc[:,27]==(inicycle)),0].tolist()
-        # 종료 사이클의 인덱스
-        index_max = df.loc[(df.loc[:,27]==endcycle),0].tolist()
+        # 정렬된 SaveEndData는 전체를 파싱하지 않고 경계 행만 이분 탐색 (실패 시 전체 읽기)
+        bounds = search_cycle_bounds(save_end_path, inicycle, endcycle)
+        df = read_restore_csv(save_end_path) if bounds is None else None
         
         # 인덱스 파일 읽기
         index_file_path = os.path.join(rawdir, "savingFileIndex_start.csv")
-        if not os.path.exists(index_file_path):
+        if "savingFileIndex_start.csv" not in subfiles:
             logger.warning(f"인덱스 파일을 찾을 수 없습니다: {index_file_path}")
+            if bounds is not None:
+                return -1, -1, bounds[0], bounds[1]
+            if inicycle is None:
+                inicycle = int(df.loc[:,27].min())
+            if endcycle is None:
+                endcycle = int(df.loc[:,27].max())
             return -1, -1, inicycle, endcycle
             
-        df2 = pd.read_csv(index_file_path, sep="\\s+", skiprows=0, 
-                          engine="c", header=None, encoding="cp949", on_bad_lines='skip')
-        index2 = [int(element.replace(',','')) for element in df2.loc[:,3].tolist()]
-        
-        if len(index_min) != 0:
-            file_start = bisect.bisect_left(index2, index_min[-1]+1)-1
-            file_end = bisect.bisect_left(index2, index_max[-1]+1)-1
-            logger.debug(f"사이클 {inicycle}-{endcycle}에 대한 파일 인덱스: {file_start}-{file_end}")
-            return file_start, file_end, inicycle, endcycle
-        else:
-            logger.warning(f"사이클 {inicycle}에 대한 인덱스를 찾을 수 없습니다.")
-            return -1, -1, inicycle, endcycle
+        df2 = read_restore_csv(index_file_path, sep="\\s+")
+        
+        if bounds is not None:
+            inicycle, endcycle, row_min, row_max = bounds
+            if row_min is None or row_max is None:
+                logger.warning(f"사이클 {inicycle}에 대한 인덱스를 찾을 수 없습니다.")
+                return -1, -1, inicycle, endcycle
+            return index_file_range(parse_file_index(df2), row_min, row_max, inicycle, endcycle)
+        
+        return find_file_range(df, parse_file_index(df2), inicycle, endcycle)
             
     except Exception as e:
         logger.error(f"사이클 검색 중 오류 발생: {str(e)}")
         return -1, -1, inicycle, endcycle
 
+def _line_cycle_and_index(line):
+    """SaveEndData 한 줄에서 (#27 사이클, #0 인덱스) 추출 (형식이 다르면 ValueError)"""
+    fields = line.split(b",")
+    if len(fields) <= 27:
+        raise ValueError(f"열 수가 부족한 행: {line[:80]!r}")
+    return int(float(fields[27])), int(float(fields[0]))
+
+def _line_at(f, position, size):
+    """
+    position 이후 처음 시작하는 완전한 줄 (position이 줄 중간이면 다음 줄로 맞춤)
+    
+    Returns:
+        tuple: (줄 시작 위치, 줄 내용) - 파일 끝이면 (size, None)
+    """
+    if position > 0:
+        f.seek(position - 1)
+        f.readline()
+    else:
+        f.seek(0)
+    while True:
+        start = f.tell()
+        if start >= size:
+            return size, None
+        line = f.readline().strip()
+        if line:
+            return start, line
+
+def _line_before(f, position):
+    """position(줄 시작 위치 또는 파일 크기) 앞의 마지막 완전한 줄 (없으면 None)"""
+    chunk_size = 4096
+    start = position
+    while start > 0:
+        start = max(0, start - chunk_size)
+        f.seek(start)
+        lines = [line for line in f.read(position - start).split(b"\n") if line.strip()]
+        # 첫 줄은 앞부분이 잘렸을 수 있으므로 줄이 두 개 이상이거나 파일 처음부터 읽었을 때만 사용
+        if len(lines) >= 2 or (start == 0 and lines):
+            return lines[-1].strip()
+        chunk_size *= 2
+    return None
+
+def _last_row_at_or_below(f, size, cycle):
+    """사이클이 cycle 이하인 마지막 행의 (사이클, 인덱스) - 없으면 None"""
+    low, high = 0, size
+    # 바이트 위치에 대한 이분 탐색: 그 위치 이후 첫 줄의 사이클이 cycle보다 큰 최소 위치
+    while low < high:
+        middle = (low + high) // 2
+        _, line = _line_at(f, middle, size)
+        if line is None or _line_cycle_and_index(line)[0] > cycle:
+            high = middle
+        else:
+            low = middle + 1
+    boundary, _ = _line_at(f, low, size)
+    line = _line_before(f, boundary)
+    return _line_cycle_and_index(line) if line is not None else None
+
+def search_cycle_bounds(file_path, inicycle=None, endcycle=None):
+    """
+    SaveEndData를 파싱하지 않고 바이트 위치 이분 탐색으로 사이클 경계 행 찾기
+    
+    SaveEndData는 #0 인덱스 순으로 기록되고 #27 사이클이 단조 증가하므로, 탐색마다 한 줄만
+    읽어 O(log n)번의 읽기로 시작/종료 사이클의 마지막 행을 찾음.
+    압축 파일처럼 위치 이동이 불가능하거나, 형식이 맞지 않거나, 마지막 줄을 아직 쓰는 중(줄바꿈 없음)이면
+    None을 반환하므로 전체를 읽어야 함.
+    
+    Args:
+        file_path (str): SaveEndData 경로
+        inicycle (int, optional): 시작 사이클 번호, None이면 첫 행의 사이클
+        endcycle (int, optional): 종료 사이클 번호, None이면 마지막 행의 사이클
+        
+    Returns:
+        tuple: (inicycle, endcycle, 시작 사이클 마지막 행의 #0, 종료 사이클 마지막 행의 #0)
+               - 해당 사이클이 없으면 행 인덱스는 None
+    """
+    if not os.path.isfile(file_path):
+        return None
+    
+    try:
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            # 잘린 마지막 줄의 필드를 사이클로 잘못 읽지 않도록 전체 읽기와 같은 결과를 쓰게 함
+            f.seek(max(0, size - 1))
+            if f.read(1) != b"\n":
+                return None
+            _, first_line = _line_at(f, 0, size)
+            last_line = _line_before(f, size)
+            if first_line is None or last_line is None:
+                return None
+            if inicycle is None:
+                inicycle = _line_cycle_and_index(first_line)[0]
+            if endcycle is None:
+                endcycle = _line_cycle_and_index(last_line)[0]
+            
+            rows = []
+            for cycle in (inicycle, endcycle):
+                row = _last_row_at_or_below(f, size, cycle)
+                rows.append(row[1] if row is not None and row[0] == cycle else None)
+    except (OSError, ValueError) as e:
+        logger.debug(f"SaveEndData 이분 탐색 실패, 전체를 읽습니다: {file_path} ({str(e)})")
+        return None
+    
+    return inicycle, endcycle, rows[0], rows[1]
+
+def read_restore_csv(file_path, sep=",", usecols=None):
+    """
+    Restore CSV 파일 읽기 (.gz/.zst 또는 압축 파일 안의 파일도 풀지 않고 바로 읽음)
+    
+    Args:
+        file_path (str): Restore 안의 CSV 경로
+        sep (str): 구분자
+        usecols (list, optional): 읽을 열 번호
+        
+    Returns:
+        DataFrame: 헤더 없는 원본 데이터
+    """
+    with open_restore_file(file_path) as f:
+        return pd.read_csv(f, sep=sep, skiprows=0, engine="c", header=None, encoding="cp949",
+                           on_bad_lines='skip', usecols=usecols)
+
+def parse_file_index(index_df):
+    """
+    savingFileIndex_start.csv의 파일별 시작 인덱스(#3, 천 단위 쉼표 포함) 변환
+    
+    Args:
+        index_df (DataFrame): savingFileIndex_start.csv 데이터
+        
+    Returns:
+        list: SaveData 파일 순서의 시작 인덱스
+    """
+    return [int(str(element).replace(',','')) for element in index_df.loc[:,3].tolist()]
+
+def find_file_range(cycle_data, index_values, inicycle=None, endcycle=None):
+    """
+    SaveEndData와 파일 시작 인덱스로 사이클 범위에 해당하는 SaveData 파일 범위 계산
+    
+    Args:
+        cycle_data (DataFrame): SaveEndData 데이터
+        index_values (list): SaveData 파일별 시작 인덱스
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        
+    Returns:
+        tuple: (file_start, file_end, inicycle, endcycle)
+    """
+    # inicycle 또는 endcycle이 None인 경우 설정
+    if inicycle is None:
+        inicycle = int(cycle_data.loc[:,27].min())
+    if endcycle is None:
+        endcycle = int(cycle_data.loc[:,27].max())
+    
+    # 시작 사이클의 인덱스
+    index_min = cycle_data.loc[(cycle_data.loc[:,27]==(inicycle)),0].tolist()
+    # 종료 사이클의 인덱스
+    index_max = cycle_data.loc[(cycle_data.loc[:,27]==endcycle),0].tolist()
+    
+    if len(index_min) != 0 and len(index_max) != 0:
+        return index_file_range(index_values, index_min[-1], index_max[-1], inicycle, endcycle)
+    
+    logger.warning(f"사이클 {inicycle}에 대한 인덱스를 찾을 수 없습니다.")
+    return -1, -1, inicycle, endcycle
+
+def index_file_range(index_values, row_min, row_max, inicycle, endcycle):
+    """
+    시작/종료 사이클 마지막 행의 #0 인덱스가 속한 SaveData 파일 범위
+    
+    Returns:
+        tuple: (file_start, file_end, inicycle, endcycle)
+    """
+    file_start = bisect.bisect_left(index_values, row_min+1)-1
+    file_end = bisect.bisect_left(index_values, row_max+1)-1
+    logger.debug(f"사이클 {inicycle}-{endcycle}에 대한 파일 인덱스: {file_start}-{file_end}")
+    return file_start, file_end, inicycle, endcycle
+
 def load_pne_data(path, inicycle=None, endcycle=None):
     """
     Restore 디렉토리에서 프로파일 데이터와 사이클 데이터 로드
@@ -151,7 +347,7 @@ def load_pne_data(path, inicycle=None, endcycle=None):
     
     # Restore 디렉토리 확인
     restore_dir = os.path.join(path, "Restore")
-    if not os.path.isdir(restore_dir):
+    if not restore_exists(restore_dir):
         logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
         return profile_data, cycle_data
     
@@ -160,7 +356,7 @@ def load_pne_data(path, inicycle=None, endcycle=None):
     try:
         # 사이클 범위 내 파일 가져오기
         file_start, file_end, inicycle, endcycle = pne_search_cycle(restore_dir, inicycle, endcycle)
-        subfiles = [f for f in os.listdir(restore_dir) if f.endswith(".csv")]
+        subfiles = list_restore_files(restore_dir)
         
         # 프로파일 데이터 로드
         if file_start != -1:
@@ -168,8 +364,7 @@ def load_pne_data(path, inicycle=None, endcycle=None):
             for files in subfiles[(file_start):(file_end+1)]:
                 if "SaveData" in files:
                     file_path = os.path.join(restore_dir, files)
-                    profileRawTemp = pd.read_csv(file_path, sep=",", skiprows=0, 
-                                              engine="c", header=None, encoding="cp949", on_bad_lines='skip')
+                    profileRawTemp = read_restore_csv(file_path)
                     if profile_raw is not None:
                         profile_raw = pd.concat([profile_raw, profileRawTemp], ignore_index=True)
                     else:
@@ -182,8 +377,7 @@ def load_pne_data(path, inicycle=None, endcycle=None):
         save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
         if save_end_data_file:
             file_path = os.path.join(restore_dir, save_end_data_file)
-            cycle_data = pd.read_csv(file_path, sep=",", skiprows=0, 
-                                  engine="c", header=None, encoding="cp949", on_bad_lines='skip')
+            cycle_data = read_restore_csv(file_path)
         
         return profile_data, cycle_data
         
@@ -191,6 +385,294 @@ def load_pne_data(path, inicycle=None, endcycle=None):
         logger.error(f"데이터 로드 중 오류 발생: {str(e)}")
         return pd.DataFrame(), pd.DataFrame()
 
+@dataclass
+class BoundaryIndex:
+    """
+    (사이클, 스텝) 구간의 시작/끝 행 위치 인덱스
+    
+    사이클 번호가 단조 증가하는 데이터를 가정하며, 사이클 번호나 스텝 타입이 바뀌는
+    지점마다 구간 하나가 생성됨 (끝 위치는 포함하지 않음)
+    
+    Attributes:
+        cycles (ndarray): 구간별 사이클 번호
+        steps (ndarray): 구간별 스텝 타입
+        starts (ndarray): 구간별 시작 행 위치
+        ends (ndarray): 구간별 끝 행 위치
+        cycle_segments (dict): 사이클 번호 -> (첫 구간 번호, 마지막 구간 번호 + 1)
+    """
+    cycles: np.ndarray
+    steps: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    cycle_segments: dict = field(default_factory=dict)
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def cycle_slice(self, cycle):
+        """사이클 전체의 행 범위 slice 반환 (없으면 빈 slice)"""
+        bounds = self.cycle_segments.get(cycle)
+        if bounds is None:
+            return slice(0, 0)
+        return slice(int(self.starts[bounds[0]]), int(self.ends[bounds[1] - 1]))
+    
+    def range_slice(self, inicycle=None, endcycle=None):
+        """inicycle~endcycle 사이클의 행 범위 slice 반환 (None이면 해당 방향 제한 없음)"""
+        first = 0 if inicycle is None else int(np.searchsorted(self.cycles, inicycle, side='left'))
+        last = len(self.cycles) if endcycle is None else int(np.searchsorted(self.cycles, endcycle, side='right'))
+        if first >= last:
+            return slice(0, 0)
+        return slice(int(self.starts[first]), int(self.ends[last - 1]))
+    
+    def step_slices(self, cycle, step_type=None):
+        """사이클 안의 구간 slice 목록 반환 (step_type 지정 시 해당 스텝만)"""
+        bounds = self.cycle_segments.get(cycle)
+        if bounds is None:
+            return []
+        return [slice(int(self.starts[i]), int(self.ends[i])) for i in range(*bounds)
+                if step_type is None or self.steps[i] == step_type]
+    
+    def segments_of_type(self, step_type):
+        """지정 스텝 타입의 모든 구간 번호 반환"""
+        return np.flatnonzero(self.steps == step_type)
+
+def build_boundary_index(data, cycle_col=27, step_col=2):
+    """
+    변화 지점으로부터 (사이클, 스텝) 구간 인덱스를 한 번에 계산
+    
+    Args:
+        data (DataFrame): 프로파일 또는 사이클 데이터
+        cycle_col: 사이클 번호 열 (원본 #27)
+        step_col: 스텝 타입 열 (원본 #2)
+        
+    Returns:
+        BoundaryIndex: 구간 인덱스
+    """
+    if data.empty:
+        empty = np.array([], dtype=np.int64)
+        return BoundaryIndex(cycles=empty, steps=empty, starts=empty, ends=empty)
+    
+    cycle_values = data[cycle_col].to_numpy()
+    step_values = data[step_col].to_numpy()
+    
+    change = np.empty(len(data), dtype=bool)
+    change[0] = True
+    change[1:] = (cycle_values[1:] != cycle_values[:-1]) | (step_values[1:] != step_values[:-1])
+    
+    starts = np.flatnonzero(change)
+    ends = np.append(starts[1:], len(data))
+    cycles = cycle_values[starts]
+    
+    # 사이클별 첫 구간과 마지막 구간 위치
+    cycle_change = np.flatnonzero(np.append(True, cycles[1:] != cycles[:-1]))
+    cycle_end = np.append(cycle_change[1:], len(starts))
+    cycle_segments = {cycles[first].item(): (int(first), int(last))
+                      for first, last in zip(cycle_change, cycle_end)}
+    
+    return BoundaryIndex(cycles=cycles, steps=step_values[starts], starts=starts, ends=ends,
+                         cycle_segments=cycle_segments)
+
+@dataclass
+class ChannelData:
+    """
+    채널 하나의 프로파일/사이클 데이터와 구간 인덱스
+    """
+    path: str
+    profile: pd.DataFrame
+    cycle: pd.DataFrame
+    profile_index: BoundaryIndex
+    cycle_index: BoundaryIndex
+    
+    def profile_cycle(self, cycle):
+        """사이클 하나의 프로파일 행 (마스크 없이 위치 slice로 선택)"""
+        return self.profile.iloc[self.profile_index.cycle_slice(cycle)]
+    
+    def profile_steps(self, cycle, step_type=None):
+        """사이클 안의 스텝 구간별 프로파일 목록"""
+        return [self.profile.iloc[s] for s in self.profile_index.step_slices(cycle, step_type)]
+    
+    def cycle_rows(self, cycle):
+        """사이클 하나의 SaveEndData 행"""
+        return self.cycle.iloc[self.cycle_index.cycle_slice(cycle)]
+
+def load_pne_channel(path, inicycle=None, endcycle=None):
+    """
+    load_pne_data 결과에 (사이클, 스텝) 구간 인덱스를 붙여 반환
+    
+    Args:
+        path (str): Restore 디렉토리를 포함하는 경로
+        inicycle (int, optional): 시작 사이클 번호
+        endcycle (int, optional): 종료 사이클 번호
+        
+    Returns:
+        ChannelData: 채널 데이터와 구간 인덱스
+    """
+    profile_data, cycle_data = load_pne_data(path, inicycle, endcycle)
+    return ChannelData(path=path, profile=profile_data, cycle=cycle_data,
+                       profile_index=build_boundary_index(profile_data),
+                       cycle_index=build_boundary_index(cycle_data))
+
+@dataclass
+class CycleSelection:
+    """
+    여러 사이클 구간을 한 번에 지정하는 선택 조건
+    
+    구간은 순서대로 추가하며 결과는 합집합임. first/last는 채널에 실제로 있는 사이클 기준.
+    
+    예:
+        selection = CycleSelection().first(5).every(100, start=100).last(10)
+    
+    Attributes:
+        windows (list): ('range', 시작, 종료, 간격) / ('first', 개수) / ('last', 개수) 목록
+    """
+    windows: list = field(default_factory=list)
+    
+    def range(self, start=None, end=None, stride=1):
+        """start~end 사이클 (None이면 처음/끝까지), stride마다 하나씩 (start 기준)"""
+        if stride < 1:
+            raise ValueError(f"stride는 1 이상이어야 합니다: {stride}")
+        self.windows.append(('range', start, end, stride))
+        return self
+    
+    def every(self, stride, start=None, end=None):
+        """stride 사이클마다 하나씩 (예: RPT 사이클)"""
+        return self.range(start, end, stride)
+    
+    def first(self, count):
+        """처음 count개 사이클"""
+        self.windows.append(('first', count))
+        return self
+    
+    def last(self, count):
+        """마지막 count개 사이클"""
+        self.windows.append(('last', count))
+        return self
+    
+    def resolve(self, available):
+        """
+        채널에 있는 사이클 중 선택된 사이클
+        
+        Args:
+            available (array): 채널의 사이클 번호 (정렬됨, 중복 허용)
+            
+        Returns:
+            ndarray: 선택된 사이클 번호 (정렬, 중복 없음)
+        """
+        available = np.unique(np.asarray(available))
+        if len(available) == 0 or not self.windows:
+            return available
+        
+        selected = []
+        for window in self.windows:
+            if window[0] == 'first':
+                selected.append(available[:max(window[1], 0)])
+            elif window[0] == 'last':
+                selected.append(available[len(available) - max(window[1], 0):])
+            else:
+                _, start, end, stride = window
+                start = available[0] if start is None else start
+                end = available[-1] if end is None else end
+                in_window = (available >= start) & (available <= end) & ((available - start) % stride == 0)
+                selected.append(available[in_window])
+        return np.unique(np.concatenate(selected))
+
+def selection_file_indices(cycle_data, index_values, cycles):
+    """
+    선택된 사이클의 행이 들어 있는 SaveData 파일 번호 (구간 사이의 파일은 제외)
+    
+    사이클 c의 행은 (c 이전 사이클의 마지막 SaveEndData #0 + 1) ~ (c의 마지막 #0)이며,
+    각 행 번호가 속한 파일을 파일 시작 인덱스로 찾음.
+    
+    Args:
+        cycle_data (DataFrame): SaveEndData 데이터 (#0, #27)
+        index_values (list): SaveData 파일별 시작 인덱스
+        cycles (array): 선택된 사이클 번호 (정렬됨)
+        
+    Returns:
+        list: 읽어야 할 SaveData 파일 번호 (오름차순)
+    """
+    if len(cycles) == 0 or cycle_data.empty:
+        return []
+    
+    row_index = cycle_data[0].to_numpy()
+    cycle_values = cycle_data[27].to_numpy()
+    
+    # SaveEndData의 #27은 단조 증가하므로 사이클별 마지막 행과 직전 사이클의 마지막 행을 이분 탐색
+    last_pos = np.searchsorted(cycle_values, cycles, side='right') - 1
+    previous_pos = np.searchsorted(cycle_values, cycles, side='left') - 1
+    row_end = row_index[last_pos]
+    row_start = np.where(previous_pos >= 0, row_index[np.maximum(previous_pos, 0)] + 1, 0)
+    
+    file_start = np.maximum(np.searchsorted(index_values, row_start, side='right') - 1, 0)
+    file_end = np.searchsorted(index_values, row_end, side='right') - 1
+    
+    indices = set()
+    for start, end in zip(file_start, file_end):
+        indices.update(range(int(start), int(end) + 1))
+    return sorted(indices)
+
+def load_pne_selection(path, selection, usecols=None):
+    """
+    여러 사이클 구간을 한 번의 스캔으로 로드 (필요한 SaveData 파일만 한 번씩 읽음)
+    
+    Args:
+        path (str): Restore 디렉토리를 포함하는 경로
+        selection (CycleSelection): 사이클 선택 조건
+        usecols (list, optional): 읽을 열 번호 (#27은 항상 포함)
+        
+    Returns:
+        tuple: (profile_data, cycle_data, cycles) - 선택된 사이클의 프로파일/사이클 데이터와 사이클 번호
+    """
+    empty = (pd.DataFrame(), pd.DataFrame(), np.array([], dtype=np.int64))
+    
+    restore_dir = os.path.join(path, "Restore")
+    if not restore_exists(restore_dir):
+        logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+        return empty
+    
+    try:
+        subfiles = list_restore_files(restore_dir)
+        save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
+        if not save_end_data_file:
+            logger.warning(f"{restore_dir}에서 SaveEndData 파일을 찾을 수 없습니다.")
+            return empty
+        
+        all_cycle_data = read_restore_csv(os.path.join(restore_dir, save_end_data_file))
+        if all_cycle_data.empty:
+            return empty
+        cycles = selection.resolve(all_cycle_data[27].to_numpy())
+        cycle_data = all_cycle_data[all_cycle_data[27].isin(cycles)].reset_index(drop=True)
+        
+        if "savingFileIndex_start.csv" not in subfiles:
+            logger.warning(f"인덱스 파일을 찾을 수 없습니다: {os.path.join(restore_dir, 'savingFileIndex_start.csv')}")
+            return pd.DataFrame(), cycle_data, cycles
+        
+        index_df = read_restore_csv(os.path.join(restore_dir, "savingFileIndex_start.csv"), sep="\\s+")
+        file_indices = selection_file_indices(all_cycle_data, parse_file_index(index_df), cycles)
+        
+        profile_files = [f for f in subfiles if "SaveData" in f]
+        if usecols is not None and 27 not in usecols:
+            usecols = sorted(list(usecols) + [27])
+        
+        # 파일마다 읽자마자 선택된 사이클 행만 남김
+        frames = []
+        for file_index in file_indices:
+            if file_index >= len(profile_files):
+                break
+            frame = read_restore_csv(os.path.join(restore_dir, profile_files[file_index]), usecols=usecols)
+            frame = frame[frame[27].isin(cycles)]
+            if not frame.empty:
+                frames.append(frame)
+        
+        logger.info(f"사이클 {len(cycles)}개 선택: SaveData 파일 {len(profile_files)}개 중 {len(frames)}개 사용 "
+                    f"({len(file_indices)}개 읽음)")
+        profile_data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        return profile_data, cycle_data, cycles
+        
+    except Exception as e:
+        logger.error(f"데이터 로드 중 오류 발생: {str(e)}")
+        return empty
+
 def extract_channel_info(path):
     """
     경로 문자열에서 채널 번호 추출
@@ -249,22 +731,25 @@ def process_cycle_data(cycle_data, inicycle, endcycle, metadata):
         return pd.DataFrame()
     
     # 사이클 데이터 필터링
-    filtered_data = cycle_data[
+    mask = (
         (cycle_data[2].isin([1, 2])) & 
         (cycle_data[27] >= inicycle if inicycle is not None else True) & 
         (cycle_data[27] <= endcycle if endcycle is not None else True)
-    ]
+    )
+    rows = np.flatnonzero(mask.to_numpy())
     
-    if filtered_data.empty:
+    if len(rows) == 0:
         return pd.DataFrame()
     
-    # 필요한 열만 선택하고 이름 변경
-    processed_data = filtered_data[[0, 8, 9, 10, 11]].copy()
-    processed_data.columns = ['time', 'voltage', 'current', 'chg_capacity', 'dchg_capacity']
+    # 필요한 열만 선택하고 이름 변경 (스텝 타입 #2, 사이클 번호 #27은 채널 간 비교용)
+    # 필터링과 열 선택을 열마다 한 번의 take로 처리하여 중간 복사본을 만들지 않음
+    processed_data = pd.DataFrame({
+        name: cycle_data[col].to_numpy()[rows]
+        for col, name in PROCESSED_COLUMNS.items()
+    })
     
-    # 메타데이터 추가
-    for key, value in metadata.items():
-        processed_data[key] = value
+    # 메타데이터 추가 (행마다 문자열을 반복하지 않도록 범주형으로 저장)
+    add_metadata_columns(processed_data, metadata)
     
     return processed_data
 
@@ -329,12 +814,12 @@ def identify_channel_groups(cycle_df):
         cycname = row['cyclename']
         cycle_info = cycle_info_mapping[cycname]
         
-        if not os.path.exists(path):
+        if not channel_path_exists(path):
             logger.warning(f"경로가 존재하지 않습니다: {path}")
             continue
             
-        # 하위 폴더 검사 (정렬하지 않고 파일 시스템 순서대로)
-        subfolders = [f.path for f in os.scandir(path) if f.is_dir() and "Pattern" not in f.path]
+        # 하위 폴더 검사 (정렬하지 않고 파일 시스템 순서대로, 압축된 채널 포함)
+        subfolders = list_channel_folders(path)
         
         # 이 경로에서 발견된 채널 목록
         channels = []
@@ -394,10 +879,307 @@ def identify_channel_groups(cycle_df):
     logger.info(f"자동으로 {len(channel_to_group)}개의 채널 그룹이 식별되었습니다.")
     return channel_to_group, cycle_info_mapping
 
-def main():
+def extract_sequence_number(cyclename):
+    """
+    사이클 이름에서 시퀀스 번호 추출 (예: A1_MP1_T23_2 -> 2, 없으면 0)
+    
+    Args:
+        cyclename (str): 사이클 이름
+        
+    Returns:
+        int: 시퀀스 번호
+    """
+    parts = cyclename.split('_')
+    if len(parts) > 1 and parts[-1].isdigit():
+        return int(parts[-1])
+    return 0
+
+def build_channel_tasks(cycle_df, channel_to_group, cycle_info_mapping):
+    """
+    처리할 채널 목록 생성 (사이클 정보별, 시퀀스 번호 순)
+    
+    Args:
+        cycle_df (DataFrame): 사이클 데이터
+        channel_to_group (dict): (사이클 정보, 채널 경로) -> 그룹 이름
+        cycle_info_mapping (dict): cyclename -> 사이클 정보
+        
+    Returns:
+        list: {'cycle_info', 'group_name', 'cyclename', 'seq_num', 'subfolder', 'channel_id'} 목록
+    """
+    tasks = []
+    
+    # 고유한 사이클 정보 가져오기
+    unique_cycle_infos = sorted(set(cycle_info_mapping.values()))
+    
+    for cycle_info in unique_cycle_infos:
+        logger.info(f"\n기본 사이클 정보 처리 중: {cycle_info}")
+        
+        # 이 사이클 정보에 해당하는 모든 행 가져오기
+        info_rows = [row for _, row in cycle_df.iterrows() 
+                    if cycle_info_mapping[row['cyclename']] == cycle_info]
+        
+        # 시퀀스 번호, cyclename 순으로 정렬
+        info_rows.sort(key=lambda x: (extract_sequence_number(x['cyclename']), x['cyclename']))
+        
+        # 그룹의 각 경로 처리
+        for row in info_rows:
+            path = row['cyclepath']
+            cycname = row['cyclename']
+            
+            logger.info(f"{path}에서 {cycname} 처리 중")
+            
+            # 이 경로가 존재하는지 확인
+            if not channel_path_exists(path):
+                logger.warning(f"경로가 존재하지 않습니다: {path}")
+                continue
+            
+            # 이 경로에 대한 모든 하위 폴더 가져오기 (채널 표시, 압축된 채널 포함)
+            subfolders = list_channel_folders(path)
+            
+            # 각 채널 폴더 처리
+            for subfolder in subfolders:
+                channel_info = extract_channel_info(subfolder)
+                
+                if channel_info and 'channel_id' in channel_info:
+                    channel_id = channel_info['channel_id']
+                    logger.info(f"  채널 발견: {channel_info['channel']}, ID: {channel_id} (위치: {subfolder})")
+                    
+                    # (cycle_info, subfolder) 키를 사용하여 그룹 찾기
+                    if (cycle_info, subfolder) in channel_to_group:
+                        tasks.append({
+                            'cycle_info': cycle_info,
+                            'group_name': channel_to_group[(cycle_info, subfolder)],
+                            'cyclename': cycname,
+                            'seq_num': extract_sequence_number(cycname),
+                            'subfolder': subfolder,
+                            'channel_id': channel_id
+                        })
+    
+    return tasks
+
+def task_metadata(task):
+    """
+    채널 작업의 처리 결과에 추가할 메타데이터
+    
+    Args:
+        task (dict): build_channel_tasks()의 항목
+        
+    Returns:
+        dict: cyclename, subfolder, channel_id, cycle_info
+    """
+    return {
+        'cyclename': task['cyclename'],
+        'subfolder': task['subfolder'],
+        'channel_id': task['channel_id'],
+        'cycle_info': task['cycle_info']
+    }
+
+def load_cycle_data(path):
+    """
+    SaveEndData만 처리에 필요한 열(PROCESSED_COLUMNS)로 로드 (SaveData 프로파일은 읽지 않음)
+    
+    Args:
+        path (str): Restore 디렉토리를 포함하는 경로
+        
+    Returns:
+        DataFrame: 사이클 데이터 (없으면 빈 DataFrame)
+    """
+    restore_dir = os.path.join(path, "Restore")
+    if not restore_exists(restore_dir):
+        logger.warning(f"Restore 디렉토리가 존재하지 않습니다: {restore_dir}")
+        return pd.DataFrame()
+    
+    try:
+        save_end_data_file = next((f for f in list_restore_files(restore_dir) if "SaveEndData" in f), None)
+        if not save_end_data_file:
+            logger.warning(f"{restore_dir}에서 SaveEndData 파일을 찾을 수 없습니다.")
+            return pd.DataFrame()
+        return read_restore_csv(os.path.join(restore_dir, save_end_data_file), usecols=sorted(PROCESSED_COLUMNS))
+    except Exception as e:
+        logger.error(f"데이터 로드 중 오류 발생: {str(e)}")
+        return pd.DataFrame()
+
+def process_channel(subfolder, inicycle, endcycle, metadata):
+    """
+    채널 하나의 데이터 로드 및 사이클 데이터 처리
+    
+    Args:
+        subfolder (str): Restore 디렉토리를 포함하는 채널 경로
+        inicycle (int): 시작 사이클 번호
+        endcycle (int): 종료 사이클 번호
+        metadata (dict): 추가할 메타데이터
+        
+    Returns:
+        DataFrame: 처리된 사이클 데이터 (없으면 빈 DataFrame)
+    """
+    cycle_data = load_cycle_data(subfolder)
+    if cycle_data.empty:
+        return pd.DataFrame()
+    
+    return process_cycle_data(cycle_data, inicycle, endcycle, metadata)
+
+class GroupWriter:
+    """
+    그룹별 병합 CSV를 채널 처리 순서와 관계없이 seq_num 순서로 바로 이어 쓰는 클래스
+    
+    다음 차례의 구간이 도착하면 즉시 파일에 추가하고, 순서보다 먼저 도착한 구간과
+    중복 제거용 직전 구간은 메모리 예산(MemoryBudget)에 맡겨 예산을 넘으면 임시 파일로
+    내려 두었다가 차례가 되면 다시 읽어 씀.
+    """
+    
+    def __init__(self, output_dir=".", budget=None):
+        self.output_dir = output_dir
+        self.budget = budget or MemoryBudget(MEMORY_BUDGET_BYTES, os.path.join(output_dir, ".pne_spill"))
+        self.groups = {}
+    
+    def expect(self, key, seq_nums):
+        """
+        그룹에 들어올 구간의 seq_num 목록 등록
+        
+        Args:
+            key (tuple): (사이클 정보, 그룹 이름)
+            seq_nums (list): 이 그룹의 구간 seq_num 목록 (중복 허용)
+        """
+        self.groups[key] = {
+            'pending': sorted(seq_nums),
+            'arrived': {},
+            'has_previous': False,
+            'time_offset': 0,
+            'rows': 0,
+            'channel_ids': [],
+            'cyclenames': [],
+            'partial_path': os.path.join(self.output_dir, f"{key[0]}_{key[1]}_merged_cycles.partial"),
+            'path': None
+        }
+        
+        # 이전 실행에서 남은 임시 파일 제거
+        if os.path.exists(self.groups[key]['partial_path']):
+            os.remove(self.groups[key]['partial_path'])
+    
+    def add(self, key, seq_num, cyclename, channel_id, data):
+        """
+        처리가 끝난 구간 추가 (빈 데이터도 순서 진행을 위해 전달)
+        """
+        state = self.groups[key]
+        item = {'cyclename': cyclename, 'channel_id': channel_id, 'budget_key': None}
+        
+        if state['pending'] and state['pending'][0] == seq_num:
+            state['pending'].pop(0)
+            self._append(key, item, data)
+            self._drain(key)
+            return
+        
+        # 순서보다 먼저 도착한 구간은 메모리 예산에 보관 (초과 시 디스크로)
+        if data is not None and not data.empty:
+            item['budget_key'] = ('pending', key, seq_num, cyclename, channel_id)
+            self.budget.put(item['budget_key'], data)
+        state['arrived'].setdefault(seq_num, []).append(item)
+        self._drain(key)
+    
+    def _drain(self, key):
+        state = self.groups[key]
+        while state['pending'] and state['arrived'].get(state['pending'][0]):
+            seq_num = state['pending'].pop(0)
+            item = state['arrived'][seq_num].pop(0)
+            data = self.budget.pop(item['budget_key']) if item['budget_key'] else pd.DataFrame()
+            self._append(key, item, data)
+        
+        if not state['pending']:
+            self._finish(key)
+    
+    def _append(self, key, item, data):
+        state = self.groups[key]
+        if data is None or data.empty:
+            return
+        
+        # 중복 제거 후 남는 행이 없는 구간도 채널 목록(출력 파일 이름)에는 포함 (일괄 병합 때와 같게)
+        state['channel_ids'].append(item['channel_id'])
+        state['cyclenames'].append(item['cyclename'])
+        
+        # 이어진 시험의 중복 구간 제거
+        if state['has_previous']:
+            data = stitch_segments([self.budget.get(('previous', key)), data])[1]
+            if data.empty:
+                return
+        self.budget.put(('previous', key), data)
+        state['has_previous'] = True
+        
+        # 누적 시간 계산 (이전 구간까지의 합을 이어서 누적)
+        output = data.copy(deep=False)
+        output['cumulative_time'] = output['time'].cumsum() + state['time_offset']
+        state['time_offset'] = output['cumulative_time'].iloc[-1]
+        
+        output.to_csv(state['partial_path'], mode='a', header=state['rows'] == 0, index=False)
+        state['rows'] += len(output)
+    
+    def _finish(self, key):
+        state = self.groups[key]
+        if state['path'] is not None or state['rows'] == 0:
+            return
+        
+        cycle_info, group_name = key
+        channel_ids_str = '-'.join(state['channel_ids'])
+        output_filename = os.path.join(self.output_dir, f"{cycle_info}_{group_name}_ch{channel_ids_str}_merged_cycles.csv")
+        os.replace(state['partial_path'], output_filename)
+        state['path'] = output_filename
+        self.budget.discard(('previous', key))
+        state['has_previous'] = False
+        logger.info(f"{cycle_info}_{group_name}에 대한 병합된 사이클 데이터를 {output_filename}으로 내보냈습니다 (채널: {channel_ids_str})")
+    
+    def close(self):
+        """
+        남은 구간을 seq_num 순서로 모두 쓰고 그룹 요약 반환
+        
+        Returns:
+            dict: (사이클 정보, 그룹 이름) -> {'path', 'rows', 'channel_ids', 'cyclenames'}
+        """
+        for key, state in self.groups.items():
+            # 끝내 도착하지 않은 구간은 건너뛰고 나머지를 순서대로 기록
+            for seq_num in list(state['pending']):
+                if not state['arrived'].get(seq_num):
+                    state['pending'].remove(seq_num)
+            self._drain(key)
+        
+        self.budget.clear()
+        
+        return {key: {'path': state['path'], 'rows': state['rows'],
+                      'channel_ids': state['channel_ids'], 'cyclenames': state['cyclenames']}
+                for key, state in self.groups.items() if state['path'] is not None}
+
+def compute_channel(subfolder, inicycle, endcycle, metadata, cache_dir=None, cache_max_bytes=CACHE_MAX_BYTES):
+    """
+    채널 하나를 처리 (캐시가 있으면 재사용)
+    
+    워커 프로세스에서 실행할 수 있도록 캐시 객체 대신 캐시 경로를 받음.
+    
+    Returns:
+        DataFrame: process_channel()의 결과
+    """
+    if cache_dir:
+        cache = ChannelResultCache(cache_dir, cache_max_bytes, PROCESSING_VERSION)
+        return cache.get_or_compute(subfolder, lambda: process_channel(subfolder, inicycle, endcycle, metadata),
+                                    inicycle, endcycle, metadata)
+    return process_channel(subfolder, inicycle, endcycle, metadata)
+
+def main(cache_dir=CACHE_DIR, cache_max_bytes=CACHE_MAX_BYTES, checkpoint_dir=CHECKPOINT_DIR, output_dir=".",
+         memory_budget=MEMORY_BUDGET_BYTES, workers=1):
     """
     메인 처리 함수
+    
+    Args:
+        cache_dir (str, optional): 채널 처리 결과 캐시 디렉토리, None이면 캐시 사용 안 함
+        cache_max_bytes (int): 캐시 최대 용량
+        checkpoint_dir (str, optional): 체크포인트 디렉토리 (상대 경로는 output_dir 기준), None이면 사용 안 함
+        output_dir (str): 병합 CSV 출력 디렉토리
+        memory_budget (int): 병합 중 메모리에 유지할 데이터의 최대 바이트 수
+        workers (int): 채널 처리 프로세스 수, 2 이상이면 결과를 공유 메모리로 전달받음
+    
+    Returns:
+        dict: (사이클 정보, 그룹 이름) -> {'path', 'rows', 'channel_ids', 'cyclenames'}
     """
+    merged_groups = {}
+    cache = ChannelResultCache(cache_dir, cache_max_bytes, PROCESSING_VERSION) if cache_dir else None
+
     try:
         # 1. 경로 파일 로드
         # 2. cyclename, cyclepath, capacity 추출
@@ -406,7 +1188,7 @@ def main():
         # 경로가 성공적으로 로드되었는지 확인
         if not cyclepath:
             logger.error("사이클 경로를 찾을 수 없습니다.")
-            return
+            return merged_groups
         
         # 3. 사이클 범위 입력 받기
         inicycle, endcycle = get_user_input_cycles()
@@ -421,123 +1203,139 @@ def main():
         # 채널 ID에서 그룹으로의 매핑 생성 (자동화)
         channel_to_group, cycle_info_mapping = identify_channel_groups(cycle_df)
         
-        # 그룹별 데이터 저장을 위한 딕셔너리
-        # 키: (사이클 정보, Data#)
-        group_data = defaultdict(list)
+        # 같은 조건의 이전 실행이 중단되었다면 완료된 채널 결과 재사용
+        checkpoint = None
+        if checkpoint_dir:
+            # 출력 폴더가 다른 실행끼리 같은 저널을 공유하지 않도록 출력 폴더 아래에 둠
+            checkpoint = RunCheckpoint(os.path.join(output_dir, checkpoint_dir), run_key(cycle_df, inicycle, endcycle, PROCESSING_VERSION))
+        
+        # 4. 처리할 채널 목록 생성
+        tasks = build_channel_tasks(cycle_df, channel_to_group, cycle_info_mapping)
+        
+        # 처리 전 채널별 Restore 지문 (출력 해시와 체크포인트 기록에 함께 사용)
+        fingerprints = {task['subfolder']: restore_fingerprint(task['subfolder']) for task in tasks}
+        
+        # 입력(채널 원본 파일, 사이클 범위, 처리 버전)이 그대로인 그룹은 기존 출력 파일을 사용
+        manifest = OutputManifest(output_dir)
+        group_tasks = defaultdict(list)
+        for task in tasks:
+            group_tasks[(task['cycle_info'], task['group_name'])].append(task)
+        group_digests = {}
+        for (cycle_info, group_name), members in group_tasks.items():
+            digest = output_digest(inicycle, endcycle, PROCESSING_VERSION,
+                                   [(task['seq_num'], task_metadata(task)) for task in members],
+                                   channel_inputs([task['subfolder'] for task in members], fingerprints))
+            entry = manifest.lookup(f"{cycle_info}_{group_name}", digest)
+            if entry is not None:
+                merged_groups[(cycle_info, group_name)] = dict(entry['info'], path=os.path.join(output_dir, entry['file']))
+                logger.info(f"{cycle_info}_{group_name}: 입력이 바뀌지 않아 기존 출력을 사용합니다 ({entry['file']})")
+            else:
+                group_digests[(cycle_info, group_name)] = digest
+        tasks = [task for task in tasks if (task['cycle_info'], task['group_name']) in group_digests]
+        
+        # 그룹별 출력 파일에 seq_num 순서로 바로 기록 (키: (사이클 정보, Data#))
+        writer = GroupWriter(output_dir, MemoryBudget(memory_budget, os.path.join(output_dir, ".pne_spill")))
+        group_seq_nums = defaultdict(list)
+        for task in tasks:
+            group_seq_nums[(task['cycle_info'], task['group_name'])].append(task['seq_num'])
+        for key, seq_nums in group_seq_nums.items():
+            writer.expect(key, seq_nums)
+        
+        # 처리에 실패한 채널이 있는 그룹 (출력 기록에 남기지 않아 다음 실행에서 다시 만듦)
+        failed_groups = set()
         
-        # 고유한 사이클 정보 가져오기
-        unique_cycle_infos = set(cycle_info_mapping.values())
+        def add_result(task, processed_data):
+            writer.add((task['cycle_info'], task['group_name']), task['seq_num'], task['cyclename'],
+                       task['channel_id'], processed_data)
+            if not processed_data.empty:
+                logger.info(f"    {task['group_name']}에 데이터 추가됨 (channel_id: {task['channel_id']})")
         
-        # 5. 각 고유 사이클 정보 그룹 처리
-        for cycle_info in unique_cycle_infos:
-            logger.info(f"\n기본 사이클 정보 처리 중: {cycle_info}")
+        # 5. 각 채널 데이터 로드 및 처리
+        pending_tasks = []
+        for task in tasks:
+            cycle_info = task['cycle_info']
+            group_name = task['group_name']
+            subfolder = task['subfolder']
             
-            # 이 사이클 정보에 해당하는 모든 행 가져오기
-            info_rows = [row for _, row in cycle_df.iterrows() 
-                        if cycle_info_mapping[row['cyclename']] == cycle_info]
+            metadata = task_metadata(task)
             
-            # cyclename으로 정렬
-            info_rows.sort(key=lambda x: x['cyclename'])
+            if workers > 1 and not (checkpoint is not None
+                                    and checkpoint.is_done(cycle_info, group_name, subfolder, fingerprints[subfolder])):
+                pending_tasks.append(task)
+                continue
             
-            # 그룹의 각 경로 처리
-            for row in info_rows:
-                path = row['cyclepath']
-                cycname = row['cyclename']
-                
-                logger.info(f"{path}에서 {cycname} 처리 중")
-                
-                # 이 경로가 존재하는지 확인
-                if not os.path.exists(path):
-                    logger.warning(f"경로가 존재하지 않습니다: {path}")
+            def compute(subfolder=subfolder, metadata=metadata):
+                if cache is not None:
+                    return cache.get_or_compute(
+                        subfolder, lambda: process_channel(subfolder, inicycle, endcycle, metadata),
+                        inicycle, endcycle, metadata)
+                return process_channel(subfolder, inicycle, endcycle, metadata)
+            
+            try:
+                if checkpoint is not None:
+                    processed_data = checkpoint.get_or_compute(cycle_info, group_name, subfolder, compute,
+                                                               fingerprints[subfolder])
+                else:
+                    processed_data = compute()
+            except Exception as e:
+                # 실패한 채널은 건너뛰고 나머지 채널과 그룹은 계속 처리 (체크포인트에 남기지 않아 다음 실행에서 다시 처리)
+                logger.error(f"채널 처리 중 오류 발생 ({subfolder}): {str(e)}")
+                failed_groups.add((cycle_info, group_name))
+                processed_data = pd.DataFrame()
+            
+            add_result(task, processed_data)
+        
+        # 남은 채널은 워커 프로세스에서 처리하고 결과는 공유 메모리로 복사 없이 받음
+        shared_dir = os.path.join(output_dir, ".pne_shared")
+        if pending_tasks:
+            logger.info(f"{len(pending_tasks)}개 채널을 {workers}개 프로세스로 처리합니다.")
+            args_list = [(task['subfolder'], inicycle, endcycle, task_metadata(task), cache_dir, cache_max_bytes)
+                         for task in pending_tasks]
+            os.makedirs(shared_dir, exist_ok=True)
+            for position, shared in map_shared(compute_channel, args_list, workers, directory=shared_dir,
+                                               return_exceptions=True):
+                task = pending_tasks[position]
+                if isinstance(shared, BaseException):
+                    # 직렬 처리와 같이 실패한 채널만 건너뜀
+                    logger.error(f"채널 처리 중 오류 발생 ({task['subfolder']}): {str(shared)}")
+                    failed_groups.add((task['cycle_info'], task['group_name']))
+                    add_result(task, pd.DataFrame())
                     continue
-                
-                # 이 경로에 대한 모든 하위 폴더 가져오기 (채널 표시)
-                subfolders = [f.path for f in os.scandir(path) if f.is_dir() and "Pattern" not in f.path]
-                
-                # 각 채널 폴더 처리
-                for subfolder in subfolders:
-                    channel_info = extract_channel_info(subfolder)
-                    
-                    if channel_info and 'channel_id' in channel_info:
-                        channel_id = channel_info['channel_id']
-                        logger.info(f"  채널 발견: {channel_info['channel']}, ID: {channel_id} (위치: {subfolder})")
-                        
-                        # (cycle_info, subfolder) 키를 사용하여 그룹 찾기
-                        if (cycle_info, subfolder) in channel_to_group:
-                            group_name = channel_to_group[(cycle_info, subfolder)]
-                            
-                            # 5-1. 이 채널에 대한 데이터 로드
-                            profile_data, cycle_data = load_pne_data(subfolder, inicycle, endcycle)
-                            
-                            # 사이클 데이터 처리
-                            if not cycle_data.empty:
-                                metadata = {
-                                    'cyclename': cycname,
-                                    'subfolder': subfolder,
-                                    'channel_id': channel_id,
-                                    'cycle_info': cycle_info
-                                }
-                                
-                                processed_data = process_cycle_data(cycle_data, inicycle, endcycle, metadata)
-                                
-                                if not processed_data.empty:
-                                    # 사이클 정보와 그룹 이름을 조합하여 키 생성
-                                    full_group_key = (cycle_info, group_name)
-                                    
-                                    # 이 그룹의 컬렉션에 추가
-                                    group_data[full_group_key].append({
-                                        'cyclename': cycname,
-                                        'data': processed_data,
-                                        'seq_num': int(cycname.split('_')[-1]) if len(cycname.split('_')) > 1 and cycname.split('_')[-1].isdigit() else 0,
-                                        'channel_id': channel_id
-                                    })
-                                    logger.info(f"    {group_name}에 데이터 추가됨 (channel_id: {channel_id})")
-        
-        # 사이클 정보별로 데이터 병합
-        merged_groups = {}
-        
-        for (cycle_info, group_name), data_items in group_data.items():
-            if data_items:
-                # cyclename의 시퀀스 번호로 정렬
-                sorted_data_items = sorted(data_items, key=lambda x: x['seq_num'])
-                
-                # 메타데이터 추출
-                cyclenames = [item['cyclename'] for item in sorted_data_items]
-                channel_ids = [item['channel_id'] for item in sorted_data_items]
-                
-                # 정렬된 순서로 DataFrame 연결
-                data_frames = [item['data'] for item in sorted_data_items]
-                group_merged = pd.concat(data_frames, ignore_index=True)
-                
-                # 누적 시간 계산
-                group_merged['cumulative_time'] = group_merged['time'].cumsum()
-                
-                # 채널 ID를 발견된 순서대로 출력
-                channel_ids_str = '-'.join(channel_ids)
-                
-                # 병합된 데이터 저장
-                merged_groups[(cycle_info, group_name)] = {
-                    'data': group_merged,
-                    'channel_ids': channel_ids,
-                    'cyclenames': cyclenames
-                }
-                
-                # CSV로 내보내기
-                output_filename = f"{cycle_info}_{group_name}_ch{channel_ids_str}_merged_cycles.csv"
-                group_merged.to_csv(output_filename, index=False)
-                logger.info(f"{cycle_info}_{group_name}에 대한 병합된 사이클 데이터를 {output_filename}으로 내보냈습니다 (채널: {channel_ids_str})")
+                with shared:
+                    if checkpoint is not None:
+                        checkpoint.record(task['cycle_info'], task['group_name'], task['subfolder'], shared.data,
+                                          fingerprints[task['subfolder']])
+                    add_result(task, shared.data)
+        
+        written_groups = writer.close()
+        for key, digest in group_digests.items():
+            if key in written_groups and key not in failed_groups:
+                group_info = written_groups[key]
+                manifest.record(f"{key[0]}_{key[1]}", digest, group_info['path'],
+                                {name: group_info[name] for name in ('rows', 'channel_ids', 'cyclenames')})
+            else:
+                manifest.forget(f"{key[0]}_{key[1]}")
+        manifest.save()
+        merged_groups.update(written_groups)
+        # 매핑이 남아 삭제되지 못한 공유 파일 정리 (Windows)
+        shutil.rmtree(shared_dir, ignore_errors=True)
         
         # 처리된 데이터 요약 인쇄
         logger.info("\n데이터 요약:")
-        for (cycle_info, group_name), group_data in merged_groups.items():
-            data = group_data['data']
-            channel_ids = group_data['channel_ids']
+        for (cycle_info, group_name), group_info in merged_groups.items():
+            channel_ids = group_info['channel_ids']
             num_channels = len(channel_ids)
-            num_rows = data.shape[0]
+            num_rows = group_info['rows']
             logger.info(f"  - {cycle_info}_{group_name}: {num_channels}개 채널에서 총 {num_rows}개 행 (채널: {'-'.join(channel_ids)})")
+        
+        # 모든 출력이 끝났으므로 체크포인트 정리
+        if checkpoint is not None:
+            checkpoint.clear()
                 
     except Exception as e:
         logger.error(f"처리 중 오류 발생: {str(e)}")
+    
+    return merged_groups
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
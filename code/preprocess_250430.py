@@ -7,6 +7,9 @@ import tkinter as tk
 from tkinter import filedialog
 import bisect
 
+from pne_archive import restore_exists, list_restore_files, open_restore_file, list_channel_folders
+from pne_frames import add_metadata_columns, concat_categorical, stitch_segments
+
 def extract_capacity(folder_path):
     """
     Extract the capacity (mAh) from the top level folder path.
@@ -70,6 +73,20 @@ def set_pne_paths():
     
     return cyclename, cyclepath, mincapacity
 
+def read_restore_csv(file_path, sep=","):
+    """
+    Read a Restore CSV file, including .gz/.zst files and files inside zip archives.
+    
+    Args:
+        file_path (str): Path of the CSV file inside Restore
+        sep (str): Column separator
+        
+    Returns:
+        DataFrame: Raw data without header
+    """
+    with open_restore_file(file_path) as f:
+        return pd.read_csv(f, sep=sep, skiprows=0, engine="c", header = None, encoding="cp949", on_bad_lines='skip')
+
 def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
     """
     Search for cycle files in the specified directory within the given cycle range.
@@ -82,11 +99,11 @@ def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
     Returns:
         tuple: (file_start, file_end) indices for the cycle range
     """
-    if not os.path.isdir(rawdir):
+    if not restore_exists(rawdir):
         return -1, -1, inicycle, endcycle
     
     # Get all CSV files in the directory
-    subfiles = [f for f in os.listdir(rawdir) if f.endswith(".csv")]
+    subfiles = list_restore_files(rawdir)
     
     # Directly find SaveEndData file
     save_end_data_file = next((f for f in subfiles if "SaveEndData" in f), None)
@@ -94,7 +111,7 @@ def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
     if not save_end_data_file:
         return -1, -1, inicycle, endcycle
         
-    df = pd.read_csv(os.path.join(rawdir, save_end_data_file), sep=",", skiprows=0, engine="c", header = None, encoding="cp949", on_bad_lines='skip')
+    df = read_restore_csv(os.path.join(rawdir, save_end_data_file))
    
     if inicycle is None or endcycle is None:
         if inicycle is None:
@@ -108,7 +125,7 @@ def pne_search_cycle(rawdir, inicycle=None, endcycle=None):
     index_max = df.loc[(df.loc[:,27]==endcycle),0].tolist()
     
     # Define inicycle and endcycle if they are None
-    df2 = pd.read_csv(os.path.join(rawdir, "savingFileIndex_start.csv"), sep="\\s+", skiprows=0, engine="c", header = None, encoding="cp949", on_bad_lines='skip')
+    df2 = read_restore_csv(os.path.join(rawdir, "savingFileIndex_start.csv"), sep="\\s+")
     df2 = df2.loc[:,3].tolist() #result index number
     
     index2 = []
@@ -139,18 +156,18 @@ def pne_continue_data(path, inicycle=None, endcycle=None):
     
     # Check for Restore directory
     restore_dir = os.path.join(path, "Restore")
-    if os.path.isdir(restore_dir):
+    if restore_exists(restore_dir):
         print(f"Processing Restore directory at: {restore_dir}")
         
         # Get files within the cycle range
       
         file_start, file_end, inicycle, endcycle = pne_search_cycle(restore_dir, inicycle, endcycle)
-        subfile = [f for f in os.listdir(restore_dir) if f.endswith(".csv")]
+        subfile = list_restore_files(restore_dir)
         
         if file_start != -1:
             for files in subfile[(file_start):(file_end+1)]:
                 if "SaveData" in files:
-                    profileRawTemp = pd.read_csv(os.path.join(restore_dir, files), sep=",", skiprows=0, engine="c", header = None, encoding="cp949", on_bad_lines='skip')
+                    profileRawTemp = read_restore_csv(os.path.join(restore_dir, files))
                     if profile_raw is not None:
                         profile_raw = pd.concat([profile_raw, profileRawTemp], ignore_index=True)
                     else:
@@ -165,13 +182,13 @@ def pne_continue_data(path, inicycle=None, endcycle=None):
 def pne_cyc_continue_data(path):
     df = pd.DataFrame()
     restore_dir = os.path.join(path, "Restore")
-    if os.path.isdir(restore_dir):
+    if restore_exists(restore_dir):
         print(f"Processing Restore directory at: {restore_dir}")
-        subfile = [f for f in os.listdir(restore_dir) if f.endswith(".csv")]
+        subfile = list_restore_files(restore_dir)
   
         save_end_data_file = next((f for f in subfile if "SaveEndData" in f), None)
         if save_end_data_file:
-                df = pd.read_csv(os.path.join(restore_dir, save_end_data_file), sep=",", skiprows=0, engine="c", header = None, encoding="cp949", on_bad_lines='skip')
+                df = read_restore_csv(os.path.join(restore_dir, save_end_data_file))
     return df     
 
 
@@ -307,7 +324,7 @@ def concatenate():
         
         # Get all channel directories in this path
         try:
-            channel_dirs = [d.path for d in os.scandir(path) if d.is_dir() and "Pattern" not in d.path]
+            channel_dirs = list_channel_folders(path)
             
             print(f"Found {len(channel_dirs)} channels in {path}")
             
@@ -430,22 +447,24 @@ def concatenate():
                         processed_data = cycle_data[[0, 8, 9, 10, 11]].copy()
                         processed_data.columns = ['time', 'voltage', 'current', 'chg_capacity', 'dchg_capacity']
                         
-                        # Add metadata
-                        processed_data['cyclename'] = cyclename
-                        processed_data['path_seq'] = idx
-                        processed_data['subfolder'] = subfolder
-                        processed_data['channel_id'] = channel_id
+                        # Add metadata as categoricals (one value + 1-byte code per row)
+                        add_metadata_columns(processed_data, {'cyclename': cyclename, 'path_seq': idx,
+                                                              'subfolder': subfolder, 'channel_id': channel_id})
                         
                         all_data.append(processed_data)
                         print(f"      Added {processed_data.shape[0]} rows of data for channel {channel_id}")
             
             # Merge data if we have any
             if all_data:
-                # Concatenate data
-                group_merged = pd.concat(all_data, ignore_index=True)
+                # Drop rows repeated at the start of each continuation run
+                compare_columns = ['time', 'voltage', 'current', 'chg_capacity', 'dchg_capacity']
+                all_data = stitch_segments(all_data, 'time', compare_columns)
+                
+                # Concatenate data, aligning categories first so the metadata stays categorical
+                group_merged = concat_categorical(all_data)
                 
                 # Calculate cumulative time
-                group_merged['path_time'] = group_merged.groupby('path_seq')['time'].transform(
+                group_merged['path_time'] = group_merged.groupby('path_seq', observed=True)['time'].transform(
                     lambda x: x - x.iloc[0] if len(x) > 0 else 0
                 )
                 
@@ -0,0 +1,115 @@
+import os
+import sys
+import shutil
+import builtins
+
+import pandas as pd
+import pytest
+
+# code/ 의 모듈을 패키지 없이 바로 가져오도록 경로 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pre250508_edit  # noqa: E402
+
+# 파일 하나에 들어가는 SaveData 행 수
+ROWS_PER_FILE = 500
+
+# 사이클마다의 스텝 (스텝 타입 #2, 전류 A), 스텝마다 10행
+CYCLE_STEPS = ((1, 1.0), (3, 0.0), (2, -1.0), (3, 0.0))
+
+
+def write_channel(channel_dir, first_cycle, last_cycle, first_index=1):
+    """
+    PNE Restore 형식의 합성 채널 작성
+
+    SaveData####.csv는 ROWS_PER_FILE행씩 나누고, SaveEndData.csv에는 스텝마다 마지막 행을,
+    savingFileIndex_start.csv에는 파일별 시작 #0 인덱스를 기록함.
+
+    Returns:
+        list: SaveData 전체 행
+    """
+    restore_dir = os.path.join(channel_dir, "Restore")
+    os.makedirs(restore_dir)
+
+    rows, ends = [], []
+    index, hundredths = first_index, 0
+    for cycle in range(first_cycle, last_cycle + 1):
+        for step_type, current in CYCLE_STEPS:
+            for k in range(10):
+                hundredths += 100
+                row = [0] * 30
+                row[0] = index
+                row[2] = step_type
+                row[8] = round(3.7 + 0.05 * k * (1 if current > 0 else -1) if current else 3.8 - 0.001 * k, 4)
+                row[9] = current * 1000
+                row[10] = k * 10 if step_type == 1 else 0
+                row[11] = k * 10 if step_type == 2 else 0
+                row[18] = hundredths // 8640000
+                row[19] = hundredths % 8640000
+                row[27] = cycle
+                rows.append(row)
+                index += 1
+            ends.append(rows[-1])
+
+    starts = []
+    for number, start in enumerate(range(0, len(rows), ROWS_PER_FILE), 1):
+        starts.append(rows[start][0])
+        with open(os.path.join(restore_dir, f"ch01_SaveData{number:04d}.csv"), "w") as f:
+            f.writelines(",".join(map(str, row)) + "\n" for row in rows[start:start + ROWS_PER_FILE])
+    with open(os.path.join(restore_dir, "ch01_SaveEndData.csv"), "w") as f:
+        f.writelines(",".join(map(str, row)) + "\n" for row in ends)
+    with open(os.path.join(restore_dir, "savingFileIndex_start.csv"), "w") as f:
+        f.writelines(f"{number} 2025/01/01 00:00:00 {start:,}\n" for number, start in enumerate(starts, 1))
+    return rows
+
+
+def rewrite_channel(channel_dir, first_cycle, last_cycle, first_index=1):
+    """채널의 Restore를 다른 사이클 범위로 다시 작성 (시험이 이어져 파일이 바뀐 경우)"""
+    shutil.rmtree(os.path.join(channel_dir, "Restore"))
+    return write_channel(channel_dir, first_cycle, last_cycle, first_index)
+
+
+@pytest.fixture
+def restore_tree(tmp_path):
+    """
+    두 구간(seq 1: 1-60 사이클, seq 2: 58-90 사이클)에 채널 두 개씩 있는 합성 시험 폴더
+
+    Returns:
+        DataFrame: cyclename, cyclepath, capacity 열 (set_pne_paths()와 같은 내용)
+    """
+    names, paths = [], []
+    for seq_num, (first_cycle, last_cycle) in enumerate([(1, 60), (58, 90)], 1):
+        cyclename = f"A1_MP1_T23_4500mAh_{seq_num}"
+        cyclepath = os.path.join(tmp_path, "data", cyclename)
+        for module, channel in ((1, 45), (1, 46)):
+            write_channel(os.path.join(cyclepath, f"M{module:02d}Ch{channel:03d}[{channel:03d}]"),
+                          first_cycle, last_cycle, 1 + (first_cycle - 1) * 40)
+        names.append(cyclename)
+        paths.append(cyclepath)
+    return pd.DataFrame({'cyclename': names, 'cyclepath': paths, 'capacity': [4500] * len(names)})
+
+
+@pytest.fixture
+def run_main(monkeypatch):
+    """
+    경로 선택 창과 사이클 입력 없이 pre250508_edit.main() 실행 (모든 사이클)
+
+    Returns:
+        callable: run_main(cycle_df, output_dir, **kwargs) -> main()의 결과
+    """
+    def run(cycle_df, output_dir, **kwargs):
+        monkeypatch.setattr(pre250508_edit, "set_pne_paths",
+                            lambda: (cycle_df['cyclename'].tolist(), cycle_df['cyclepath'].tolist(),
+                                     cycle_df['capacity'].tolist()))
+        monkeypatch.setattr(builtins, "input", lambda *args: "")
+        os.makedirs(output_dir, exist_ok=True)
+        kwargs.setdefault('cache_dir', None)
+        kwargs.setdefault('checkpoint_dir', None)
+        return pre250508_edit.main(output_dir=str(output_dir), **kwargs)
+    return run
+
+
+def output_files(output_dir):
+    """출력 폴더의 CSV 파일 이름 -> 내용 (바이트)"""
+    return {name: open(os.path.join(output_dir, name), "rb").read()
+            for name in sorted(os.listdir(output_dir)) if name.endswith(".csv")}
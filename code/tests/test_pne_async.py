@@ -0,0 +1,64 @@
+import time
+import asyncio
+import threading
+
+import pytest
+
+from pne_async import AsyncPNELoader, DirectoryAccess, load_channels_async, compare_with_sync
+from pre250508_edit import load_pne_data
+
+
+class CountingAccess(DirectoryAccess):
+    """지연 중인 호출 수를 세어 최대 동시 호출 수를 기록하는 DirectoryAccess"""
+
+    def __init__(self, latency):
+        super().__init__(latency)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def _wait(self):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+@pytest.mark.parametrize("inicycle, endcycle", [(None, None), (58, 60)])
+def test_async_matches_sync_with_latency(restore_tree, inicycle, endcycle):
+    fs = CountingAccess(latency=0.02)
+    results = load_channels_async(restore_tree, inicycle, endcycle, concurrency=3, fs=fs)
+
+    assert len(results) == 4
+    for channel, profile, cycle in results:
+        expected_profile, expected_cycle = load_pne_data(channel['subfolder'], inicycle, endcycle)
+        assert not profile.empty
+        assert profile.equals(expected_profile)
+        assert cycle.equals(expected_cycle)
+
+    # 동시 호출 수는 concurrency를 넘지 않고, 실제로 여러 요청이 겹쳐서 실행됨
+    assert 1 < fs.max_in_flight <= 3
+
+
+def test_loader_reusable_outside_load_all(restore_tree):
+    fs = CountingAccess(latency=0.01)
+    loader = AsyncPNELoader(fs=fs, concurrency=2)
+    channels = asyncio.run(loader.discover(restore_tree))
+    subfolder = channels[0]['subfolder']
+
+    profile, cycle = asyncio.run(loader.load_channel(subfolder))
+    expected_profile, expected_cycle = load_pne_data(subfolder)
+    assert profile.equals(expected_profile)
+    assert cycle.equals(expected_cycle)
+    assert fs.max_in_flight <= 2
+
+
+def test_compare_with_sync_reports_no_mismatch(restore_tree):
+    report = compare_with_sync(restore_tree, latency=0.01, concurrency=4)
+    assert report['channels'] == 4
+    assert report['mismatched'] == []
@@ -0,0 +1,33 @@
+import os
+
+from pne_cache import ChannelResultCache
+from pre250508_edit import process_channel, PROCESSING_VERSION
+from conftest import rewrite_channel
+
+
+def test_cache_invalidated_after_restore_change(restore_tree, tmp_path):
+    subfolder = os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]")
+    metadata = {'cyclename': restore_tree['cyclename'][0], 'subfolder': subfolder, 'channel_id': "045",
+                'cycle_info': "A1_MP1_T23_4500mAh"}
+    cache = ChannelResultCache(str(tmp_path / "cache"), version=PROCESSING_VERSION)
+    computed = []
+
+    def compute():
+        computed.append(subfolder)
+        return process_channel(subfolder, None, None, metadata)
+
+    first = cache.get_or_compute(subfolder, compute, metadata=metadata)
+    again = cache.get_or_compute(subfolder, compute, metadata=metadata)
+    assert len(computed) == 1
+    assert again.equals(first)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    rewrite_channel(subfolder, 1, 65)
+    assert cache.get(subfolder, metadata=metadata) is None
+    updated = cache.get_or_compute(subfolder, compute, metadata=metadata)
+    assert len(computed) == 2
+    assert updated.equals(process_channel(subfolder, None, None, metadata))
+    assert len(updated) > len(first)
+
+    # 바뀌기 전 결과는 새 결과를 저장할 때 삭제됨
+    assert len([name for name in os.listdir(cache.cache_dir) if name.endswith(".pkl")]) == 1
@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+import pytest
+
+import pre250508_edit
+from pre250508_edit import process_channel
+from pne_checkpoint import RunCheckpoint
+from conftest import output_files, rewrite_channel
+
+
+class Interrupted(BaseException):
+    """실행 중단 (main()의 except Exception에 잡히지 않도록 KeyboardInterrupt처럼 BaseException)"""
+
+
+def _counting_process_channel(monkeypatch, interrupt_after=None):
+    """처리한 채널 경로를 기록하고, interrupt_after개를 처리한 뒤에는 실행을 중단하는 process_channel"""
+    processed = []
+
+    def process(subfolder, inicycle, endcycle, metadata):
+        if interrupt_after is not None and len(processed) >= interrupt_after:
+            raise Interrupted()
+        processed.append(subfolder)
+        return process_channel(subfolder, inicycle, endcycle, metadata)
+
+    monkeypatch.setattr(pre250508_edit, "process_channel", process)
+    return processed
+
+
+def test_resume_after_interrupted_run(restore_tree, tmp_path, run_main, monkeypatch):
+    run_main(restore_tree, tmp_path / "clean")
+
+    output_dir = tmp_path / "out"
+    first = _counting_process_channel(monkeypatch, interrupt_after=2)
+    with pytest.raises(Interrupted):
+        run_main(restore_tree, output_dir, checkpoint_dir="checkpoints")
+    assert len(first) == 2
+    # 체크포인트는 출력 폴더 아래에 남음
+    (run_dir,) = os.listdir(output_dir / "checkpoints")
+
+    second = _counting_process_channel(monkeypatch)
+    run_main(restore_tree, output_dir, checkpoint_dir="checkpoints")
+    assert len(second) == 2
+    assert not set(first) & set(second)
+    assert output_files(output_dir) == output_files(tmp_path / "clean")
+    # 끝까지 실행하면 체크포인트 삭제
+    assert not os.path.exists(output_dir / "checkpoints" / run_dir)
+
+
+def test_resume_reprocesses_changed_channel(restore_tree, tmp_path, run_main, monkeypatch):
+    output_dir = tmp_path / "out"
+    first = _counting_process_channel(monkeypatch, interrupt_after=2)
+    with pytest.raises(Interrupted):
+        run_main(restore_tree, output_dir, checkpoint_dir="checkpoints")
+
+    # 중단된 사이 완료된 채널 하나의 원본이 바뀜
+    rewrite_channel(first[0], 1, 65)
+    second = _counting_process_channel(monkeypatch)
+    run_main(restore_tree, output_dir, checkpoint_dir="checkpoints")
+    assert first[0] in second
+    assert first[1] not in second
+    assert len(second) == 3
+
+    run_main(restore_tree, tmp_path / "clean")
+    assert output_files(output_dir) == output_files(tmp_path / "clean")
+
+
+def test_truncated_journal_line_is_ignored(tmp_path):
+    checkpoint = RunCheckpoint(str(tmp_path), "run")
+    data = pd.DataFrame({'cycle': [1, 2]})
+    checkpoint.record("A1", "Data#1", "ch1", data, [("f.csv", 1, 1)])
+    with open(checkpoint.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"cycle_info": "A1", "group": "Data#1", "chan')
+
+    resumed = RunCheckpoint(str(tmp_path), "run")
+    assert resumed.is_done("A1", "Data#1", "ch1", [("f.csv", 1, 1)])
+    assert not resumed.is_done("A1", "Data#1", "ch1", [("f.csv", 2, 1)])
+    assert resumed.load("A1", "Data#1", "ch1").equals(data)
@@ -0,0 +1,72 @@
+import os
+
+import pre250508_edit
+from pre250508_edit import process_channel
+from pne_outputs import MANIFEST_NAME
+from conftest import output_files, rewrite_channel
+
+
+def _counting_process_channel(monkeypatch):
+    processed = []
+
+    def process(subfolder, inicycle, endcycle, metadata):
+        processed.append(subfolder)
+        return process_channel(subfolder, inicycle, endcycle, metadata)
+
+    monkeypatch.setattr(pre250508_edit, "process_channel", process)
+    return processed
+
+
+def _mtimes(output_dir):
+    return {name: os.stat(os.path.join(output_dir, name)).st_mtime_ns
+            for name in os.listdir(output_dir) if name.endswith(".csv") or name == MANIFEST_NAME}
+
+
+def test_unchanged_inputs_skip_rewrite(restore_tree, tmp_path, run_main, monkeypatch):
+    output_dir = tmp_path / "out"
+    first = run_main(restore_tree, output_dir)
+    before = _mtimes(output_dir)
+    assert len(before) == 3
+
+    processed = _counting_process_channel(monkeypatch)
+    second = run_main(restore_tree, output_dir)
+    assert processed == []
+    assert _mtimes(output_dir) == before
+    assert {key: info['rows'] for key, info in second.items()} == {key: info['rows'] for key, info in first.items()}
+    assert {key: info['path'] for key, info in second.items()} == {key: info['path'] for key, info in first.items()}
+
+
+def test_changed_restore_rewrites_only_its_group(restore_tree, tmp_path, run_main, monkeypatch):
+    output_dir = tmp_path / "out"
+    merged = run_main(restore_tree, output_dir)
+    before = _mtimes(output_dir)
+
+    subfolder = os.path.join(restore_tree['cyclepath'][1], "M01Ch045[045]")
+    rewrite_channel(subfolder, 58, 95, 1 + 57 * 40)
+    changed_group = next(os.path.basename(info['path']) for info in merged.values()
+                         if "045" in info['channel_ids'])
+
+    processed = _counting_process_channel(monkeypatch)
+    run_main(restore_tree, output_dir)
+    after = _mtimes(output_dir)
+    assert set(processed) == {os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]"), subfolder}
+    assert after[changed_group] != before[changed_group]
+    assert all(after[name] == before[name] for name in before if name not in (changed_group, MANIFEST_NAME))
+
+    monkeypatch.undo()
+    run_main(restore_tree, tmp_path / "clean")
+    assert output_files(output_dir) == output_files(tmp_path / "clean")
+
+
+def test_modified_output_file_is_rewritten(restore_tree, tmp_path, run_main):
+    output_dir = tmp_path / "out"
+    merged = run_main(restore_tree, output_dir)
+    path = next(iter(merged.values()))['path']
+    with open(path, "rb") as f:
+        expected = f.read()
+    with open(path, "ab") as f:
+        f.write(b"edited by hand\n")
+
+    run_main(restore_tree, output_dir)
+    with open(path, "rb") as f:
+        assert f.read() == expected
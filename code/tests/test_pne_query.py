@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from pne_query import build_channel_store, query_pne_data
+from conftest import rewrite_channel
+
+
+def test_store_rebuilt_after_restore_change(restore_tree, tmp_path):
+    subfolder = os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]")
+    cyclename = restore_tree['cyclename'][0]
+    store_dir = str(tmp_path / "store")
+
+    assert build_channel_store(subfolder, cyclename, store_dir)
+    data_path = os.path.join(store_dir, "profile", "cycle_info=A1_MP1_T23_4500mAh",
+                             f"cyclename={cyclename}", "channel_id=045", "data.parquet")
+    built_at = os.stat(data_path).st_mtime_ns
+    assert query_pne_data(store_dir, 'cycle')[27].max() == 60
+
+    # 원본이 그대로면 다시 만들지 않음
+    assert build_channel_store(subfolder, cyclename, store_dir)
+    assert os.stat(data_path).st_mtime_ns == built_at
+
+    # 시험이 이어져 Restore가 바뀌면 다시 만들어 새 사이클이 보임
+    rewrite_channel(subfolder, 1, 65)
+    assert build_channel_store(subfolder, cyclename, store_dir)
+    assert query_pne_data(store_dir, 'cycle')[27].max() == 65
+    profile = query_pne_data(store_dir, 'profile', cycles=(61, 65))
+    assert len(profile) == 5 * 40
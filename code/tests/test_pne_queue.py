@@ -0,0 +1,113 @@
+import os
+import time
+import json
+import multiprocessing
+
+import pandas as pd
+import pytest
+
+import pne_queue
+from pne_queue import WorkQueue, publish_run, run_worker, run_local
+from pre250508_edit import process_channel
+from conftest import output_files
+
+# 패치한 process_channel이 워커 프로세스에도 적용되려면 fork로 시작해야 함
+requires_fork = pytest.mark.skipif(multiprocessing.get_start_method() != "fork",
+                                   reason="워커 프로세스가 테스트의 패치를 물려받으려면 fork 필요")
+
+
+def _logging_process_channel(log_path, delay=0.0):
+    """처리할 때마다 채널 경로를 log_path에 한 줄씩 남기는 process_channel"""
+    def process(subfolder, inicycle, endcycle, metadata):
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write(f"{os.getpid()}\t{subfolder}\n")
+        time.sleep(delay)
+        return process_channel(subfolder, inicycle, endcycle, metadata)
+    return process
+
+
+def _processed(log_path):
+    with open(log_path, encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t")[1] for line in f]
+
+
+@requires_fork
+def test_run_local_claims_each_task_once(restore_tree, tmp_path, monkeypatch):
+    log_path = tmp_path / "processed.log"
+    # 리스 갱신 간격(0.2초)보다 오래 걸리는 채널에서도 다른 워커가 가져가지 않아야 함
+    monkeypatch.setattr(pne_queue, "process_channel", _logging_process_channel(log_path, delay=1.0))
+    queue_dir = tmp_path / "queue"
+    os.makedirs(tmp_path / "out")
+
+    run_local(restore_tree, None, None, str(queue_dir), workers=3, output_dir=str(tmp_path / "out"),
+              lease_seconds=0.6)
+
+    queue = WorkQueue(str(queue_dir))
+    tasks = queue.job()['tasks']
+    processed = _processed(log_path)
+    assert sorted(processed) == sorted(task['subfolder'] for task in tasks)
+    assert len(set(processed)) == len(tasks)
+    assert queue.done_ids() == [f"{number:06d}" for number in range(len(tasks))]
+    assert queue.status()['claimed'] == 0
+    # 워커 여러 개가 실제로 나눠서 처리
+    assert len({line.split("\t")[0] for line in open(log_path, encoding="utf-8")}) > 1
+
+
+@requires_fork
+def test_requeue_stale_reclaims_killed_worker_task(restore_tree, tmp_path, monkeypatch):
+    started_path = tmp_path / "started"
+
+    def hang(subfolder, inicycle, endcycle, metadata):
+        started_path.write_text(subfolder)
+        time.sleep(60)
+
+    queue_dir = str(tmp_path / "queue")
+    publish_run(restore_tree, None, None, queue_dir)
+    queue = WorkQueue(queue_dir)
+
+    monkeypatch.setattr(pne_queue, "process_channel", hang)
+    worker = multiprocessing.Process(target=run_worker, args=(queue_dir, "doomed"),
+                                     kwargs={'lease_seconds': 0.6})
+    worker.start()
+    try:
+        deadline = time.time() + 10
+        while not started_path.exists() and time.time() < deadline:
+            time.sleep(0.05)
+        assert started_path.exists()
+        (task_id,) = os.listdir(queue.claimed_dir)
+        task_id = task_id[:-len(".json")]
+        assert queue.owner(task_id) == "doomed"
+
+        # 살아 있는 워커는 리스를 갱신하므로 되돌려지지 않음
+        time.sleep(1.0)
+        assert queue.requeue_stale(0.6) == 0
+    finally:
+        worker.kill()
+        worker.join()
+
+    time.sleep(1.0)
+    assert queue.requeue_stale(0.6) == 1
+    assert queue.owner(task_id) is None
+
+    monkeypatch.setattr(pne_queue, "process_channel", process_channel)
+    assert run_worker(queue_dir, "survivor", lease_seconds=0.6) == len(queue.job()['tasks'])
+    with open(os.path.join(queue.done_dir, f"{task_id}.json"), encoding="utf-8") as f:
+        assert json.load(f)['worker'] == "survivor"
+    assert queue.status()['claimed'] == 0
+
+
+def test_merge_results_matches_main(restore_tree, tmp_path, run_main):
+    run_main(restore_tree, tmp_path / "serial")
+
+    queue_output = tmp_path / "queue_out"
+    os.makedirs(queue_output)
+    merged = run_local(restore_tree, None, None, str(tmp_path / "queue"), workers=2,
+                       output_dir=str(queue_output))
+
+    assert output_files(queue_output) == output_files(tmp_path / "serial")
+    assert set(output_files(queue_output))
+    for group_info in merged.values():
+        data = pd.read_csv(group_info['path'])
+        seq_nums = [int(name.rsplit("_", 1)[1]) for name in data['cyclename']]
+        assert seq_nums == sorted(seq_nums)
+        assert len(set(seq_nums)) > 1
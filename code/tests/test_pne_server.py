@@ -0,0 +1,48 @@
+import os
+import threading
+
+from pne_server import ChannelStore, select_rows
+from conftest import rewrite_channel
+
+
+def test_store_reloads_channel_after_restore_change(restore_tree):
+    subfolder = os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]")
+    store = ChannelStore(check_interval=0)
+
+    channel = store.get(subfolder)
+    assert store.get(subfolder) is channel
+    assert (store.stats()['loads'], store.stats()['hits']) == (1, 1)
+    assert channel.cycle[27].max() == 60
+
+    rewrite_channel(subfolder, 1, 65)
+    reloaded = store.get(subfolder)
+    assert reloaded is not channel
+    assert store.stats()['loads'] == 2
+    assert reloaded.cycle[27].max() == 65
+    assert len(select_rows(reloaded, 'profile', 61, 65)) == 5 * 40
+
+
+def test_check_interval_defers_restore_check(restore_tree):
+    subfolder = os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]")
+    store = ChannelStore(check_interval=3600)
+
+    channel = store.get(subfolder)
+    rewrite_channel(subfolder, 1, 65)
+    # 확인 간격이 지나기 전에는 메모리의 데이터를 그대로 사용
+    assert store.get(subfolder) is channel
+    assert store.stats()['loads'] == 1
+
+
+def test_concurrent_requests_load_once(restore_tree):
+    subfolder = os.path.join(restore_tree['cyclepath'][0], "M01Ch045[045]")
+    store = ChannelStore(check_interval=0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.get(subfolder))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.stats()['loads'] == 1
+    assert all(result is results[0] for result in results)
+    assert store._load_locks == {}
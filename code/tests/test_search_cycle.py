@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+import pre250508_edit
+from pre250508_edit import pne_search_cycle, search_cycle_bounds
+from conftest import write_channel
+
+CYCLE_RANGES = [(None, None), (1, 60), (5, None), (None, 30), (17, 42), (60, 60), (61, None), (0, 10)]
+
+
+@pytest.fixture
+def restore_dir(tmp_path):
+    write_channel(os.path.join(tmp_path, "M01Ch001[001]"), 1, 60)
+    return os.path.join(tmp_path, "M01Ch001[001]", "Restore")
+
+
+def _full_read(monkeypatch, restore_dir, inicycle, endcycle):
+    """이분 탐색 없이 SaveEndData 전체를 읽는 경로의 결과"""
+    with monkeypatch.context() as patch:
+        patch.setattr(pre250508_edit, "search_cycle_bounds", lambda *args: None)
+        return pne_search_cycle(restore_dir, inicycle, endcycle)
+
+
+@pytest.mark.parametrize("inicycle, endcycle", CYCLE_RANGES)
+def test_bisection_matches_full_read(restore_dir, monkeypatch, inicycle, endcycle):
+    assert search_cycle_bounds(os.path.join(restore_dir, "ch01_SaveEndData.csv"), inicycle, endcycle) is not None
+    assert pne_search_cycle(restore_dir, inicycle, endcycle) == _full_read(monkeypatch, restore_dir,
+                                                                           inicycle, endcycle)
+
+
+def test_partial_last_line_matches_full_read(restore_dir, monkeypatch):
+    save_end_path = os.path.join(restore_dir, "ch01_SaveEndData.csv")
+    with open(save_end_path, "rb") as f:
+        complete = f.read()
+    # 시험 중 기록되고 있는 다음 사이클의 행 (사이클 #27 필드가 잘리는 위치 포함)
+    row = [2401, 0, 1] + [0] * 5 + [3.7, 1000.0] + [0] * 17 + [61, 0, 0]
+    pending = ",".join(map(str, row)).encode()
+
+    for cut in range(1, len(pending) + 1):
+        with open(save_end_path, "wb") as f:
+            f.write(complete + pending[:cut])
+        assert search_cycle_bounds(save_end_path) is None
+        for inicycle, endcycle in CYCLE_RANGES:
+            assert pne_search_cycle(restore_dir, inicycle, endcycle) == _full_read(
+                monkeypatch, restore_dir, inicycle, endcycle), (cut, inicycle, endcycle)
+
+    # 줄이 끝나면 다시 이분 탐색 사용
+    with open(save_end_path, "wb") as f:
+        f.write(complete + pending + b"\n")
+    assert search_cycle_bounds(save_end_path) == (1, 61, 40, 2401)